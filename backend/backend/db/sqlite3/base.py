@@ -0,0 +1,43 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+TRANSACTION_MODES = ("DEFERRED", "IMMEDIATE", "EXCLUSIVE")
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    The SQLite backend with PRAGMAs applied to every new connection.
+
+    Two OPTIONS are read by this backend instead of being passed to
+    sqlite3.connect():
+
+    - "pragmas": a dict of PRAGMA names and values, executed in order when a
+      connection is opened, such as {"journal_mode": "WAL"}.
+    - "transaction_mode": "DEFERRED" (SQLite's default), "IMMEDIATE" or
+      "EXCLUSIVE", the kind of BEGIN issued by atomic(). With IMMEDIATE a
+      transaction takes the write lock when it starts, waiting up to the busy
+      timeout for it, instead of failing with "database is locked" when it
+      upgrades a read to a write while another connection writes.
+
+    Both are built into Django 5.1 as "init_command" and "transaction_mode".
+    """
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        kwargs.pop("pragmas", None)
+        mode = kwargs.pop("transaction_mode", None)
+        if mode is not None and mode not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f"transaction_mode must be one of {', '.join(TRANSACTION_MODES)}"
+            )
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.settings_dict["OPTIONS"].get("pragmas", {}).items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict["OPTIONS"].get("transaction_mode")
+        self.cursor().execute(f"BEGIN {mode}" if mode else "BEGIN")
@@ -1,5 +1,8 @@
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -35,6 +38,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # first, so the measured time covers the other middleware
+    "employees.middleware.RequestMetricsMiddleware",
+    "employees.middleware.QueryDetectorMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -68,12 +74,70 @@ WSGI_APPLICATION = "backend.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
+# DATABASE_PROFILE selects the database: "sqlite" (default) or "postgresql".
+# The SQLite profile uses WAL so readers do not block the writer, and takes
+# the write lock when a transaction starts, so concurrent writers wait for
+# each other up to the busy timeout instead of failing with "database is
+# locked". WAL is a persistent mode of the database file, which is why
+# db.sqlite3 is not under version control: create it with migrate. The
+# PostgreSQL profile needs psycopg, installed from requirements-postgresql.txt;
+# it keeps connections open between requests and checks them before reuse.
+# Django 5.0 has no built-in pool, so put pgbouncer in front of it when the
+# workers outnumber the connections.
+
+DATABASE_PROFILE = os.environ.get("DATABASE_PROFILE", "sqlite")
+
+if DATABASE_PROFILE == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("POSTGRES_DB", "employees"),
+            "USER": os.environ.get("POSTGRES_USER", "postgres"),
+            "PASSWORD": os.environ.get("POSTGRES_PASSWORD", ""),
+            "HOST": os.environ.get("POSTGRES_HOST", "localhost"),
+            "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+            "CONN_MAX_AGE": int(os.environ.get("DATABASE_CONN_MAX_AGE", 60)),
+            "CONN_HEALTH_CHECKS": True,
+        }
+    }
+elif DATABASE_PROFILE == "sqlite":
+    DATABASES = {
+        "default": {
+            "ENGINE": "backend.db.sqlite3",
+            "NAME": os.environ.get("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
+            "OPTIONS": {
+                "transaction_mode": "IMMEDIATE",
+                "pragmas": {
+                    "journal_mode": "WAL",
+                    "synchronous": "NORMAL",
+                    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT", 5000)),
+                    "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", 2**28)),
+                },
+            },
+        }
+    }
+else:
+    raise ImproperlyConfigured(f"Unknown DATABASE_PROFILE {DATABASE_PROFILE!r}")
+
 
-DATABASES = {
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# The "employees" cache holds the rendered employee and skill API responses.
+# Point it to memcached or redis when running several worker processes, so a
+# write invalidates the responses cached by every process.
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "employees": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "employees",
+        "TIMEOUT": int(os.environ.get("EMPLOYEES_CACHE_TIMEOUT", 300)),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.environ.get("EMPLOYEES_CACHE_MAX_ENTRIES", 1000)),
+        },
+    },
 }
 
 
@@ -118,6 +182,33 @@ STATIC_URL = "static/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        # the JSON renderer, timed for the request metrics
+        "employees.metrics.TimedJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+}
+
+# Request metrics
+# Every request is measured (duration, database queries and time, render
+# time, response size) and the rolling quantiles per view are served at
+# /api/_metrics in the Prometheus text format. REQUEST_METRICS=0 removes the
+# middleware. The quantiles are computed on the last REQUEST_METRICS_WINDOW
+# requests of each view, per process.
+
+REQUEST_METRICS = bool(int(os.environ.get("REQUEST_METRICS", 1)))
+REQUEST_METRICS_WINDOW = int(os.environ.get("REQUEST_METRICS_WINDOW", 1024))
+
+# Query detector
+# QUERY_DETECTOR=1 logs the requests running a query shape
+# QUERY_DETECTOR_DUPLICATES times or more (an N+1) or a query slower than
+# QUERY_DETECTOR_SLOW_MS, on the "employees.queries" logger. For development.
+
+QUERY_DETECTOR = bool(int(os.environ.get("QUERY_DETECTOR", 0)))
+QUERY_DETECTOR_SLOW_MS = int(os.environ.get("QUERY_DETECTOR_SLOW_MS", 100))
+QUERY_DETECTOR_DUPLICATES = int(os.environ.get("QUERY_DETECTOR_DUPLICATES", 3))
+
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",
     "http://127.0.0.1:9000",
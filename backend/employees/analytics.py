@@ -0,0 +1,107 @@
+import datetime
+
+from django.db.models import Count, F, Q, Sum
+
+# the lower bound of every age band, in years; the last band is open ended
+AGE_BANDS = (0, 25, 35, 45, 55)
+
+
+def skills_matrix(employees):
+    """
+    Returns the headcount by skill and seniority and the average experience per skill.
+
+    One grouped query over the skills of the given employees; the rows are
+    folded per skill in Python, so the cost does not depend on the number of
+    employees but on the number of distinct (skill, seniority) pairs.
+
+    Args:
+        employees (QuerySet): The employees to aggregate, usually filtered.
+
+    Returns:
+        list: One dict per skill, ordered by name, with the headcount, the
+        average years of experience and the headcount per seniority.
+
+    Example:
+        >>> skills_matrix(Employee.objects.all())
+        [{"name": "Python", "headcount": 2, "avg_yrs_exp": 4.5, "seniority": {"Junior": 1, "Senior": 1}}]
+    """
+    # grouped from the employees side, so the raw SQL of the full-text search
+    # stays in the outer query where it can refer to the employees table
+    rows = (
+        employees.order_by()
+        .filter(skills__isnull=False)
+        .values(name=F("skills__name"), level=F("skills__seniority"))
+        # a skill name is unique per employee, so every row is one employee
+        .annotate(headcount=Count("skills"), total_yrs_exp=Sum("skills__yrs_exp"))
+        .order_by("name", "level")
+    )
+    matrix = {}
+    for row in rows:
+        skill = matrix.setdefault(
+            row["name"],
+            {"name": row["name"], "headcount": 0, "total_yrs_exp": 0, "seniority": {}},
+        )
+        skill["headcount"] += row["headcount"]
+        skill["total_yrs_exp"] += row["total_yrs_exp"]
+        skill["seniority"][row["level"]] = row["headcount"]
+    return [
+        {
+            "name": skill["name"],
+            "headcount": skill["headcount"],
+            "avg_yrs_exp": round(skill["total_yrs_exp"] / skill["headcount"], 2),
+            "seniority": skill["seniority"],
+        }
+        for skill in matrix.values()
+    ]
+
+
+def age_bands(employees, today=None):
+    """
+    Returns the headcount of the given employees per age band.
+
+    The bands are turned into date of birth cutoffs, so the counts are one
+    conditional aggregate over the date of birth index and no age is computed
+    per row.
+
+    Args:
+        employees (QuerySet): The employees to aggregate, usually filtered.
+        today (date): The date the ages are computed at, today by default.
+
+    Returns:
+        list: One dict per band of AGE_BANDS, youngest first, with the label,
+        the bounds in years (max is None for the last band) and the headcount.
+
+    Example:
+        >>> age_bands(Employee.objects.all())
+        [{"band": "0-24", "min": 0, "max": 24, "headcount": 3}, ..., {"band": "55+", "min": 55, "max": None, "headcount": 1}]
+    """
+    today = today or datetime.date.today()
+    bands = []
+    aggregates = {}
+    for index, low in enumerate(AGE_BANDS):
+        high = AGE_BANDS[index + 1] if index + 1 < len(AGE_BANDS) else None
+        # at least low years old, and younger than high years
+        condition = Q(date_of_birth__lte=_years_before(today, low))
+        if high is not None:
+            condition &= Q(date_of_birth__gt=_years_before(today, high))
+        aggregates[f"band_{index}"] = Count("pk", filter=condition)
+        bands.append(
+            {
+                "band": f"{low}-{high - 1}" if high is not None else f"{low}+",
+                "min": low,
+                "max": high - 1 if high is not None else None,
+            }
+        )
+
+    counts = employees.order_by().aggregate(**aggregates)
+    for index, band in enumerate(bands):
+        band["headcount"] = counts[f"band_{index}"]
+    return bands
+
+
+def _years_before(day, years):
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        # February 29th in a year that is not a leap year
+        return day.replace(year=day.year - years, day=28)
@@ -0,0 +1,120 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, JsonResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.request import Request
+
+from .emails import aemail_exists
+from .metrics import TimedJSONRenderer, measure
+from .models import Employee
+from .representations import ValuesRepresentation
+from .serializers import EmployeeSerializer
+from .views import EmployeeListView
+
+
+class AsyncEmployeeView(View):
+    """
+    Native async versions of the employee list and detail endpoints.
+
+    The rows are read with the async ORM and rendered with the .values()
+    representation of EmployeeSerializer, so the JSON is the same as the sync
+    endpoints' and the request does not hold a worker thread while it waits.
+    The filter, search, ordering and pagination parameters of the employees
+    list apply. The backends may look up skill names or the search index while
+    validating them, so they run in one sync_to_async call when such
+    parameters are present; the queries for the rows themselves are async.
+
+    The response cache, the ETag/Last-Modified validators and ?fields= are
+    not applied on this path.
+
+    Attributes:
+        filter_backends (list): The filter backends of EmployeeListView.
+        pagination_class (type): The pagination class of EmployeeListView, read with apaginate_queryset.
+    """
+
+    queryset = Employee.objects.all()
+    serializer_class = EmployeeSerializer
+    filter_backends = EmployeeListView.filter_backends
+    filterset_class = EmployeeListView.filterset_class
+    search_fields = EmployeeListView.search_fields
+    ordering_fields = EmployeeListView.ordering_fields
+    pagination_class = EmployeeListView.pagination_class
+    representation = ValuesRepresentation(EmployeeSerializer)
+    renderer = TimedJSONRenderer()
+
+    async def get(self, request, pk=None):
+        # the filter backends and the pagination read DRF's query_params
+        request = Request(request)
+        try:
+            queryset = await self.afilter_queryset(request)
+            if pk is None:
+                data = await self.alist(request, queryset)
+            else:
+                data = await self.aretrieve(queryset, pk)
+        except APIException as exc:
+            return self.error_response(exc)
+        return self.render(data)
+
+    async def afilter_queryset(self, request):
+        queryset = self.queryset.all()
+        paginator = self.pagination_class()
+        params = set(request.query_params) - {
+            paginator.page_size_query_param,
+            paginator.cursor_query_param,
+        }
+        if not params:
+            return queryset
+        return await sync_to_async(self.filter_queryset)(request, queryset)
+
+    def filter_queryset(self, request, queryset):
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(request, queryset, self)
+        return queryset
+
+    async def alist(self, request, queryset):
+        paginator = self.pagination_class()
+        ordering = paginator.get_ordering(request, queryset, self)
+        rows = self.representation.values(
+            queryset, extra=[field.lstrip("-") for field in ordering]
+        )
+        page = await paginator.apaginate_queryset(rows, request, self)
+        if page is None:
+            page = [row async for row in rows.aiterator()]
+            with measure("serialize_seconds"):
+                return await self.representation.ato_representation(page)
+        with measure("serialize_seconds"):
+            results = await self.representation.ato_representation(page)
+        return {
+            "next": paginator.get_next_link(),
+            "previous": paginator.get_previous_link(),
+            "results": results,
+        }
+
+    async def aretrieve(self, queryset, pk):
+        row = await self.representation.values(queryset.filter(pk=pk)).afirst()
+        if row is None:
+            raise NotFound()
+        with measure("serialize_seconds"):
+            return (await self.representation.ato_representation([row]))[0]
+
+    def render(self, data, status=200):
+        # byte for byte the JSON of the sync endpoints
+        return HttpResponse(
+            self.renderer.render(data), content_type="application/json", status=status
+        )
+
+    def error_response(self, exc):
+        # the body of DRF's exception handler
+        if isinstance(exc.detail, (list, dict)):
+            data = exc.detail
+        else:
+            data = {"detail": exc.detail}
+        return self.render(data, status=exc.status_code)
+
+
+@csrf_exempt
+@require_http_methods(["GET", "POST"])
+async def check_email_exist(request, email):
+    return JsonResponse({"exists": await aemail_exists(email)})
@@ -0,0 +1,201 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import urlencode
+
+from .conditional import is_conditional
+
+EMPLOYEES = "employees"
+SKILLS = "skills"
+
+
+class ResponseCache:
+    """
+    Stores rendered API responses, invalidated by generation tokens.
+
+    Every cached response belongs to one or more scopes ("employees", "skills")
+    and its key contains the current generation token of each scope. A write
+    replaces the token of the scopes it affects, so the stale responses are
+    never read again and age out of the cache on their own, without having to
+    know which filter or page combinations were cached. Tokens are unique
+    values rather than counters, so a token evicted from the cache can never be
+    recreated with the value of an older generation.
+
+    The cache backend is the "employees" alias of settings.CACHES, whose
+    TIMEOUT and MAX_ENTRIES bound the age and number of cached responses. With
+    several worker processes the alias must point to a shared backend
+    (memcached, redis), otherwise a write only invalidates the responses of the
+    process that handled it.
+
+    Attributes:
+        alias (str): The alias of the cache in settings.CACHES.
+        prefix (str): The prefix of every key written by this cache.
+
+    Methods:
+        get(request, key): Returns the cached response for the key, or None.
+        set(key, response): Caches a rendered response.
+        get_key(request, name, scopes): Returns the key of a request in the current generation of the scopes.
+        invalidate(*scopes): Starts a new generation for the scopes.
+        stats(): Returns the hit and miss counters of this process.
+    """
+
+    replayed_headers = ("Content-Type", "ETag", "Last-Modified")
+
+    def __init__(self, alias="employees", prefix="employees:response"):
+        self.alias = alias
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters = Counter()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get(self, request, key):
+        """
+        Returns the cached response for the key, or None.
+
+        A cached response that carries validators answers the conditional
+        headers of the request, with 304 Not Modified when they match.
+        """
+        cached = self.cache.get(key)
+        # a response cached without validators cannot answer a conditional
+        # request, which renders it again with them
+        if cached is not None and not cached[2] and is_conditional(request):
+            cached = None
+        self._count("hits" if cached is not None else "misses")
+        if cached is None:
+            return None
+        content, headers, conditions = cached
+        response = get_conditional_response(request, **conditions)
+        if response is None:
+            response = HttpResponse(content)
+        for name, value in headers.items():
+            if response.status_code != 304 or name != "Content-Type":
+                response[name] = value
+        response["X-Cache"] = "HIT"
+        return response
+
+    def set(self, key, response):
+        headers = {
+            name: response[name]
+            for name in self.replayed_headers
+            if response.has_header(name)
+        }
+        conditions = getattr(response, "conditions", {})
+        self.cache.set(key, (response.content, headers, conditions))
+        response["X-Cache"] = "MISS"
+
+    def get_key(self, request, name, scopes):
+        params = sorted(
+            (key, value)
+            for key in request.query_params
+            for value in request.query_params.getlist(key)
+        )
+        # links in the response are absolute, so the host is part of the key
+        raw = "\n".join(
+            [
+                request.get_host(),
+                request.path,
+                request.accepted_media_type,
+                urlencode(params),
+            ]
+        )
+        digest = hashlib.md5(raw.encode()).hexdigest()
+        generations = ".".join(self.get_generation(scope) for scope in scopes)
+        return f"{self.prefix}:{name}:{generations}:{digest}"
+
+    def get_generation(self, scope):
+        key = f"{self.prefix}:generation:{scope}"
+        generation = self.cache.get(key)
+        if generation is None:
+            self.cache.add(key, self._new_generation(), timeout=None)
+            generation = self.cache.get(key)
+        return generation
+
+    def invalidate(self, *scopes):
+        """
+        Starts a new generation for the scopes, now and again on commit.
+
+        The second invalidation drops the responses cached by other requests
+        while the writing transaction was still uncommitted.
+        """
+        self._invalidate(scopes)
+        transaction.on_commit(lambda: self._invalidate(scopes))
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self._counters["hits"], "misses": self._counters["misses"]}
+
+    def reset_stats(self):
+        with self._lock:
+            self._counters.clear()
+
+    def _invalidate(self, scopes):
+        self.cache.set_many(
+            {
+                f"{self.prefix}:generation:{scope}": self._new_generation()
+                for scope in scopes
+            },
+            timeout=None,
+        )
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    @staticmethod
+    def _new_generation():
+        return f"{time.time_ns():x}"
+
+
+response_cache = ResponseCache()
+
+
+class CachedResponseMixin:
+    """
+    A viewset mixin caching the rendered list and retrieve responses.
+
+    Only successful JSON responses are cached; the browsable API and errors
+    always go through the view. Cached responses carry an ``X-Cache: HIT``
+    header, freshly rendered ones ``X-Cache: MISS``. The ETag and Last-Modified
+    validators set by ConditionalResponseMixin are stored with the content, so
+    conditional requests for a cached response need no query at all.
+
+    Attributes:
+        cache_scopes (tuple): The scopes whose writes invalidate the cached responses.
+    """
+
+    cache_scopes = ()
+
+    def list(self, request, *args, **kwargs):
+        return self._cached("list", super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached("retrieve", super().retrieve, request, *args, **kwargs)
+
+    def _cached(self, name, handler, request, *args, **kwargs):
+        if request.accepted_renderer.format != "json":
+            return handler(request, *args, **kwargs)
+        key = response_cache.get_key(
+            request, f"{self.basename}-{name}", self.cache_scopes
+        )
+        response = response_cache.get(request, key)
+        if response is None:
+            self._response_cache_key = key
+            response = handler(request, *args, **kwargs)
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key = getattr(self, "_response_cache_key", None)
+        if key is not None and response.status_code == 200:
+            response.render()
+            response_cache.set(key, response)
+        return response
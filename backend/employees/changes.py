@@ -0,0 +1,113 @@
+import base64
+import heapq
+import json
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Tombstone
+
+UPDATED = 0
+DELETED = 1
+
+
+class InvalidCursor(Exception):
+    """Raised when a change feed cursor cannot be decoded."""
+
+
+class ChangeFeed:
+    """
+    Reads the employees changed and the rows deleted after a cursor.
+
+    The feed merges two streams ordered on a (timestamp, stream, id) key: the
+    employees by updated_at, and the tombstones by deleted_at. Skill writes
+    and deletes touch the updated_at of their employee, so a changed skill is
+    delivered as its employee with the current list of skills; the skill
+    tombstones additionally name the deleted skills, including the ones removed
+    by the cascade from a deleted employee.
+
+    A cursor is the key of the last change delivered, so every read seeks on
+    the (updated_at, id) and (deleted_at, id) indexes and costs the same
+    whatever the size of the table. Changes younger than the lag are held
+    back: a row is only visible once its transaction commits, which can be
+    after a reader has moved past its timestamp.
+
+    Attributes:
+        queryset (QuerySet): The employees of the feed.
+        lag (timedelta): How long a change is held back before it is delivered.
+
+    Methods:
+        read(cursor, limit): Returns up to limit changes after the cursor, the cursor of the last one and whether more changes are available.
+    """
+
+    def __init__(self, queryset, lag):
+        self.queryset = queryset
+        self.lag = lag
+
+    def read(self, cursor, limit):
+        position = self.decode_cursor(cursor)
+        until = timezone.now() - self.lag
+        employees = self._seek(
+            self.queryset, "updated_at", UPDATED, position, until, limit
+        )
+        tombstones = self._seek(
+            Tombstone.objects.all(), "deleted_at", DELETED, position, until, limit
+        )
+        changes = list(
+            heapq.merge(
+                (
+                    (employee.updated_at, UPDATED, employee.pk, employee)
+                    for employee in employees
+                ),
+                (
+                    (tombstone.deleted_at, DELETED, tombstone.pk, tombstone)
+                    for tombstone in tombstones
+                ),
+                key=lambda change: change[:3],
+            )
+        )
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        if changes:
+            cursor = self.encode_cursor(changes[-1][:3])
+        return [(stream, row) for _, stream, _, row in changes], cursor, has_more
+
+    @staticmethod
+    def encode_cursor(position):
+        timestamp, stream, pk = position
+        payload = json.dumps(
+            [timestamp.isoformat(), stream, str(pk)], separators=(",", ":")
+        )
+        return base64.urlsafe_b64encode(payload.encode("ascii")).decode("ascii")
+
+    @staticmethod
+    def decode_cursor(cursor):
+        if not cursor:
+            return None
+        try:
+            timestamp, stream, pk = json.loads(
+                base64.urlsafe_b64decode(cursor.encode("ascii"))
+            )
+            timestamp = parse_datetime(timestamp)
+            if timestamp is None or stream not in (UPDATED, DELETED):
+                raise ValueError
+            if stream == DELETED:
+                pk = int(pk)
+        except Exception:
+            raise InvalidCursor(cursor)
+        return timestamp, stream, pk
+
+    @staticmethod
+    def _seek(queryset, field, stream, position, until, limit):
+        queryset = queryset.filter(**{f"{field}__lte": until})
+        if position is not None:
+            timestamp, cursor_stream, pk = position
+            # (field, stream, pk) > (timestamp, cursor_stream, cursor pk)
+            after = Q(**{f"{field}__gt": timestamp})
+            if stream > cursor_stream:
+                after |= Q(**{field: timestamp})
+            elif stream == cursor_stream:
+                after |= Q(**{field: timestamp, "pk__gt": pk})
+            queryset = queryset.filter(after)
+        return list(queryset.order_by(field, "pk")[: limit + 1])
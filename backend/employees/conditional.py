@@ -0,0 +1,161 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import SAFE_METHODS
+
+# the request headers answered with 304 Not Modified
+CONDITIONAL_HEADERS = ("HTTP_IF_NONE_MATCH", "HTTP_IF_MODIFIED_SINCE")
+# the request headers answered with 412 Precondition Failed
+PRECONDITION_HEADERS = ("HTTP_IF_MATCH", "HTTP_IF_UNMODIFIED_SINCE")
+
+
+def is_conditional(request):
+    """Returns whether a GET request carries a validator to answer with 304 Not Modified."""
+    return any(header in request.META for header in CONDITIONAL_HEADERS)
+
+
+def has_preconditions(request):
+    """Returns whether a write carries a validator to answer with 412 Precondition Failed."""
+    return any(header in request.META for header in PRECONDITION_HEADERS)
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "The resource was modified since its validators were read."
+    default_code = "precondition_failed"
+
+
+class ConditionalResponseMixin:
+    """
+    A viewset mixin adding ETag and Last-Modified validators to the responses.
+
+    The validators of an instance are its primary key and updated_at, read
+    with the instance the view fetches, so they do not depend on the URL or
+    the fields the representation was read with: an ETag from a GET with
+    ?fields= is the one a later If-Match is compared with. A write to the
+    related rows embedded in the representation must move the updated_at of
+    their parent, as skill writes do for their employee. Conditional GETs are
+    answered with 304 Not Modified after an indexed lookup of updated_at,
+    before the instance is fetched and serialized, and PUT/PATCH/DELETE
+    requests carrying If-Match or If-Unmodified-Since are refused with 412
+    Precondition Failed when the fetched instance changed in the meantime.
+
+    The validators of a list are computed with an aggregate query over the
+    filtered queryset: the number of rows and their latest updated_at. It
+    costs a scan of the filtered rows, so lists only compute it for
+    conditional requests: a poller revalidates with the ETag of its previous
+    conditional response. A deleted row leaves the latest updated_at of a
+    list unchanged, so list requests only answer If-None-Match;
+    If-Modified-Since is honoured on the detail endpoints, where any write to
+    the instance moves updated_at.
+
+    Methods:
+        get_validators(queryset): Returns the ETag and the last modification time of the rows, or None if there are none.
+        get_instance_validators(pk, updated_at): Returns the ETag and the last modification time of an instance.
+    """
+
+    # read by ValuesReadMixin with the row of a retrieve
+    retrieve_columns = ("pk", "updated_at")
+
+    def list(self, request, *args, **kwargs):
+        if not is_conditional(request):
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        validators = self.get_validators(queryset)
+        if validators is None:
+            return super().list(request, *args, **kwargs)
+        etag, last_modified = validators
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+            self._set_validators(response, etag, last_modified, use_last_modified=False)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        if is_conditional(request):
+            row = (
+                self._get_instance_queryset()
+                .prefetch_related(None)
+                .values("pk", "updated_at")
+                .first()
+            )
+            if row is not None:
+                etag, last_modified = self.get_instance_validators(**row)
+                response = get_conditional_response(
+                    request,
+                    etag=etag,
+                    last_modified=int(last_modified.timestamp()),
+                )
+                if response is not None:
+                    return response
+        return self._with_validators(super().retrieve(request, *args, **kwargs))
+
+    def update(self, request, *args, **kwargs):
+        # the instance is saved in place, so its validators are the new ones
+        return self._with_validators(super().update(request, *args, **kwargs))
+
+    def get_object(self):
+        instance = super().get_object()
+        self._validated = instance
+        request = self.request
+        if request.method not in SAFE_METHODS and has_preconditions(request):
+            etag, last_modified = self.get_instance_validators(
+                instance.pk, instance.updated_at
+            )
+            response = get_conditional_response(
+                request, etag=etag, last_modified=int(last_modified.timestamp())
+            )
+            if response is not None:
+                raise PreconditionFailed
+        return instance
+
+    def row_retrieved(self, row):
+        self._validated = row
+
+    def get_validators(self, queryset):
+        values = queryset.order_by().aggregate(
+            count=Count("pk"), updated=Max("updated_at")
+        )
+        if not values["count"]:
+            return None
+        last_modified = values["updated"]
+        raw = ":".join(
+            [self.request.get_full_path(), self.request.accepted_media_type]
+            + [str(values[name]) for name in sorted(values)]
+        )
+        return quote_etag(hashlib.md5(raw.encode()).hexdigest()), last_modified
+
+    def get_instance_validators(self, pk, updated_at):
+        raw = f"{self.queryset.model._meta.label}:{pk}:{updated_at.isoformat()}"
+        return quote_etag(hashlib.md5(raw.encode()).hexdigest()), updated_at
+
+    def _get_instance_queryset(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+
+    def _with_validators(self, response):
+        # the instance fetched by get_object or the row read by ValuesReadMixin
+        validated = getattr(self, "_validated", None)
+        if validated is None or response.status_code != 200:
+            return response
+        if isinstance(validated, dict):
+            pk, updated_at = validated["pk"], validated["updated_at"]
+        else:
+            pk, updated_at = validated.pk, validated.updated_at
+        etag, last_modified = self.get_instance_validators(pk, updated_at)
+        self._set_validators(response, etag, last_modified)
+        return response
+
+    def _set_validators(self, response, etag, last_modified, use_last_modified=True):
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+        # HTTP dates have a resolution of one second
+        timestamp = int(last_modified.timestamp()) if use_last_modified else None
+        # replayed by the response cache to answer conditional requests
+        response.conditions = {"etag": etag, "last_modified": timestamp}
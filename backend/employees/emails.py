@@ -0,0 +1,174 @@
+import hashlib
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+from rest_framework import serializers
+
+from .models import Employee
+
+EMAIL_CONSTRAINT = "employee_email_lower_unique"
+
+
+def normalize_email(email):
+    return email.strip().lower()
+
+
+@contextmanager
+def unique_email(message="Email already exists", field="email"):
+    """
+    Turns a violation of the unique email constraint into a ValidationError.
+
+    The writes inside run in a savepoint, so the surrounding transaction stays
+    usable after a conflict. Other integrity errors are raised as they are.
+
+    Args:
+        message (str): The error message of the conflict.
+        field (str): The key of the error.
+    """
+    try:
+        with transaction.atomic():
+            yield
+    except IntegrityError as exc:
+        if EMAIL_CONSTRAINT not in str(exc):
+            raise
+        raise serializers.ValidationError({field: [message]})
+
+
+def email_queryset(email):
+    """Returns the employees with the email, compared case-insensitively through the unique Lower("email") index."""
+    return Employee.objects.alias(email_lower=Lower("email")).filter(
+        email_lower=normalize_email(email)
+    )
+
+
+class EmailBloomFilter:
+    """
+    An in-process Bloom filter of the normalized emails of the employees.
+
+    An email missing from the filter is certainly not taken, so the common
+    "not taken" answer of the check-email endpoint needs no query; an email
+    in the filter may be a false positive (about error_rate of them, or an
+    email that was deleted or changed since) and is checked in the database.
+    The filter is built with one scan of the emails on first use, emails are
+    added by the Employee saves and the bulk writes, and it is rebuilt when it
+    is older than max_age or holds more emails than it was sized for, which
+    also picks up the writes of other processes.
+
+    Attributes:
+        max_age (int): The number of seconds after which the filter is rebuilt.
+        error_rate (float): The false positive rate the filter is sized for.
+
+    Methods:
+        might_contain(email): Returns False if the email is certainly not taken.
+        add(email): Adds an email to the filter.
+        is_ready(): Returns whether the filter is built and fresh, so might_contain needs no query.
+        reset(): Drops the filter, so the next use rebuilds it.
+    """
+
+    max_age = 60
+    error_rate = 0.01
+    min_capacity = 1024
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        # (bits, size, hashes), replaced as a whole
+        self._filter = None
+        self._built_at = 0.0
+        self._count = 0
+        self._capacity = 0
+        self._pending = None
+
+    def is_ready(self):
+        return (
+            self._filter is not None
+            and time.monotonic() - self._built_at < self.max_age
+            and self._count <= self._capacity
+        )
+
+    def might_contain(self, email):
+        if not self.is_ready():
+            self._build()
+        bits, size, hashes = self._filter
+        return all(
+            bits[index >> 3] & (1 << (index & 7))
+            for index in self._indexes(email, size, hashes)
+        )
+
+    def add(self, email):
+        if self._pending is not None:
+            # saved while the filter is built, maybe after the scan read its row
+            self._pending.append(email)
+        if self._filter is None:
+            # built with the email on first use
+            return
+        bits, size, hashes = self._filter
+        self._set(bits, self._indexes(email, size, hashes))
+        self._count += 1
+
+    def _build(self):
+        with self._lock:
+            if self.is_ready():
+                return
+            self._pending = []
+            try:
+                emails = Employee.objects.order_by().values_list("email", flat=True)
+                count = emails.count()
+                # room to grow before the next rebuild
+                capacity = max(count * 2, self.min_capacity)
+                size = math.ceil(
+                    -capacity * math.log(self.error_rate) / math.log(2) ** 2
+                )
+                hashes = max(round(size / capacity * math.log(2)), 1)
+                bits = bytearray(math.ceil(size / 8))
+                for email in emails.iterator(chunk_size=5000):
+                    self._set(bits, self._indexes(email, size, hashes))
+                self._filter = (bits, size, hashes)
+                for email in self._pending:
+                    self._set(bits, self._indexes(email, size, hashes))
+                self._count, self._capacity = count, capacity
+                self._built_at = time.monotonic()
+            finally:
+                self._pending = None
+
+    @staticmethod
+    def _set(bits, indexes):
+        for index in indexes:
+            bits[index >> 3] |= 1 << (index & 7)
+
+    @staticmethod
+    def _indexes(email, size, hashes):
+        # double hashing: the k indexes from the two halves of one digest
+        digest = hashlib.blake2b(
+            normalize_email(email).encode(), digest_size=16
+        ).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % size for i in range(hashes)]
+
+
+email_filter = EmailBloomFilter()
+
+
+def email_exists(email):
+    """
+    Returns whether an employee has the email, compared case-insensitively.
+
+    The emails missing from the Bloom filter are answered without a query.
+    """
+    if not email_filter.might_contain(email):
+        return False
+    return email_queryset(email).exists()
+
+
+async def aemail_exists(email):
+    """The async version of email_exists; the filter is only used once built, as building it queries synchronously."""
+    if email_filter.is_ready() and not email_filter.might_contain(email):
+        return False
+    return await email_queryset(email).aexists()
@@ -0,0 +1,108 @@
+from functools import lru_cache
+
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+@lru_cache(maxsize=256)
+def sparse_serializer_class(serializer_class, fields):
+    """
+    Returns a subclass of a ModelSerializer rendering only some of its fields.
+
+    The declared fields left out are removed from the subclass, and the
+    fields keep the order of the original Meta.fields. The classes are cached,
+    so the querysets and representations planned for a class are reused.
+
+    Args:
+        serializer_class (type): The serializer to narrow.
+        fields (frozenset): The names of the fields to keep.
+
+    Returns:
+        type: The narrowed serializer class.
+    """
+    attrs = {
+        name: None for name in serializer_class._declared_fields if name not in fields
+    }
+    attrs["Meta"] = type(
+        "Meta",
+        (serializer_class.Meta,),
+        {"fields": [name for name in serializer_class.Meta.fields if name in fields]},
+    )
+    return type(f"Sparse{serializer_class.__name__}", (serializer_class,), attrs)
+
+
+class SparseFieldsMixin:
+    """
+    A viewset mixin adding the ?fields= and ?expand= query parameters to list and retrieve.
+
+    ?fields=first_name,email returns only the listed fields, and the nested
+    fields (such as skills) are only returned when they are listed or requested
+    with ?expand=skills. Without ?fields= the full representation is returned.
+    The narrowed serializer drives the queryset: only the needed columns are
+    loaded, and the nested rows are not fetched at all when they are not
+    returned. Unknown names are rejected with 400.
+
+    Attributes:
+        sparse_required_fields (tuple): The model fields always loaded, such as the ones the pagination seeks on.
+    """
+
+    sparse_required_fields = ("id", "updated_at")
+
+    def get_serializer_class(self):
+        serializer_class = super().get_serializer_class()
+        if self.action not in ("list", "retrieve"):
+            return serializer_class
+        fields = self.get_sparse_fields(serializer_class)
+        if fields is None:
+            return serializer_class
+        return sparse_serializer_class(serializer_class, fields)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action not in ("list", "retrieve"):
+            return queryset
+        fields = self.get_sparse_fields(super().get_serializer_class())
+        if fields is None:
+            return queryset
+        model_fields = {field.name for field in queryset.model._meta.concrete_fields}
+        columns = set(self.sparse_required_fields) | (fields & model_fields)
+        return queryset.only(*sorted(columns))
+
+    def get_sparse_fields(self, serializer_class):
+        """Returns the names of the requested fields, or None for all of them."""
+        if not hasattr(self, "_sparse_fields"):
+            self._sparse_fields = self._parse_sparse_fields(serializer_class)
+        return self._sparse_fields
+
+    def _parse_sparse_fields(self, serializer_class):
+        requested = self._split(self.request.query_params.get("fields"))
+        expand = self._split(self.request.query_params.get("expand"))
+        if requested is None and expand is None:
+            return None
+
+        serializer = serializer_class()
+        nested = {
+            name
+            for name, field in serializer.fields.items()
+            if isinstance(field, serializers.BaseSerializer)
+        }
+        errors = {}
+        if requested is not None:
+            unknown = requested - set(serializer.fields)
+            if unknown:
+                errors["fields"] = [f"Unknown fields: {', '.join(sorted(unknown))}"]
+        if expand is not None:
+            unknown = expand - nested
+            if unknown:
+                errors["expand"] = [f"Unknown fields: {', '.join(sorted(unknown))}"]
+        if errors:
+            raise ValidationError(errors)
+        if requested is None:
+            return None
+        return frozenset(requested | (expand or set()))
+
+    @staticmethod
+    def _split(value):
+        if value is None:
+            return None
+        return {name.strip() for name in value.split(",") if name.strip()}
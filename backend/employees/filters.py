@@ -1,5 +1,64 @@
 import django_filters
+from django import forms
+from django.db.models import Count, Exists, OuterRef
 from .models import Employee, Skill
+from .skill_names import find_skill_names
+from .summaries import senior_skill_lookup
+
+
+class SkillNameField(forms.MultipleChoiceField):
+    """
+    A multiple choice field accepting any existing skill name.
+
+    The names are checked against the cached set of distinct skill names, so
+    validation does not load the skill rows.
+    """
+
+    def validate(self, value):
+        if not value:
+            if self.required:
+                raise forms.ValidationError(
+                    self.error_messages["required"], code="required"
+                )
+            return
+        found = find_skill_names(value)
+        for name in value:
+            if name not in found:
+                raise forms.ValidationError(
+                    self.error_messages["invalid_choice"],
+                    code="invalid_choice",
+                    params={"value": name},
+                )
+
+
+class SkillNameFilter(django_filters.Filter):
+    """
+    A filter for employees having skills with the given names.
+
+    Matching employees are selected with a subquery on Skill instead of a join,
+    so employees with several matching skills are not repeated and no DISTINCT
+    is needed. With ?skills_match=any (default) an employee needs one of the
+    names, which is an EXISTS subquery; with ?skills_match=all it needs every
+    name, which is a subquery grouping the matching skills per employee.
+    """
+
+    field_class = SkillNameField
+
+    def filter(self, qs, value):
+        if not value:
+            return qs
+        names = set(value)
+        skills = Skill.objects.filter(name__in=names).order_by()
+        if self.parent.form.cleaned_data.get("skills_match") == "all":
+            # (name, employee) is unique, so counting the rows counts the names
+            employees = (
+                skills.values("employee")
+                .annotate(matched=Count("id"))
+                .filter(matched=len(names))
+                .values("employee")
+            )
+            return qs.filter(pk__in=employees)
+        return qs.filter(Exists(skills.filter(employee=OuterRef("pk"))))
 
 
 class EmployeeFilter(django_filters.FilterSet):
@@ -9,10 +68,11 @@ class EmployeeFilter(django_filters.FilterSet):
     Attributes:
         start_date_of_birth (django_filters.DateFilter): A filter for the start date of birth of employees. It filters the employees whose date of birth is greater than or equal to the specified date.
         end_date_of_birth (django_filters.DateFilter): A filter for the end date of birth of employees. It filters the employees whose date of birth is less than or equal to the specified date.
-        skills (django_filters.ModelMultipleChoiceFilter): A filter for the skills of employees. It filters the employees based on the selected skills.
+        skills (SkillNameFilter): A filter for the skills of employees. It filters the employees based on the selected skill names.
             - field_name (str): The name of the field to filter on, which is "skills__name" in this case.
-            - to_field_name (str): The name of the field to use for the filter, which is "name" in this case.
-            - queryset (QuerySet): The queryset of skills to choose from, which is Skill.objects.all() in this case.
+            - The names are validated against the cached set of distinct skill names.
+        skills_match (django_filters.ChoiceFilter): Whether the employees need "any" (default) or "all" of the selected skills.
+        senior_skill (django_filters.CharFilter): A filter for the employees with a senior skill of the given name, read from the skill summary.
 
     Meta:
         model (Employee): The model to filter, which is the Employee model in this case.
@@ -22,6 +82,8 @@ class EmployeeFilter(django_filters.FilterSet):
             - "email": ["icontains"]: A case-insensitive filter for the email of employees. It filters the employees whose email contains the specified value.
             - "skills": ["exact"]: An exact filter for the skills of employees. It filters the employees whose skills exactly match the selected skills.
             - "date_of_birth": ["exact"]: An exact filter for the date of birth of employees. It filters the employees whose date of birth exactly matches the specified date.
+            - "skill_count": ["exact", "gte", "lte"]: Filters on the number of skills of employees, read from the skill summary.
+            - "max_yrs_exp": ["gte", "lte"]: Filters on the highest years of experience of employees in any skill, read from the skill summary.
 
     """
 
@@ -32,11 +94,11 @@ class EmployeeFilter(django_filters.FilterSet):
         field_name="date_of_birth", lookup_expr="lte"
     )
     # filter by skills, will be a select
-    skills = django_filters.ModelMultipleChoiceFilter(
-        field_name="skills__name",
-        to_field_name="name",
-        queryset=Skill.objects.all(),
+    skills = SkillNameFilter(field_name="skills__name")
+    skills_match = django_filters.ChoiceFilter(
+        choices=[("any", "any"), ("all", "all")], method="filter_skills_match"
     )
+    senior_skill = django_filters.CharFilter(method="filter_senior_skill")
 
     class Meta:
         model = Employee
@@ -46,4 +108,43 @@ class EmployeeFilter(django_filters.FilterSet):
             "email": ["icontains"],
             "skills": ["exact"],
             "date_of_birth": ["exact"],  # You can specify other lookups if needed
+            # the skill summary columns, filtered without joining the skills
+            "skill_count": ["exact", "gte", "lte"],
+            "max_yrs_exp": ["gte", "lte"],
+        }
+
+    def filter_skills_match(self, queryset, name, value):
+        # read by the skills filter
+        return queryset
+
+    def filter_senior_skill(self, queryset, name, value):
+        return queryset.filter(**senior_skill_lookup(value))
+
+
+class SkillFilter(django_filters.FilterSet):
+    """
+    A class representing a filter for the Skill model.
+
+    Every filter is served by an index of the skills: the (name, employee)
+    unique index for ?name=, the (employee, name) index for ?employee=, the
+    (seniority, name) index for ?seniority= and the (yrs_exp, id) index for
+    the years of experience range.
+
+    Meta:
+        model (Skill): The model to filter, which is the Skill model in this case.
+        fields (dict): The fields to filter on and the lookup types to use for each field.
+            - "employee": ["exact"]: The skills of the employee with the given id.
+            - "name": ["exact"]: The skills with the given name.
+            - "seniority": ["exact"]: The skills with the given seniority.
+            - "yrs_exp": ["gte", "lte"]: The skills with at least or at most the given years of experience.
+
+    """
+
+    class Meta:
+        model = Skill
+        fields = {
+            "employee": ["exact"],
+            "name": ["exact"],
+            "seniority": ["exact"],
+            "yrs_exp": ["gte", "lte"],
         }
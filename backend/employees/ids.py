@@ -0,0 +1,205 @@
+import functools
+import hashlib
+import threading
+import weakref
+from collections import deque
+
+from django.db import transaction
+from django.db.models import F
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+DIGITS = 10000
+ID_SPACE = len(LETTERS) * len(LETTERS) * DIGITS
+
+# The permutation key only has to be stable, it is not a secret: changing it
+# reshuffles the mapping and previously issued ids would have to be skipped.
+DEFAULT_KEY = b"employee-id"
+
+
+class IdSpaceExhausted(Exception):
+    """Raised when every identifier of the id space has been handed out."""
+
+
+def format_id(index):
+    """
+    Formats an index of the id space as an employee identifier.
+
+    Example:
+        >>> format_id(0)
+        'AA0000'
+        >>> format_id(ID_SPACE - 1)
+        'ZZ9999'
+    """
+    letters, digits = divmod(index, DIGITS)
+    first, second = divmod(letters, len(LETTERS))
+    return f"{LETTERS[first]}{LETTERS[second]}{digits:04d}"
+
+
+def parse_id(value):
+    """
+    Returns the index of the id space for an employee identifier.
+
+    Example:
+        >>> parse_id("AB1234")
+        11234
+    """
+    first = LETTERS.index(value[0])
+    second = LETTERS.index(value[1])
+    return (first * len(LETTERS) + second) * DIGITS + int(value[2:])
+
+
+def take(ids, count):
+    """Pops up to count identifiers from the left of a deque."""
+    return [ids.popleft() for _ in range(min(count, len(ids)))]
+
+
+class Permutation:
+    """
+    A keyed bijection of range(space) onto itself.
+
+    A balanced Feistel network permutes the smallest even-bit domain covering
+    the space, and values falling outside the space are walked through the
+    network again until they land inside it, which keeps the mapping a
+    bijection on range(space). Sequential counters are therefore turned into
+    identifiers that look random but can never collide.
+
+    Attributes:
+        space (int): The size of the permuted range.
+        key (bytes): The key the round function is derived from.
+        rounds (int): The number of Feistel rounds.
+    """
+
+    def __init__(self, space=ID_SPACE, key=DEFAULT_KEY, rounds=4):
+        self.space = space
+        self.key = key
+        self.rounds = rounds
+        half_bits = max(1, ((space - 1).bit_length() + 1) // 2)
+        self._half_bits = half_bits
+        self._half_mask = (1 << half_bits) - 1
+
+    def __call__(self, value):
+        if not 0 <= value < self.space:
+            raise ValueError(f"{value} is outside of the permuted range")
+        value = self._encrypt(value)
+        while value >= self.space:
+            value = self._encrypt(value)
+        return value
+
+    def _round(self, round_number, value):
+        digest = hashlib.blake2b(
+            value.to_bytes(4, "big"),
+            digest_size=4,
+            key=self.key,
+            salt=round_number.to_bytes(16, "big"),
+        ).digest()
+        return int.from_bytes(digest, "big") & self._half_mask
+
+    def _encrypt(self, value):
+        left = value >> self._half_bits
+        right = value & self._half_mask
+        for round_number in range(self.rounds):
+            left, right = right, left ^ self._round(round_number, right)
+        return (left << self._half_bits) | right
+
+
+class IdAllocator:
+    """
+    Hands out unique employee identifiers without probing the table per insert.
+
+    A counter stored in an IdSequence row is advanced by a whole block at a time
+    with a single atomic UPDATE, so concurrent processes always reserve disjoint
+    blocks. Every counter value is mapped through a keyed permutation and
+    formatted as ``AB1234``, which keeps the identifiers looking random. The
+    identifiers of a new block are checked against the table with one query, so
+    rows created by the previous random generator are skipped instead of
+    colliding. The reservation is part of the caller's transaction, so the
+    rest of a block is kept for that transaction and its connection, and is
+    only shared with the process once the transaction commits: a rollback
+    reverts the counter, the identifiers may be reserved again elsewhere and
+    the rest of the block is dropped.
+
+    Attributes:
+        sequence_model (type): The model storing the counters.
+        model (type): The model the identifiers are allocated for.
+        name (str): The name of the counter row.
+        block_size (int): The number of identifiers reserved at once.
+        permutation (Permutation): The mapping from counter values to the id space.
+
+    Methods:
+        allocate(count): Returns a list of count unused identifiers.
+    """
+
+    def __init__(self, sequence_model, model, name, block_size=100, permutation=None):
+        self.sequence_model = sequence_model
+        self.model = model
+        self.name = name
+        self.block_size = block_size
+        self.permutation = permutation or Permutation()
+        self._lock = threading.Lock()
+        self._pending = deque()
+        # {connection: (on_commit callback, the rest of its last block)}
+        self._leftovers = weakref.WeakKeyDictionary()
+
+    def allocate(self, count=1):
+        connection = transaction.get_connection()
+        with self._lock:
+            ids = take(self._pending, count)
+            ids += take(self._get_leftover(connection), count - len(ids))
+            while len(ids) < count:
+                needed = count - len(ids)
+                block = self._reserve(max(self.block_size, needed))
+                ids.extend(block[:needed])
+                if len(block) > needed:
+                    self._keep(connection, block[needed:])
+            return ids
+
+    def reset(self):
+        """Drops the identifiers reserved by this process but not handed out yet."""
+        with self._lock:
+            self._pending.clear()
+            self._leftovers.clear()
+
+    def _keep(self, connection, ids):
+        leftover = deque(ids)
+        # runs right away in autocommit mode, never on rollback
+        release = functools.partial(self._release, leftover)
+        self._leftovers[connection] = (release, leftover)
+        transaction.on_commit(release)
+
+    def _release(self, leftover):
+        self._pending.extend(leftover)
+        leftover.clear()
+
+    def _get_leftover(self, connection):
+        release, leftover = self._leftovers.get(connection, (None, deque()))
+        # a rollback of the reserving transaction or savepoint drops its
+        # callbacks, and a commit runs them: either way the block is gone
+        if release is not None and not any(
+            callback is release for _, callback, _ in connection.run_on_commit
+        ):
+            del self._leftovers[connection]
+            leftover = deque()
+        return leftover
+
+    def _reserve(self, size):
+        with transaction.atomic():
+            sequences = self.sequence_model.objects.filter(name=self.name)
+            if not sequences.update(next_value=F("next_value") + size):
+                self.sequence_model.objects.get_or_create(name=self.name)
+                sequences.update(next_value=F("next_value") + size)
+            end = sequences.values_list("next_value", flat=True).get()
+        start = end - size
+        if start >= self.permutation.space:
+            raise IdSpaceExhausted(f"The {self.name} id space is exhausted")
+        end = min(end, self.permutation.space)
+
+        ids = [format_id(self.permutation(value)) for value in range(start, end)]
+        taken = set()
+        # stay below the bound parameter limit of SQLite
+        for offset in range(0, len(ids), 500):
+            taken.update(
+                self.model.objects.filter(
+                    pk__in=ids[offset : offset + 500]
+                ).values_list("pk", flat=True)
+            )
+        return [value for value in ids if value not in taken]
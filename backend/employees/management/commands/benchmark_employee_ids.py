@@ -0,0 +1,126 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from employees.ids import IdAllocator, Permutation, format_id
+from employees.models import Employee, IdSequence
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    """
+    Compares insert latency of the random retry-until-unique id generator with the id allocator.
+
+    For every occupancy level the table is filled up to that fraction of the id
+    space, a number of employees is inserted with each strategy and the latency
+    is reported. Everything runs inside a transaction that is rolled back, so
+    the database is left untouched. The id space is scaled down with --space to
+    keep the fill step fast; the occupancy ratio is what drives the cost.
+
+    Example:
+        python manage.py benchmark_employee_ids --space 100000 --inserts 500
+    """
+
+    help = "Benchmark employee id generation at several id space occupancy levels."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--space", type=int, default=100000)
+        parser.add_argument("--inserts", type=int, default=500)
+        parser.add_argument(
+            "--occupancy", type=float, nargs="+", default=[0.1, 0.5, 0.9]
+        )
+
+    def handle(self, *args, **options):
+        space = options["space"]
+        inserts = options["inserts"]
+        self.stdout.write(
+            f"{'strategy':<10} {'occupancy':>9} {'mean ms':>9} {'p95 ms':>9} {'queries':>9}"
+        )
+        for occupancy in options["occupancy"]:
+            filled = int(space * occupancy)
+            if filled + inserts > space:
+                self.stderr.write(f"Skipping {occupancy:.0%}: not enough free ids")
+                continue
+            for strategy in (self.random_strategy, self.allocator_strategy):
+                try:
+                    with transaction.atomic():
+                        name, latencies, queries = strategy(space, filled, inserts)
+                        raise Rollback
+                except Rollback:
+                    pass
+                self.stdout.write(
+                    f"{name:<10} {occupancy:>9.0%} "
+                    f"{statistics.mean(latencies) * 1000:>9.3f} "
+                    f"{statistics.quantiles(latencies, n=20)[18] * 1000:>9.3f} "
+                    f"{queries / inserts:>9.2f}"
+                )
+
+    def random_strategy(self, space, filled, inserts):
+        self.fill(format_id(value) for value in random.sample(range(space), filled))
+        latencies = []
+        queries = 0
+        for _ in range(inserts):
+            start = time.perf_counter()
+            # the previous Employee.save(): draw until the probe misses
+            value = format_id(random.randrange(space))
+            queries += 1
+            while Employee.objects.filter(id=value).exists():
+                value = format_id(random.randrange(space))
+                queries += 1
+            self.create(value)
+            queries += 1
+            latencies.append(time.perf_counter() - start)
+        return "random", latencies, queries
+
+    def allocator_strategy(self, space, filled, inserts):
+        permutation = Permutation(space=space)
+        self.fill(format_id(permutation(value)) for value in range(filled))
+        IdSequence.objects.update_or_create(
+            name="benchmark", defaults={"next_value": filled}
+        )
+        allocator = IdAllocator(
+            IdSequence, Employee, name="benchmark", permutation=permutation
+        )
+        latencies = []
+        pending = []
+        for _ in range(inserts):
+            start = time.perf_counter()
+            # the allocator only keeps the rest of a block on commit, which the
+            # rolled back benchmark transaction never reaches
+            if not pending:
+                pending = allocator.allocate(allocator.block_size)
+            self.create(pending.pop())
+            latencies.append(time.perf_counter() - start)
+        # one UPDATE, one SELECT and one existence check per block, one INSERT per row
+        blocks = -(-inserts // allocator.block_size)
+        return "allocator", latencies, inserts + blocks * 3
+
+    def fill(self, ids):
+        Employee.objects.bulk_create(
+            (
+                Employee(
+                    id=value,
+                    first_name="Bench",
+                    last_name="Mark",
+                    email=f"bench-{value.lower()}@example.com",
+                    date_of_birth="1990-01-01",
+                )
+                for value in ids
+            ),
+            batch_size=500,
+        )
+
+    def create(self, value):
+        Employee.objects.create(
+            id=value,
+            first_name="Bench",
+            last_name="Mark",
+            email=f"bench-{value.lower()}@example.com",
+            date_of_birth="1990-01-01",
+        )
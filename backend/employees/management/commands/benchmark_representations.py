@@ -0,0 +1,106 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from employees.ids import format_id
+from employees.models import Employee, Skill
+from employees.querysets import optimize_queryset
+from employees.representations import ValuesRepresentation
+from employees.serializers import EmployeeSerializer
+from employees.skill_names import invalidate_skill_names
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    """
+    Compares the serializer with the .values() representation on list pages.
+
+    The table is filled with --employees employees having --skills skills
+    each, and the whole list is read and rendered to JSON --repeat times with
+    EmployeeSerializer and with ValuesRepresentation. The mean and best time
+    of each are reported with the speedup, after checking that both render
+    the same content. Everything runs inside a transaction that is rolled
+    back, so the database is left untouched.
+
+    Example:
+        python manage.py benchmark_representations --employees 10000
+    """
+
+    help = "Benchmark the serializer against the .values() representation."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--employees", type=int, default=10000)
+        parser.add_argument("--skills", type=int, default=3)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.fill(options["employees"], options["skills"])
+                self.report(options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+        invalidate_skill_names()
+
+    def report(self, repeat):
+        representation = ValuesRepresentation(EmployeeSerializer)
+        renderer = JSONRenderer()
+
+        def serializer():
+            queryset = optimize_queryset(Employee.objects.all(), EmployeeSerializer)
+            return renderer.render(EmployeeSerializer(queryset, many=True).data)
+
+        def values():
+            rows = representation.values(Employee.objects.all())
+            return renderer.render(representation.to_representation(rows))
+
+        if serializer() != values():
+            self.stderr.write("The representations render different content")
+            return
+        timings = {}
+        self.stdout.write(f"{'representation':<14} {'mean ms':>9} {'best ms':>9}")
+        for name, render in (("serializer", serializer), ("values", values)):
+            latencies = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                render()
+                latencies.append(time.perf_counter() - start)
+            timings[name] = statistics.mean(latencies)
+            self.stdout.write(
+                f"{name:<14} {timings[name] * 1000:>9.1f} {min(latencies) * 1000:>9.1f}"
+            )
+        self.stdout.write(f"speedup {timings['serializer'] / timings['values']:.1f}x")
+
+    def fill(self, employees, skills):
+        for start in range(0, employees, 5000):
+            batch = Employee.objects.bulk_create(
+                Employee(
+                    id=format_id(index),
+                    first_name=f"Bench {index}",
+                    last_name="Mark",
+                    email=f"bench{index}@example.com",
+                    date_of_birth="1990-01-01",
+                    city="New York",
+                )
+                for index in range(start, min(start + 5000, employees))
+            )
+            Skill.objects.bulk_create(
+                (
+                    Skill(
+                        employee=employee,
+                        name=f"Skill {offset}",
+                        yrs_exp=offset,
+                        seniority="Senior",
+                    )
+                    for employee in batch
+                    for offset in range(skills)
+                ),
+                batch_size=5000,
+            )
@@ -0,0 +1,155 @@
+import statistics
+import time
+
+import django_filters
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connection, transaction
+from django.http import QueryDict
+from django.test.utils import CaptureQueriesContext
+
+from employees.filters import EmployeeFilter
+from employees.ids import format_id
+from employees.models import Employee, Skill
+from employees.skill_names import invalidate_skill_names
+
+
+class Rollback(Exception):
+    pass
+
+
+class LegacyEmployeeFilter(django_filters.FilterSet):
+    # the previous skills filter: validated against every skill row, joined
+    skills = django_filters.ModelMultipleChoiceFilter(
+        field_name="skills__name",
+        to_field_name="name",
+        queryset=Skill.objects.all(),
+    )
+
+    class Meta:
+        model = Employee
+        fields = ["skills"]
+
+
+class Command(BaseCommand):
+    """
+    Compares the skills filter with the previous ModelMultipleChoiceFilter.
+
+    The table is filled with --employees employees having --skills skills each,
+    drawn from a fixed pool of names, and every filter is run --repeat times for
+    one and for several skill names. The mean and p95 latency, the number of
+    queries and the number of rows returned are reported; the legacy filter
+    returns an employee once per matching skill. Everything runs inside a
+    transaction that is rolled back, so the database is left untouched.
+
+    Example:
+        python manage.py benchmark_skills_filter --employees 100000 --skills 10
+    """
+
+    help = "Benchmark the employee skills filter against the previous filter."
+
+    names = [f"Skill {index}" for index in range(50)]
+
+    def add_arguments(self, parser):
+        parser.add_argument("--employees", type=int, default=100000)
+        parser.add_argument("--skills", type=int, default=10)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        if options["skills"] > len(self.names):
+            self.stderr.write(f"At most {len(self.names)} skills per employee")
+            return
+        try:
+            with transaction.atomic():
+                self.fill(options["employees"], options["skills"])
+                self.report(options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+        invalidate_skill_names()
+
+    def report(self, repeat):
+        cases = [
+            ("legacy", LegacyEmployeeFilter, {"skills": self.names[:1]}),
+            ("any", EmployeeFilter, {"skills": self.names[:1]}),
+            ("legacy", LegacyEmployeeFilter, {"skills": self.names[:3]}),
+            ("any", EmployeeFilter, {"skills": self.names[:3]}),
+            (
+                "all",
+                EmployeeFilter,
+                {"skills": self.names[:3], "skills_match": "all"},
+            ),
+        ]
+        self.stdout.write(
+            f"{'filter':<8} {'names':>5} {'mean ms':>9} {'p95 ms':>9} "
+            f"{'queries':>7} {'rows':>8}"
+        )
+        for name, filterset_class, params in cases:
+            latencies = []
+            try:
+                for _ in range(repeat):
+                    invalidate_skill_names()
+                    start = time.perf_counter()
+                    with transaction.atomic(), CaptureQueriesContext(
+                        connection
+                    ) as queries:
+                        filterset = filterset_class(
+                            data=self.query_dict(params),
+                            queryset=Employee.objects.all(),
+                        )
+                        rows = len(filterset.qs.values_list("pk", flat=True))
+                    latencies.append(time.perf_counter() - start)
+            except DatabaseError as exc:
+                # the legacy filter ORs one condition per matching skill row,
+                # which SQLite refuses past its expression depth limit
+                self.stdout.write(f"{name:<8} {len(params['skills']):>5} failed: {exc}")
+                continue
+            p95 = (
+                statistics.quantiles(latencies, n=20)[18]
+                if len(latencies) > 1
+                else latencies[0]
+            )
+            self.stdout.write(
+                f"{name:<8} {len(params['skills']):>5} "
+                f"{statistics.mean(latencies) * 1000:>9.1f} {p95 * 1000:>9.1f} "
+                f"{len(queries):>7} {rows:>8}"
+            )
+
+    def query_dict(self, params):
+        data = QueryDict(mutable=True)
+        for key, value in params.items():
+            data.setlist(key, value if isinstance(value, list) else [value])
+        return data
+
+    def fill(self, employees, skills):
+        batch = []
+        for index in range(employees):
+            employee = Employee(
+                id=format_id(index),
+                first_name="Bench",
+                last_name="Mark",
+                email=f"bench{index}@example.com",
+                date_of_birth="1990-01-01",
+            )
+            batch.append(employee)
+            if len(batch) == 5000:
+                self.fill_batch(batch, skills)
+                batch = []
+        if batch:
+            self.fill_batch(batch, skills)
+
+    def fill_batch(self, employees, skills):
+        Employee.objects.bulk_create(employees)
+        pool = len(self.names)
+        Skill.objects.bulk_create(
+            (
+                Skill(
+                    employee=employee,
+                    name=self.names[(index + offset) % pool],
+                    yrs_exp=offset,
+                    seniority="Mid",
+                )
+                for index, employee in enumerate(employees)
+                for offset in range(skills)
+            ),
+            batch_size=5000,
+        )
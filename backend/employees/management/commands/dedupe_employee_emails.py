@@ -0,0 +1,78 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from employees.caching import EMPLOYEES, response_cache
+from employees.models import Employee
+
+
+class Command(BaseCommand):
+    """
+    Resolves the employees sharing an email, compared case-insensitively.
+
+    Migration 0009 adds a unique constraint on Lower("email") and refuses to
+    run while duplicates exist. In every group of employees with the same
+    email, the most recently updated one keeps it. Without options the
+    duplicates are only listed; with --apply the email of the others is
+    rewritten to local+dup-<id>@domain, so no data is lost and they can be
+    fixed by hand; with --delete the others are deleted with their skills.
+
+    Example:
+        python manage.py dedupe_employee_emails --apply
+    """
+
+    help = "List, rename (--apply) or delete (--delete) employees sharing an email."
+
+    def add_arguments(self, parser):
+        action = parser.add_mutually_exclusive_group()
+        action.add_argument("--apply", action="store_true")
+        action.add_argument("--delete", action="store_true")
+
+    def handle(self, *args, **options):
+        employees = Employee.objects.annotate(email_lower=Lower("email"))
+        emails = list(
+            employees.order_by()
+            .values("email_lower")
+            .annotate(count=Count("id"))
+            .filter(count__gt=1)
+            .values_list("email_lower", flat=True)
+        )
+        if not emails:
+            self.stdout.write("No duplicate emails")
+            return
+
+        duplicates = []
+        kept = None
+        rows = employees.filter(email_lower__in=emails).order_by(
+            "email_lower", "-updated_at", "-id"
+        )
+        for employee in rows:
+            if kept is None or kept.email_lower != employee.email_lower:
+                kept = employee
+                continue
+            duplicates.append(employee)
+            self.stdout.write(f"{employee.id} {employee.email}: duplicate of {kept.id}")
+
+        if options["delete"]:
+            with transaction.atomic():
+                for employee in duplicates:
+                    employee.delete()
+            self.stdout.write(f"Deleted {len(duplicates)} employees")
+        elif options["apply"]:
+            now = timezone.now()
+            for employee in duplicates:
+                local, _, domain = employee.email.rpartition("@")
+                employee.email = f"{local}+dup-{employee.id.lower()}@{domain}"
+                employee.updated_at = now
+            with transaction.atomic():
+                Employee.objects.bulk_update(duplicates, ["email", "updated_at"])
+                # bulk_update does not send post_save
+                response_cache.invalidate(EMPLOYEES)
+            self.stdout.write(f"Renamed the email of {len(duplicates)} employees")
+        else:
+            raise CommandError(
+                f"{len(duplicates)} employees share the email of another one; "
+                "run with --apply or --delete to resolve them"
+            )
@@ -0,0 +1,213 @@
+import csv
+import json
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework import serializers
+
+from employees.serializers import EmployeeSerializer, EmployeeSkillSerializer
+from employees.skill_sync import sync_skills
+
+
+class ImportEmployeeSerializer(EmployeeSerializer):
+    """
+    The EmployeeSerializer rules, with the columns the model leaves optional allowed blank.
+
+    Employees created before these columns were required by the API are
+    exported with them blank or null, and importing an export must accept
+    them back. A given contact number or postcode is still validated.
+    """
+
+    contact_number = serializers.CharField(
+        required=False, allow_blank=True, allow_null=True
+    )
+    street_address = serializers.CharField(
+        required=False, allow_blank=True, allow_null=True
+    )
+    city = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    postcode = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    country = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+    def validate_contact_number(self, value):
+        return super().validate_contact_number(value) if value else value
+
+    def validate_postcode(self, value):
+        return super().validate_postcode(value) if value else value
+
+
+class Command(BaseCommand):
+    """
+    Imports employees and their skills from a CSV or NDJSON file.
+
+    The file is streamed and processed in batches. Each batch is validated with
+    the EmployeeSerializer field rules, with email uniqueness checked for the
+    whole batch at once, and written with bulk queries in one transaction. Rows
+    with an "id" update that employee, rows without one update the employee
+    owning their email or create a new one. Skills are upserted on their
+    (name, employee) pair; with --prune-skills the skills missing from a row
+    are deleted. Rejected rows are reported with their line number and errors.
+
+    The CSV layout is the one produced by /api/employees/export/, with the
+    skills column holding a JSON array of {"name", "yrs_exp", "seniority"}.
+    The contact and address columns may be blank, as they are in the export
+    of older employees. A batch whose write conflicts with a concurrent
+    writer on an email is rolled back and its rows are reported as rejected.
+
+    Example:
+        python manage.py import_employees employees.ndjson --batch-size 2000
+    """
+
+    help = "Import employees and skills from a CSV or NDJSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "ndjson"])
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--prune-skills", action="store_true")
+        parser.add_argument(
+            "--rejects", help="Write rejected rows with their errors to this file."
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or (
+            "csv" if path.lower().endswith(".csv") else "ndjson"
+        )
+        self.prune_skills = options["prune_skills"]
+        self.list_serializer = ImportEmployeeSerializer(many=True)
+        self.skill_serializer = EmployeeSkillSerializer()
+
+        rejects = None
+        self.counts = {"created": 0, "updated": 0, "rejected": 0}
+        start = time.perf_counter()
+        try:
+            if options["rejects"]:
+                rejects = open(options["rejects"], "w")
+            with open(path, newline="") as source:
+                rows = (
+                    self.read_csv(source)
+                    if file_format == "csv"
+                    else self.read_ndjson(source)
+                )
+                while True:
+                    batch = list(islice(rows, options["batch_size"]))
+                    if not batch:
+                        break
+                    for line, row, errors in self.import_batch(batch):
+                        self.counts["rejected"] += 1
+                        if rejects:
+                            rejects.write(
+                                json.dumps({"line": line, "row": row, "errors": errors})
+                                + "\n"
+                            )
+                        else:
+                            self.stderr.write(f"Line {line}: {json.dumps(errors)}")
+        except OSError as exc:
+            raise CommandError(exc)
+        finally:
+            if rejects:
+                rejects.close()
+
+        elapsed = time.perf_counter() - start
+        total = sum(self.counts.values())
+        self.stdout.write(
+            f"Processed {total} rows in {elapsed:.2f}s "
+            f"({total / elapsed if elapsed else 0:.0f} rows/sec): "
+            f"{self.counts['created']} created, {self.counts['updated']} updated, "
+            f"{self.counts['rejected']} rejected"
+        )
+
+    def read_csv(self, source):
+        reader = csv.DictReader(source)
+        for row in reader:
+            skills = row.get("skills") or "[]"
+            try:
+                row["skills"] = json.loads(skills)
+            except ValueError:
+                row["skills"] = skills
+            yield reader.line_num, row
+
+    def read_ndjson(self, source):
+        for line_num, line in enumerate(source, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_num, json.loads(line)
+            except ValueError:
+                yield line_num, line.rstrip("\n")
+
+    def import_batch(self, batch):
+        """Validates and writes a batch, and returns the rejected rows."""
+        rejected = []
+        lines, data = [], []
+        for line, row in batch:
+            if not isinstance(row, dict):
+                rejected.append((line, row, {"non_field_errors": ["Invalid row"]}))
+                continue
+            lines.append(line)
+            data.append(row)
+
+        # the skills are validated and written here, with the last of a
+        # repeated name winning and --prune-skills deciding on the others
+        rows, instances, errors = self.list_serializer.validate_rows(
+            [
+                {key: value for key, value in row.items() if key != "skills"}
+                for row in data
+            ],
+            match_email=True,
+        )
+        skills = {}
+        for index, row in enumerate(rows):
+            if row is None:
+                continue
+            skills[index], skill_errors = self.validate_skills(
+                data[index].get("skills")
+            )
+            if skill_errors:
+                errors[index]["skills"] = skill_errors
+                rows[index] = None
+
+        valid = [index for index, row in enumerate(rows) if row is not None]
+        try:
+            with transaction.atomic():
+                employees = self.list_serializer.write_rows(
+                    [rows[index] for index in valid],
+                    [instances[index] for index in valid],
+                )
+                sync_skills(
+                    employees,
+                    [skills[index] for index in valid],
+                    prune=self.prune_skills,
+                )
+        except serializers.ValidationError as exc:
+            # an email was taken by another writer since validate_rows, and
+            # the batch was rolled back
+            for index in valid:
+                errors[index] = exc.detail
+            valid = []
+
+        for index in valid:
+            self.counts["updated" if instances[index] is not None else "created"] += 1
+        for index, row_errors in enumerate(errors):
+            if row_errors:
+                rejected.append((lines[index], data[index], row_errors))
+        return rejected
+
+    def validate_skills(self, data):
+        if data in (None, ""):
+            return [], None
+        if not isinstance(data, list):
+            return None, ["Skills must be a list"]
+        skills = {}
+        errors = []
+        for item in data:
+            try:
+                skill = self.skill_serializer.run_validation(item)
+            except serializers.ValidationError as exc:
+                errors.append(exc.detail)
+                continue
+            # a repeated name would break unique_together, the last one wins
+            skills[skill["name"]] = skill
+        return list(skills.values()), errors or None
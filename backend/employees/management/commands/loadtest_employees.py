@@ -0,0 +1,115 @@
+import asyncio
+import itertools
+import math
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, override_settings
+
+from employees.models import Employee
+
+
+class Command(BaseCommand):
+    """
+    Compares the requests/sec and latency of the sync and async employee endpoints.
+
+    The ASGI application is driven in-process through the async test client,
+    which goes through the same ASGIHandler as uvicorn: --concurrency requests
+    are kept in flight on one event loop, the sync DRF views run through
+    sync_to_async and the views of employees.async_views run on the loop.
+    Every scenario is run against the sync path and its /api/async/
+    counterpart, and the throughput, p50 and p99 latencies and cache hit ratio
+    are reported. The configured database is used, so seed it first; run with
+    EMPLOYEES_CACHE_TIMEOUT=0 to compare the uncached sync path, as the async
+    path does not use the response cache.
+
+    Example:
+        python manage.py loadtest_employees --requests 2000 --concurrency 64
+    """
+
+    help = "Load test the sync and async employee read endpoints in-process."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument("--page-size", type=int, default=50)
+
+    def handle(self, *args, **options):
+        employee = Employee.objects.order_by("id").first()
+        if employee is None:
+            raise CommandError("There are no employees to load test with")
+        page = f"?page_size={options['page_size']}"
+        scenarios = [
+            ("list", "get", "/api/employees/" + page, "/api/async/employees/" + page),
+            (
+                "detail",
+                "get",
+                f"/api/employees/{employee.id}/",
+                f"/api/async/employees/{employee.id}/",
+            ),
+            (
+                "check-email",
+                "post",
+                f"/api/check-email/{employee.email}/",
+                f"/api/async/check-email/{employee.email}/",
+            ),
+        ]
+
+        self.stdout.write(
+            f"{options['requests']} requests per run, concurrency "
+            f"{options['concurrency']}\n"
+            f"{'scenario':<12} {'path':<6} {'req/s':>8} {'p50 ms':>8} "
+            f"{'p99 ms':>8} {'cache':>6} statuses"
+        )
+        for name, method, sync_path, async_path in scenarios:
+            for label, path in (("sync", sync_path), ("async", async_path)):
+                # the test client sends the requests to the "testserver" host
+                with override_settings(
+                    ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]
+                ):
+                    result = asyncio.run(
+                        self.run(
+                            method, path, options["requests"], options["concurrency"]
+                        )
+                    )
+                self.stdout.write(
+                    f"{name:<12} {label:<6} {result['rps']:>8.0f} "
+                    f"{result['p50']:>8.1f} {result['p99']:>8.1f} "
+                    f"{result['hits']:>5.0%} {dict(result['statuses'])}"
+                )
+
+    async def run(self, method, path, requests, concurrency):
+        client = AsyncClient()
+        send = getattr(client, method)
+        counter = itertools.count()
+        latencies = []
+        statuses = Counter()
+        hits = 0
+
+        async def worker():
+            nonlocal hits
+            while next(counter) < requests:
+                start = time.perf_counter()
+                response = await send(path)
+                latencies.append((time.perf_counter() - start) * 1000)
+                statuses[response.status_code] += 1
+                hits += response.get("X-Cache") == "HIT"
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        latencies.sort()
+        return {
+            "rps": len(latencies) / elapsed,
+            "p50": self.percentile(latencies, 50),
+            "p99": self.percentile(latencies, 99),
+            "hits": hits / len(latencies),
+            "statuses": statuses,
+        }
+
+    @staticmethod
+    def percentile(values, percent):
+        # nearest rank on sorted values
+        return values[max(math.ceil(len(values) * percent / 100) - 1, 0)]
@@ -0,0 +1,28 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from employees.models import Tombstone
+
+
+class Command(BaseCommand):
+    """
+    Deletes the change feed tombstones older than a number of days.
+
+    A client whose ?since= cursor is older than the retention would miss the
+    pruned deletions, so it has to start again without a cursor.
+
+    Example:
+        python manage.py prune_tombstones --days 30
+    """
+
+    help = "Delete change feed tombstones older than --days days."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=30)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - datetime.timedelta(days=options["days"])
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(f"Deleted {deleted} tombstones older than {cutoff:%Y-%m-%d}")
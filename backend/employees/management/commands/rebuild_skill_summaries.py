@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from employees.models import Employee
+from employees.summaries import SUMMARY_FIELDS, compute_summaries
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds or verifies the skill summary columns of the employees.
+
+    The summaries are recomputed from the skills in batches of employees. With
+    --verify nothing is written: the employees whose stored summary differs
+    from their skills are listed and the command fails if there are any, so it
+    can run as a periodic consistency check. updated_at is left untouched, so
+    a rebuild does not list every employee in the change feed.
+
+    Example:
+        python manage.py rebuild_skill_summaries --verify
+    """
+
+    help = "Rebuild (or check with --verify) the employee skill summary columns."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verify", action="store_true")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        verify = options["verify"]
+        batch_size = options["batch_size"]
+        checked = mismatched = 0
+        last_id = ""
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    Employee.objects.filter(id__gt=last_id)
+                    .order_by("id")
+                    .values("id", *SUMMARY_FIELDS)[:batch_size]
+                )
+                if not batch:
+                    break
+                last_id = batch[-1]["id"]
+                expected = compute_summaries([row["id"] for row in batch])
+                stale = []
+                for row in batch:
+                    summary = expected[row["id"]]
+                    if any(row[field] != summary[field] for field in SUMMARY_FIELDS):
+                        stale.append(Employee(id=row["id"], **summary))
+                        if verify:
+                            self.stdout.write(
+                                f"{row['id']}: stored {self._format(row)}, "
+                                f"expected {self._format(summary)}"
+                            )
+                if stale and not verify:
+                    Employee.objects.bulk_update(stale, SUMMARY_FIELDS)
+                checked += len(batch)
+                mismatched += len(stale)
+
+        if verify:
+            if mismatched:
+                raise CommandError(
+                    f"{mismatched} of {checked} employees have a stale skill summary"
+                )
+            self.stdout.write(f"All {checked} skill summaries are up to date")
+        else:
+            self.stdout.write(f"Rebuilt {mismatched} of {checked} skill summaries")
+
+    @staticmethod
+    def _format(summary):
+        return ", ".join(f"{field}={summary[field]!r}" for field in SUMMARY_FIELDS)
@@ -0,0 +1,252 @@
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+QUANTILES = (0.5, 0.95, 0.99)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# the measurements of the request being handled, None outside of a request or
+# when the metrics are disabled
+current_metrics = ContextVar("current_metrics", default=None)
+
+
+class RequestMetrics:
+    """
+    The measurements of one request.
+
+    Attributes:
+        queries (int): The number of database queries.
+        db_seconds (float): The time spent in the database queries.
+        serialize_seconds (float): The time spent building the response data from the rows, including the queries it runs.
+        render_seconds (float): The time spent rendering the response data to JSON.
+        duration_seconds (float): The time spent handling the request.
+        response_bytes (int): The size of the response body, None for streaming responses.
+
+    Methods:
+        server_timing(): Returns the value of the Server-Timing header.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.render_seconds = 0.0
+        self.duration_seconds = 0.0
+        self.response_bytes = None
+
+    def server_timing(self):
+        return ", ".join(
+            [
+                f'db;desc="{self.queries} queries";dur={self.db_seconds * 1000:.2f}',
+                f"serialize;dur={self.serialize_seconds * 1000:.2f}",
+                f"render;dur={self.render_seconds * 1000:.2f}",
+                f"total;dur={self.duration_seconds * 1000:.2f}",
+            ]
+        )
+
+
+class RollingQuantiles:
+    """
+    The quantiles of the last window observations, with the running count and sum.
+
+    The observations are kept in a bounded deque and only sorted when the
+    quantiles are read, so observing costs the same whatever the window. A
+    lock keeps the count and sum exact under threaded servers.
+
+    Attributes:
+        window (int): The number of recent observations the quantiles are computed on.
+        count (int): The number of observations since the start of the process.
+        total (float): The sum of the observations since the start of the process.
+
+    Methods:
+        observe(value): Records an observation.
+        quantiles(quantiles): Returns the value of each quantile over the window, by nearest rank.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.values.append(value)
+            self.count += 1
+            self.total += value
+
+    def quantiles(self, quantiles=QUANTILES):
+        with self._lock:
+            values = sorted(self.values)
+        if not values:
+            return {quantile: math.nan for quantile in quantiles}
+        return {
+            quantile: values[max(math.ceil(len(values) * quantile) - 1, 0)]
+            for quantile in quantiles
+        }
+
+
+class MetricsRegistry:
+    """
+    The rolling request metrics of every view, rendered in the Prometheus text format.
+
+    Every metric is exposed as a summary with its p50, p95 and p99 over the
+    last window requests of the view, and its count and sum since the start
+    of the process. The metrics are kept per process.
+
+    Attributes:
+        metrics (tuple): The (name, attribute, help) of each metric, the attribute being read from RequestMetrics.
+
+    Methods:
+        observe(view, metrics): Records the measurements of a request to the view.
+        render(): Returns the metrics in the Prometheus text exposition format.
+        reset(): Drops every observation.
+    """
+
+    metrics = (
+        (
+            "api_request_duration_seconds",
+            "duration_seconds",
+            "Time spent handling the requests.",
+        ),
+        ("api_db_queries", "queries", "Database queries per request."),
+        (
+            "api_db_duration_seconds",
+            "db_seconds",
+            "Time spent in database queries per request.",
+        ),
+        (
+            "api_serialize_duration_seconds",
+            "serialize_seconds",
+            "Time spent building the response data per request.",
+        ),
+        (
+            "api_render_duration_seconds",
+            "render_seconds",
+            "Time spent rendering the response data to JSON per request.",
+        ),
+        ("api_response_bytes", "response_bytes", "Size of the response body."),
+    )
+
+    def __init__(self, window=1024):
+        self.window = window
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        # {view: {attribute: RollingQuantiles}}
+        self._views = {}
+
+    def observe(self, view, metrics):
+        series = self._views.get(view)
+        if series is None:
+            with self._lock:
+                series = self._views.setdefault(
+                    view,
+                    {
+                        attribute: RollingQuantiles(self.window)
+                        for _, attribute, _ in self.metrics
+                    },
+                )
+        for _, attribute, _ in self.metrics:
+            value = getattr(metrics, attribute)
+            if value is not None:
+                series[attribute].observe(value)
+
+    def render(self):
+        lines = []
+        views = sorted(self._views.items())
+        for name, attribute, help_text in self.metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} summary")
+            for view, series in views:
+                quantiles = series[attribute]
+                if not quantiles.count:
+                    continue
+                label = f'view="{escape_label(view)}"'
+                for quantile, value in quantiles.quantiles().items():
+                    lines.append(f'{name}{{{label},quantile="{quantile}"}} {value:.6g}')
+                lines.append(f"{name}_sum{{{label}}} {quantiles.total:.6g}")
+                lines.append(f"{name}_count{{{label}}} {quantiles.count}")
+        return "\n".join(lines) + "\n"
+
+
+def escape_label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry(getattr(settings, "REQUEST_METRICS_WINDOW", 1024))
+
+
+def record_query(execute, sql, params, many, context):
+    """A database execute wrapper adding the query to the metrics of the current request."""
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_seconds += time.perf_counter() - start
+
+
+def install_query_recorder(sender=None, connection=None, **kwargs):
+    """Adds record_query to the execute wrappers of a connection, as a connection_created receiver."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def metrics_view(request):
+    """Serves the request metrics in the Prometheus text format, or 404 when they are disabled."""
+    if not getattr(settings, "REQUEST_METRICS", False):
+        raise Http404()
+    return HttpResponse(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@contextmanager
+def measure(attribute):
+    """Adds the time spent in the block to an attribute of the metrics of the current request."""
+    metrics = current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(
+            metrics,
+            attribute,
+            getattr(metrics, attribute) + time.perf_counter() - start,
+        )
+
+
+class TimedSerializerMixin:
+    """A serializer mixin adding the time spent building .data to the metrics of the current request."""
+
+    @property
+    def data(self):
+        with measure("serialize_seconds"):
+            return super().data
+
+
+class TimedListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    """The ListSerializer of DRF, timed as TimedSerializerMixin."""
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """The JSON renderer of DRF, adding the rendering time to the metrics of the current request."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with measure("render_seconds"):
+            return super().render(data, accepted_media_type, renderer_context)
@@ -0,0 +1,147 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from .metrics import current_metrics, install_query_recorder, registry, RequestMetrics
+from .query_detector import QueryDetector
+
+logger = logging.getLogger("employees.queries")
+
+
+class RequestMetricsMiddleware:
+    """
+    Measures every request and records it in the metrics of its view.
+
+    The number and time of the database queries are counted by an execute
+    wrapper installed on every connection, the time spent building the
+    response data by the serializers and the .values() representations, the
+    JSON rendering time by TimedJSONRenderer, and the duration and body size
+    here. The measurements are recorded under the URL name of the resolved
+    view, such as "employees-list" or "skill-detail", or the dotted path of
+    the view for unnamed URLs; requests that match no URL are not recorded,
+    so the number of series stays bounded. Every response gets a
+    Server-Timing header with the database, serialize, render and total
+    times.
+
+    It handles both sync and async requests, so async views are not run
+    through a thread. With REQUEST_METRICS off the middleware is removed from
+    the stack when it is loaded and no wrapper is installed, so it costs
+    nothing.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_METRICS", False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+        connection_created.connect(install_query_recorder)
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection=connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.record(request, response, metrics, start)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.record(request, response, metrics, start)
+
+    def record(self, request, response, metrics, start):
+        metrics.duration_seconds = time.perf_counter() - start
+        if not response.streaming:
+            metrics.response_bytes = len(response.content)
+
+        view = self.get_view_name(request)
+        if view is not None:
+            registry.observe(view, metrics)
+        response["Server-Timing"] = metrics.server_timing()
+        return response
+
+    @staticmethod
+    def get_view_name(request):
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return None
+        return match.view_name
+
+
+class QueryDetectorMiddleware:
+    """
+    Logs the repeated and slow queries of every request, for the development server.
+
+    Every request is run inside a QueryDetector. A query shape run
+    QUERY_DETECTOR_DUPLICATES times or more, the usual sign of an N+1, and
+    the queries slower than QUERY_DETECTOR_SLOW_MS are logged as warnings on
+    the "employees.queries" logger with the method and path of the request.
+
+    The detector wraps the connections of the thread running the queries,
+    which for async requests is the thread of sync_to_async; the queries of
+    concurrent async requests can then be reported together.
+
+    It is enabled with QUERY_DETECTOR and removed from the stack otherwise.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_DETECTOR", False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+        self.slow_threshold = getattr(settings, "QUERY_DETECTOR_SLOW_MS", 100) / 1000
+        self.duplicate_threshold = getattr(settings, "QUERY_DETECTOR_DUPLICATES", 3)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with self.get_detector() as detector:
+            response = self.get_response(request)
+        self.report(request, detector)
+        return response
+
+    async def __acall__(self, request):
+        detector = self.get_detector()
+        await sync_to_async(detector.__enter__)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(detector.__exit__)(None, None, None)
+        self.report(request, detector)
+        return response
+
+    def get_detector(self):
+        return QueryDetector(
+            slow_threshold=self.slow_threshold,
+            duplicate_threshold=self.duplicate_threshold,
+        )
+
+    def report(self, request, detector):
+        if detector.duplicates() or detector.slow():
+            logger.warning(
+                "%s %s: %s", request.method, request.get_full_path(), detector.report()
+            )
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.2 on 2026-10-18 13:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="employee",
+            index=models.Index(
+                fields=["-updated_at", "-id"], name="employee_updated_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.2 on 2026-10-18 13:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0002_employee_updated_id_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IdSequence",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=100, primary_key=True, serialize=False),
+                ),
+                ("next_value", models.BigIntegerField(default=0)),
+            ],
+        ),
+    ]
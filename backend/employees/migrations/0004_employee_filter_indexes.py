@@ -0,0 +1,45 @@
+# Generated by Django 5.0.2 on 2026-10-18 13:15
+
+from django.db import migrations, models
+
+# icontains filters compile to UPPER(column) LIKE UPPER('%value%') on PostgreSQL,
+# which a trigram index on the same expression can serve. SQLite has no
+# equivalent, so these indexes are only created on PostgreSQL.
+TRIGRAM_COLUMNS = ["first_name", "last_name", "email"]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS employee_{column}_trgm_idx "
+            f'ON employees_employee USING gin (UPPER("{column}") gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(f"DROP INDEX IF EXISTS employee_{column}_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0003_idsequence"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="employee",
+            index=models.Index(fields=["email"], name="employee_email_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="employee",
+            index=models.Index(fields=["date_of_birth"], name="employee_dob_idx"),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,101 @@
+from django.db import migrations
+
+# frozen here rather than imported from employees.search, so the migration
+# replays the same whatever the app code becomes; rows are found again through
+# a MATCH on the employee_id column, which is an index lookup
+SQLITE_TRIGGERS = {
+    "employees_employee_fts_insert": """
+        CREATE TRIGGER employees_employee_fts_insert AFTER INSERT ON employees_employee
+        BEGIN
+            INSERT INTO employees_employee_fts (employee_id, first_name, last_name, email)
+            VALUES (new.id, new.first_name, new.last_name, new.email);
+        END
+    """,
+    "employees_employee_fts_delete": """
+        CREATE TRIGGER employees_employee_fts_delete AFTER DELETE ON employees_employee
+        BEGIN
+            DELETE FROM employees_employee_fts
+            WHERE employees_employee_fts MATCH 'employee_id:"' || old.id || '"';
+        END
+    """,
+    "employees_employee_fts_update": """
+        CREATE TRIGGER employees_employee_fts_update
+        AFTER UPDATE OF id, first_name, last_name, email ON employees_employee
+        BEGIN
+            DELETE FROM employees_employee_fts
+            WHERE employees_employee_fts MATCH 'employee_id:"' || old.id || '"';
+            INSERT INTO employees_employee_fts (employee_id, first_name, last_name, email)
+            VALUES (new.id, new.first_name, new.last_name, new.email);
+        END
+    """,
+}
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE employees_employee_fts USING fts5(
+        employee_id, first_name, last_name, email, prefix = '2 3'
+    )
+    """,
+    *SQLITE_TRIGGERS.values(),
+    """
+    INSERT INTO employees_employee_fts (employee_id, first_name, last_name, email)
+    SELECT id, first_name, last_name, email FROM employees_employee
+    """,
+]
+
+SQLITE_BACKWARD = [
+    *(f"DROP TRIGGER IF EXISTS {name}" for name in reversed(SQLITE_TRIGGERS)),
+    "DROP TABLE IF EXISTS employees_employee_fts",
+]
+
+# the document expression of the search index, until migration 0012
+POSTGRES_FORWARD = [
+    """
+    CREATE INDEX IF NOT EXISTS employee_search_idx ON employees_employee
+    USING gin (to_tsvector('simple'::regconfig,
+        coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || coalesce(email, '')))
+    """,
+]
+
+POSTGRES_BACKWARD = ["DROP INDEX IF EXISTS employee_search_idx"]
+
+
+def sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        return ("ENABLE_FTS5",) in cursor.fetchall()
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "sqlite" and sqlite_has_fts5(connection):
+        statements = SQLITE_FORWARD
+    elif connection.vendor == "postgresql":
+        statements = POSTGRES_FORWARD
+    else:
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "sqlite":
+        statements = SQLITE_BACKWARD
+    elif connection.vendor == "postgresql":
+        statements = POSTGRES_BACKWARD
+    else:
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0004_employee_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.2 on 2026-10-18 13:48
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0005_employee_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "model",
+                    models.CharField(
+                        choices=[("employee", "Employee"), ("skill", "Skill")],
+                        max_length=20,
+                    ),
+                ),
+                ("object_id", models.CharField(max_length=32)),
+                ("employee", models.CharField(max_length=100)),
+                ("deleted_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["deleted_at", "id"], name="tombstone_deleted_id_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,121 @@
+# Generated by Django 5.0.2 on 2026-10-18 13:57
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+# frozen copies of the app code of this migration's time, so it replays the
+# same whatever employees.summaries and employees.search become
+SENIOR = "senior"
+SEPARATOR = "|"
+
+SEARCH_TRIGGERS = {
+    "employees_employee_fts_insert": """
+        CREATE TRIGGER employees_employee_fts_insert AFTER INSERT ON employees_employee
+        BEGIN
+            INSERT INTO employees_employee_fts (employee_id, first_name, last_name, email)
+            VALUES (new.id, new.first_name, new.last_name, new.email);
+        END
+    """,
+    "employees_employee_fts_delete": """
+        CREATE TRIGGER employees_employee_fts_delete AFTER DELETE ON employees_employee
+        BEGIN
+            DELETE FROM employees_employee_fts
+            WHERE employees_employee_fts MATCH 'employee_id:"' || old.id || '"';
+        END
+    """,
+    "employees_employee_fts_update": """
+        CREATE TRIGGER employees_employee_fts_update
+        AFTER UPDATE OF id, first_name, last_name, email ON employees_employee
+        BEGIN
+            DELETE FROM employees_employee_fts
+            WHERE employees_employee_fts MATCH 'employee_id:"' || old.id || '"';
+            INSERT INTO employees_employee_fts (employee_id, first_name, last_name, email)
+            VALUES (new.id, new.first_name, new.last_name, new.email);
+        END
+    """,
+}
+
+
+def summarize(skills):
+    senior = sorted(
+        name for name, _, seniority in skills if seniority.lower() == SENIOR
+    )
+    return {
+        "skill_count": len(skills),
+        "max_yrs_exp": max((yrs_exp for _, yrs_exp, _ in skills), default=0),
+        "senior_skills": (
+            SEPARATOR + SEPARATOR.join(senior) + SEPARATOR if senior else ""
+        ),
+    }
+
+
+def restore_search_triggers(apps, schema_editor):
+    # SQLite rebuilds the table to add or remove the columns, dropping the
+    # triggers of migration 0005 with it
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return
+    if "employees_employee_fts" not in connection.introspection.table_names():
+        return
+    for name, statement in SEARCH_TRIGGERS.items():
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        schema_editor.execute(statement)
+
+
+def fill_skill_summaries(apps, schema_editor):
+    Employee = apps.get_model("employees", "Employee")
+    Skill = apps.get_model("employees", "Skill")
+    skills = defaultdict(list)
+    rows = Skill.objects.order_by().values_list(
+        "employee_id", "name", "yrs_exp", "seniority"
+    )
+    for employee_id, *skill in rows.iterator():
+        skills[employee_id].append(skill)
+    employees = [
+        Employee(id=employee_id, **summarize(employee_skills))
+        for employee_id, employee_skills in skills.items()
+    ]
+    Employee.objects.bulk_update(
+        employees, ["skill_count", "max_yrs_exp", "senior_skills"], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0006_tombstone"),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_search_triggers),
+        migrations.AddField(
+            model_name="employee",
+            name="max_yrs_exp",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="employee",
+            name="senior_skills",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="employee",
+            name="skill_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="employee",
+            index=models.Index(
+                fields=["skill_count", "id"], name="employee_skill_count_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="employee",
+            index=models.Index(
+                fields=["max_yrs_exp", "id"], name="employee_max_yrs_exp_idx"
+            ),
+        ),
+        migrations.RunPython(fill_skill_summaries, migrations.RunPython.noop),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+    ]
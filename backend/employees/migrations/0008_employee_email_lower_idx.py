@@ -0,0 +1,21 @@
+# Generated by Django 5.0.2 on 2026-10-18 14:05
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0007_employee_skill_summary"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="employee",
+            index=models.Index(
+                django.db.models.functions.text.Lower("email"),
+                name="employee_email_lower_idx",
+            ),
+        ),
+    ]
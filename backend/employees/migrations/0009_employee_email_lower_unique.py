@@ -0,0 +1,44 @@
+# Generated by Django 5.0.2 on 2026-10-18 14:06
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def check_duplicate_emails(apps, schema_editor):
+    Employee = apps.get_model("employees", "Employee")
+    duplicates = (
+        Employee.objects.order_by()
+        .values(email_lower=Lower("email"))
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+        .count()
+    )
+    if duplicates:
+        raise RuntimeError(
+            f"{duplicates} emails are used by several employees. Run "
+            "`python manage.py dedupe_employee_emails --apply` before migrating."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0008_employee_email_lower_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="employee",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower("email"),
+                name="employee_email_lower_unique",
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name="employee",
+            name="employee_email_lower_idx",
+        ),
+    ]
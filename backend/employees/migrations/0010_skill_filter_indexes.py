@@ -0,0 +1,29 @@
+# Generated by Django 5.0.2 on 2026-10-18 14:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0009_employee_email_lower_unique"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="skill",
+            index=models.Index(
+                fields=["employee", "name"], name="skill_employee_name_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="skill",
+            index=models.Index(
+                fields=["seniority", "name"], name="skill_seniority_name_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="skill",
+            index=models.Index(fields=["yrs_exp", "id"], name="skill_yrs_exp_idx"),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.2 on 2026-10-18 14:38
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0010_skill_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="employee",
+            name="employee_email_idx",
+        ),
+    ]
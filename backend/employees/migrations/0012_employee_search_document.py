@@ -0,0 +1,45 @@
+from django.db import migrations
+
+# the punctuation of the document is replaced by spaces, so PostgreSQL splits
+# an email into the tokens the FTS5 tokenizer of SQLite finds in it
+POSTGRES_FORWARD = [
+    "DROP INDEX IF EXISTS employee_search_idx",
+    """
+    CREATE INDEX employee_search_idx ON employees_employee
+    USING gin (to_tsvector('simple'::regconfig, regexp_replace(
+        coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || coalesce(email, ''),
+        '[^[:alnum:]]+', ' ', 'g')))
+    """,
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS employee_search_idx",
+    """
+    CREATE INDEX employee_search_idx ON employees_employee
+    USING gin (to_tsvector('simple'::regconfig,
+        coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || coalesce(email, '')))
+    """,
+]
+
+
+def run_on_postgresql(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0011_remove_employee_email_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_on_postgresql(POSTGRES_FORWARD), run_on_postgresql(POSTGRES_BACKWARD)
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.2 on 2026-10-18 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0012_employee_search_document"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="skill",
+            index=models.Index(fields=["name", "id"], name="skill_name_id_idx"),
+        ),
+    ]
@@ -1,5 +1,7 @@
-import random
 from django.db import models
+from django.db.models.functions import Lower
+from django.utils import timezone
+from .ids import IdAllocator
 
 
 class Employee(models.Model):
@@ -8,7 +10,7 @@ class Employee(models.Model):
     Methods:
         generate_id(): Generates a unique identifier for the employee.
         save(*args, **kwargs): Overrides the save method to generate and assign a unique identifier to the employee if it doesn't already have one.
-        We are using a custom id that is generated by concatenating two random letters and two random numbers.
+        We are using a custom id made of two letters and four numbers, handed out by the id allocator so it never has to be probed for collisions.
         __str__(): Returns a string representation of the employee.
 
     """
@@ -25,6 +27,10 @@ class Employee(models.Model):
     country = models.CharField(max_length=100, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # skill summary, kept in sync with the skills by employees.summaries
+    skill_count = models.PositiveIntegerField(default=0, editable=False)
+    max_yrs_exp = models.IntegerField(default=0, editable=False)
+    senior_skills = models.TextField(default="", blank=True, editable=False)
 
     def generate_id(self):
         """
@@ -38,24 +44,30 @@ class Employee(models.Model):
             >>> employee.generate_id()
             'AB1234'
         """
-        # the id is composed of two random letters and two random numbers
-        letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-        numbers = "0123456789"
-        id = "".join(random.choice(letters) for i in range(2)) + "".join(
-            random.choice(numbers) for i in range(4)
-        )
-        return id
+        return id_allocator.allocate()[0]
 
     def save(self, *args, **kwargs):
         if not self.id:
-            generated_id = self.generate_id()
-            while Employee.objects.filter(id=generated_id).exists():
-                generated_id = self.generate_id()
-            self.id = generated_id
+            self.id = self.generate_id()
         super().save(*args, **kwargs)
 
     class Meta:
         ordering = ["-updated_at"]
+        indexes = [
+            # supports the default ordering and the keyset pagination seek
+            models.Index(fields=["-updated_at", "-id"], name="employee_updated_id_idx"),
+            # the date of birth filters; email lookups go through the unique
+            # index on Lower("email") below
+            models.Index(fields=["date_of_birth"], name="employee_dob_idx"),
+            # the skill summary filters and orderings, with the keyset tie-breaker
+            models.Index(fields=["skill_count", "id"], name="employee_skill_count_idx"),
+            models.Index(fields=["max_yrs_exp", "id"], name="employee_max_yrs_exp_idx"),
+        ]
+        constraints = [
+            # emails are unique regardless of case; the index also serves the
+            # case-insensitive lookups, such as the check-email endpoint
+            models.UniqueConstraint(Lower("email"), name="employee_email_lower_unique"),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -76,6 +88,7 @@ class Skill(models.Model):
     Meta:
         ordering (list): The default ordering of skills based on the name.
         unique_together (tuple): A tuple specifying that the combination of name and employee should be unique.
+        indexes (list): The indexes of the skill list pages, of the skill filters and of the skills of one employee.
 
     Methods:
         __str__(): Returns a string representation of the skill.
@@ -94,6 +107,68 @@ class Skill(models.Model):
     class Meta:
         ordering = ["name"]
         unique_together = ("name", "employee")
+        indexes = [
+            # the keyset pages of the skill list
+            models.Index(fields=["name", "id"], name="skill_name_id_idx"),
+            # the skills of one employee in name order
+            models.Index(fields=["employee", "name"], name="skill_employee_name_idx"),
+            # the seniority and years of experience filters
+            models.Index(fields=["seniority", "name"], name="skill_seniority_name_idx"),
+            models.Index(fields=["yrs_exp", "id"], name="skill_yrs_exp_idx"),
+        ]
 
     def __str__(self):
         return self.name
+
+
+class IdSequence(models.Model):
+    """
+    A class representing a named counter used to reserve blocks of identifiers.
+
+    Attributes:
+        name (str): The name of the counter.
+        next_value (int): The first counter value that has not been reserved yet.
+
+    """
+
+    name = models.CharField(max_length=100, primary_key=True)
+    next_value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.next_value}"
+
+
+class Tombstone(models.Model):
+    """
+    A class representing the deletion of an employee or a skill, for the change feed.
+
+    Attributes:
+        model (str): The kind of the deleted row, "employee" or "skill".
+        object_id (str): The primary key of the deleted row.
+        employee (str): The id of the employee the deleted row belonged to, the employee itself for an employee.
+        deleted_at (datetime): The date and time when the row was deleted.
+
+    Meta:
+        indexes (list): The (deleted_at, id) index the change feed seeks on.
+
+    """
+
+    EMPLOYEE = "employee"
+    SKILL = "skill"
+    MODEL_CHOICES = [(EMPLOYEE, "Employee"), (SKILL, "Skill")]
+
+    model = models.CharField(max_length=20, choices=MODEL_CHOICES)
+    object_id = models.CharField(max_length=32)
+    employee = models.CharField(max_length=100)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["deleted_at", "id"], name="tombstone_deleted_id_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.object_id} deleted at {self.deleted_at}"
+
+
+id_allocator = IdAllocator(IdSequence, Employee, name="employee")
@@ -0,0 +1,222 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.encoding import force_str
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    A cursor pagination class that seeks on a composite key instead of using OFFSET.
+
+    The page boundary is encoded as the values of the ordering fields of the last
+    (or first) row of the current page, and the next page is fetched with a
+    ``WHERE (updated_at, id) < (...)`` style filter, so every page costs the same
+    as the first one and rows edited between requests are neither skipped nor
+    repeated because of shifting offsets.
+
+    Pagination is opt-in: without the page size query parameter the view returns
+    the unpaginated list, as it always has.
+
+    Attributes:
+        ordering (tuple): The default fields the pages are ordered and keyed on. The last field must be unique. An ?ordering= accepted by the view's OrderingFilter is used instead, with the primary key appended.
+        page_size (int): The default page size, or None to only paginate when a page size is requested.
+        page_size_query_param (str): The query parameter used to request a page size.
+        max_page_size (int): The maximum page size a client can request.
+        cursor_query_param (str): The query parameter holding the encoded cursor.
+
+    Methods:
+        paginate_queryset(queryset, request, view): Returns the rows of the requested page, or None if pagination is not requested.
+        apaginate_queryset(queryset, request, view): The same, for async views.
+        get_paginated_response(data): Returns the page wrapped with the next and previous links.
+    """
+
+    ordering = ("-updated_at", "-id")
+    page_size = None
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """The async version of paginate_queryset, reading the page with the async ORM."""
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """Returns the queryset of the requested page plus one row, or None if pagination is not requested."""
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        ordering = self.get_ordering(request, queryset, view)
+        self.ordering_used = ordering
+        cursor = self.decode_cursor(request, queryset.model, ordering)
+        self.cursor = cursor
+        reverse = cursor is not None and cursor["reverse"]
+
+        if reverse:
+            ordering = [self._flip(field) for field in ordering]
+        queryset = queryset.order_by(*ordering)
+        if cursor is not None:
+            queryset = queryset.filter(self._seek(ordering, cursor["position"]))
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results):
+        """Trims the rows read by get_page_queryset to the page and returns them."""
+        cursor = self.cursor
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if cursor is not None and cursor["reverse"]:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = results
+        return results
+
+    def get_page_size(self, request):
+        value = request.query_params.get(self.page_size_query_param)
+        if value is None:
+            return self.page_size
+        try:
+            page_size = int(value)
+        except ValueError:
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request, queryset, view):
+        # an ?ordering= accepted by the view's OrderingFilter replaces the default
+        for backend in getattr(view, "filter_backends", ()):
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                if ordering:
+                    return self._with_unique_field(list(ordering), queryset.model)
+        return list(self.ordering)
+
+    @staticmethod
+    def _with_unique_field(ordering, model):
+        # the last field has to be unique for the seek to be exact
+        pk = model._meta.pk.name
+        names = [field.lstrip("-") for field in ordering]
+        if pk not in names and "pk" not in names:
+            ordering.append("-" + pk if ordering[-1].startswith("-") else pk)
+        return ordering
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self._position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self._position(self.page[0]), reverse=True)
+
+    def encode_cursor(self, position, reverse):
+        payload = json.dumps({"p": position, "r": int(reverse)}, separators=(",", ":"))
+        encoded = base64.urlsafe_b64encode(payload.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request, model, ordering):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            position = payload["p"]
+            reverse = bool(payload.get("r"))
+            fields = [field.lstrip("-") for field in ordering]
+            if len(position) != len(fields):
+                raise ValueError
+            position = [
+                model._meta.get_field(name).to_python(value)
+                for name, value in zip(fields, position)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        return {"position": position, "reverse": reverse}
+
+    def _position(self, row):
+        position = []
+        for field in self.ordering_used:
+            name = field.lstrip("-")
+            # model instances, or .values() rows
+            value = row[name] if isinstance(row, dict) else getattr(row, name)
+            if hasattr(value, "isoformat"):
+                value = value.isoformat()
+            position.append(force_str(value))
+        return position
+
+    def _seek(self, ordering, position):
+        # (a, b) after (x, y) == a > x OR (a = x AND b > y), with the comparison
+        # flipped for descending fields
+        condition = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith("-") else "-" + field
+
+
+class SkillPagination(KeysetPagination):
+    """
+    The keyset pagination of the skills, in name order.
+
+    The pages are keyed on (name, id), the default ordering of the skills
+    with the primary key as the tie-breaker, which the (name, id) index
+    serves for the full list and the (employee, name) index for one employee,
+    whose skill names are unique.
+    """
+
+    ordering = ("name", "id")
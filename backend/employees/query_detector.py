@@ -0,0 +1,143 @@
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# statements issued by atomic(), whose repetition is not a query pattern
+TRANSACTION_STATEMENT = re.compile(
+    r"^(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT|BEGIN|COMMIT|ROLLBACK)\b",
+    re.I,
+)
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r"(?<![\w.\"])-?\d+(?:\.\d+)?\b")
+PLACEHOLDER = re.compile(r"%s|\?")
+PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql):
+    """
+    Returns the shape of a query: its SQL with the values and lists of values replaced.
+
+    Queries differing only by their parameters, literals or the length of
+    an IN list have the same shape, so an N+1 shows up as one shape run N
+    times.
+
+    Example:
+        >>> normalize_sql('SELECT * FROM "skill" WHERE "employee_id" IN (%s, %s) LIMIT 21')
+        'SELECT * FROM "skill" WHERE "employee_id" IN (...) LIMIT ?'
+    """
+    sql = STRING_LITERAL.sub("?", sql)
+    sql = NUMBER_LITERAL.sub("?", sql)
+    sql = PLACEHOLDER.sub("?", sql)
+    sql = PLACEHOLDER_LIST.sub("(...)", sql)
+    return WHITESPACE.sub(" ", sql).strip()
+
+
+class CapturedQuery:
+    """
+    A query run while a QueryDetector was active.
+
+    Attributes:
+        sql (str): The SQL of the query, with its placeholders.
+        shape (str): The normalized SQL, see normalize_sql.
+        duration (float): The time the query took, in seconds.
+        alias (str): The alias of the database the query ran on.
+    """
+
+    def __init__(self, sql, duration, alias):
+        self.sql = sql
+        self.shape = normalize_sql(sql)
+        self.duration = duration
+        self.alias = alias
+
+    def __repr__(self):
+        return f"<CapturedQuery {self.duration * 1000:.1f}ms {self.shape[:80]!r}>"
+
+
+class QueryDetector:
+    """
+    A context manager capturing the queries run inside it, flagging repeated and slow ones.
+
+    The queries are captured with an execute wrapper on the connections of
+    the current thread, so unlike assertNumQueries it needs no DEBUG cursor
+    and keeps no SQL beyond the block.
+
+    Attributes:
+        slow_threshold (float): The duration in seconds above which a query is slow.
+        duplicate_threshold (int): The number of runs of the same shape from which it is repeated.
+        queries (list): The CapturedQuery of every query, in order.
+
+    Methods:
+        duplicates(): Returns the number of runs of every repeated shape.
+        slow(): Returns the slow queries.
+        report(): Returns a description of the queries and of the flagged ones.
+
+    Example:
+        >>> with QueryDetector() as detector:
+        ...     client.get("/api/employees/")
+        >>> detector.duplicates()
+        {}
+    """
+
+    def __init__(
+        self, using=(DEFAULT_DB_ALIAS,), slow_threshold=0.1, duplicate_threshold=2
+    ):
+        self.using = using
+        self.slow_threshold = slow_threshold
+        self.duplicate_threshold = duplicate_threshold
+        self.queries = []
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for alias in self.using:
+            self._stack.enter_context(
+                connections[alias].execute_wrapper(self._wrapper(alias))
+            )
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    def __len__(self):
+        return len(self.queries)
+
+    def _wrapper(self, alias):
+        def record(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                self.queries.append(
+                    CapturedQuery(sql, time.perf_counter() - start, alias)
+                )
+
+        return record
+
+    def duplicates(self):
+        counts = Counter(
+            query.shape
+            for query in self.queries
+            if not TRANSACTION_STATEMENT.match(query.shape)
+        )
+        return {
+            shape: count
+            for shape, count in counts.items()
+            if count >= self.duplicate_threshold
+        }
+
+    def slow(self):
+        return [query for query in self.queries if query.duration > self.slow_threshold]
+
+    def report(self):
+        lines = [f"{len(self.queries)} queries"]
+        for shape, count in self.duplicates().items():
+            lines.append(f"repeated {count} times: {shape}")
+        for query in self.slow():
+            lines.append(f"slow ({query.duration * 1000:.1f}ms): {query.shape}")
+        lines.extend(
+            f"{index}. {query.shape}" for index, query in enumerate(self.queries, 1)
+        )
+        return "\n".join(lines)
@@ -0,0 +1,69 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+def optimize_queryset(queryset, serializer_class):
+    """
+    Applies select_related/prefetch_related to a queryset based on a serializer tree.
+
+    The serializer fields are walked recursively. Nested serializers over a
+    forward relation (foreign key, one-to-one) are joined with select_related,
+    nested list serializers over a reverse or many-to-many relation are fetched
+    with a Prefetch whose queryset is the related model's default manager, so
+    the related model's Meta.ordering is preserved. Related fields that only
+    need the primary key (PrimaryKeyRelatedField) are left alone, since the
+    value is already available as the ``<field>_id`` column.
+
+    Args:
+        queryset (QuerySet): The queryset to optimize.
+        serializer_class (type): The serializer class used to render the queryset.
+
+    Returns:
+        QuerySet: The queryset with the required relations loaded up front.
+
+    Example:
+        >>> optimize_queryset(Employee.objects.all(), EmployeeSerializer)
+        # Employee.objects.prefetch_related(Prefetch("skills", Skill.objects.all()))
+    """
+    select, prefetch = _collect_relations(queryset.model, serializer_class())
+    return _apply_relations(queryset, select, prefetch)
+
+
+def _apply_relations(queryset, select, prefetch):
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+def _collect_relations(model, serializer, prefix=""):
+    select = []
+    prefetch = []
+    for field in serializer.fields.values():
+        if field.write_only or field.source == "*":
+            continue
+        source = field.source
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            continue
+        if not model_field.is_relation:
+            continue
+
+        if isinstance(field, serializers.ListSerializer):
+            related_model = model_field.related_model
+            related_qs = _apply_relations(
+                related_model._default_manager.all(),
+                *_collect_relations(related_model, field.child),
+            )
+            prefetch.append(Prefetch(prefix + source, queryset=related_qs))
+        elif isinstance(field, serializers.BaseSerializer):
+            select.append(prefix + source)
+            nested_select, nested_prefetch = _collect_relations(
+                model_field.related_model, field, prefix + source + "__"
+            )
+            select.extend(nested_select)
+            prefetch.extend(nested_prefetch)
+    return select, prefetch
@@ -0,0 +1,289 @@
+import datetime
+from collections import defaultdict
+
+from django.core.exceptions import FieldDoesNotExist
+from django.http import Http404
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.permissions import BasePermission
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .metrics import measure
+
+# converters equivalent to the to_representation of these exact field classes
+FAST_CONVERTERS = {
+    serializers.CharField: str,
+    serializers.EmailField: str,
+    serializers.IntegerField: int,
+}
+
+
+def _identity(value):
+    return value
+
+
+def _date_converter(field):
+    if getattr(field, "format", api_settings.DATE_FORMAT) != ISO_8601:
+        return field.to_representation
+    return datetime.date.isoformat
+
+
+def _datetime_converter(field):
+    """
+    Returns DateTimeField.to_representation with the field timezone looked up once.
+
+    The lookup goes through the current timezone of the request, which is
+    the most expensive part of the field when it is repeated for every value.
+    """
+    if getattr(field, "format", api_settings.DATETIME_FORMAT) != ISO_8601:
+        return field.to_representation
+    field_timezone = (
+        field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    )
+    if field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if timezone.is_naive(value):
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return convert
+
+
+# converters that depend on the current timezone, resolved once per call
+BOUND_CONVERTERS = {
+    serializers.DateField: _date_converter,
+    serializers.DateTimeField: _datetime_converter,
+}
+
+
+class UnsupportedSerializer(Exception):
+    """Raised when a serializer has fields that cannot be read from .values() rows."""
+
+
+class ValuesRepresentation:
+    """
+    Builds the representation of a ModelSerializer from .values() rows.
+
+    The serializer fields are walked once to build a plan: for every field the
+    column to read and the function converting the value, which is a builtin
+    such as str for plain character and integer fields, an equivalent of the
+    date and datetime fields with the timezone resolved once per call, and the
+    field's own to_representation otherwise, so the output is the same as the
+    serializer's.
+    Nested list serializers over a reverse foreign key are read with one
+    .values() query per level and grouped by the foreign key in Python, in the
+    default ordering of the related model, as optimize_queryset prefetches
+    them. No model instance is built and no serializer is bound per row.
+
+    Serializers with fields that do not map to a model column (method fields,
+    dotted sources, forward nested serializers) raise UnsupportedSerializer.
+
+    Attributes:
+        model (type): The model of the serializer.
+        columns (list): The columns read from the rows.
+
+    Methods:
+        values(queryset, extra): Returns the queryset as a .values() queryset with the columns of the plan.
+        to_representation(rows): Returns the representation of every row, as the serializer with many=True would.
+        ato_representation(rows): The same, reading the nested rows with the async ORM.
+
+    Example:
+        >>> representation = ValuesRepresentation(EmployeeSerializer)
+        >>> representation.to_representation(representation.values(Employee.objects.all()))
+        [{"id": "AB1234", "first_name": "John", ...}]
+    """
+
+    def __init__(self, serializer_class):
+        self._configure(serializer_class.Meta.model, serializer_class())
+
+    def _configure(self, model, serializer):
+        self.model = model
+        self.fields, self.nested = self._plan(model, serializer)
+        self.pk = model._meta.pk.attname
+        self.columns = list(
+            dict.fromkeys(
+                [self.pk] + [column for _, column, _, _ in self.fields if column]
+            )
+        )
+
+    def values(self, queryset, extra=()):
+        # the extra(select=...) columns may be used by the ordering
+        columns = self.columns + [
+            column
+            for column in list(extra) + list(queryset.query.extra_select)
+            if column not in self.columns
+        ]
+        return queryset.prefetch_related(None).values(*columns)
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        nested = {}
+        if rows and self.nested:
+            pks = [row[self.pk] for row in rows]
+            for name, (representation, fk) in self.nested.items():
+                nested[name] = representation.group(fk, pks)
+        return self._render(rows, nested)
+
+    async def ato_representation(self, rows):
+        """The async version of to_representation, for rows already read."""
+        nested = {}
+        if rows and self.nested:
+            pks = [row[self.pk] for row in rows]
+            for name, (representation, fk) in self.nested.items():
+                nested[name] = await representation.agroup(fk, pks)
+        return self._render(rows, nested)
+
+    def _render(self, rows, nested):
+        fields = [
+            (name, column, convert(field) if field is not None else convert)
+            for name, column, convert, field in self.fields
+        ]
+        results = []
+        for row in rows:
+            item = {}
+            for name, column, convert in fields:
+                if column is None:
+                    item[name] = nested[name].get(row[self.pk], [])
+                    continue
+                value = row[column]
+                item[name] = None if value is None else convert(value)
+            results.append(item)
+        return results
+
+    def group(self, fk, pks):
+        """Returns the representations of the rows whose fk is in pks, grouped by fk."""
+        queryset = self.model._default_manager.filter(**{f"{fk}__in": pks})
+        rows = list(self.values(queryset, extra=[fk]))
+        grouped = defaultdict(list)
+        for row, item in zip(rows, self.to_representation(rows)):
+            grouped[row[fk]].append(item)
+        return grouped
+
+    async def agroup(self, fk, pks):
+        """The async version of group."""
+        queryset = self.model._default_manager.filter(**{f"{fk}__in": pks})
+        rows = [row async for row in self.values(queryset, extra=[fk]).aiterator()]
+        grouped = defaultdict(list)
+        for row, item in zip(rows, await self.ato_representation(rows)):
+            grouped[row[fk]].append(item)
+        return grouped
+
+    @classmethod
+    def _plan(cls, model, serializer):
+        fields = []
+        nested = {}
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                raise UnsupportedSerializer(f"{name} is not a model field")
+
+            if isinstance(field, serializers.ListSerializer):
+                if not model_field.one_to_many:
+                    raise UnsupportedSerializer(f"{name} is not a reverse foreign key")
+                child = cls.__new__(cls)
+                child._configure(model_field.related_model, field.child)
+                nested[name] = (child, model_field.field.attname)
+                fields.append((name, None, None, None))
+            elif isinstance(field, serializers.PrimaryKeyRelatedField):
+                if not model_field.many_to_one or field.pk_field is not None:
+                    raise UnsupportedSerializer(f"{name} is not a foreign key")
+                fields.append((name, model_field.attname, _identity, None))
+            elif isinstance(
+                field, (serializers.BaseSerializer, serializers.RelatedField)
+            ):
+                raise UnsupportedSerializer(f"{name} is a related field")
+            elif model_field.is_relation:
+                raise UnsupportedSerializer(f"{name} is a related field")
+            elif type(field) in BOUND_CONVERTERS:
+                bind = BOUND_CONVERTERS[type(field)]
+                fields.append((name, model_field.attname, bind, field))
+            else:
+                convert = FAST_CONVERTERS.get(type(field), field.to_representation)
+                fields.append((name, model_field.attname, convert, None))
+        return fields, nested
+
+
+class ValuesReadMixin:
+    """
+    A viewset mixin serving list and retrieve from .values() rows.
+
+    The representation is built by ValuesRepresentation from the view's
+    serializer class, so the responses are the same as the serializer's, only
+    cheaper to produce. The serializer is used instead when it is not
+    supported, and for retrieve when the permission classes check object
+    permissions, which need the model instance.
+
+    Attributes:
+        retrieve_columns (tuple): The columns read with the row of a retrieve besides the rendered ones, given to row_retrieved().
+    """
+
+    retrieve_columns = ()
+
+    def get_values_representation(self):
+        serializer_class = self.get_serializer_class()
+        # planned once per serializer class, and released with it
+        if "_values_representation" not in serializer_class.__dict__:
+            try:
+                representation = ValuesRepresentation(serializer_class)
+            except UnsupportedSerializer:
+                representation = None
+            serializer_class._values_representation = representation
+        return serializer_class._values_representation
+
+    def list(self, request, *args, **kwargs):
+        representation = self.get_values_representation()
+        if representation is None:
+            return super().list(request, *args, **kwargs)
+
+        # the columns the pagination seeks on may not be rendered
+        queryset = self.filter_queryset(self.get_queryset())
+        ordering = ()
+        if self.paginator is not None and hasattr(self.paginator, "get_ordering"):
+            ordering = self.paginator.get_ordering(request, queryset, self)
+        queryset = representation.values(
+            queryset, extra=[field.lstrip("-") for field in ordering]
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            with measure("serialize_seconds"):
+                data = representation.to_representation(page)
+            return self.get_paginated_response(data)
+        with measure("serialize_seconds"):
+            data = representation.to_representation(queryset)
+        return Response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        representation = self.get_values_representation()
+        if representation is None or self._checks_object_permissions():
+            return super().retrieve(request, *args, **kwargs)
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        rows = list(representation.values(queryset, extra=self.retrieve_columns))
+        if not rows:
+            raise Http404
+        self.row_retrieved(rows[0])
+        with measure("serialize_seconds"):
+            data = representation.to_representation(rows)[0]
+        return Response(data)
+
+    def row_retrieved(self, row):
+        """Receives the .values() row of a retrieve, with the retrieve_columns."""
+
+    def _checks_object_permissions(self):
+        return any(
+            type(permission).has_object_permission
+            is not BasePermission.has_object_permission
+            for permission in self.get_permissions()
+        )
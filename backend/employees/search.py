@@ -0,0 +1,213 @@
+import re
+
+import weakref
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.backends.signals import connection_created
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from django.dispatch import receiver
+from rest_framework.filters import SearchFilter
+
+SEARCH_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+class SQLiteSearchBackend:
+    """
+    Full-text search on SQLite through the employees_employee_fts FTS5 table.
+
+    The table is created by migration 0005 and kept in sync by the triggers
+    below, which restore_search_triggers recreates after every migrate. Every
+    search term is matched as a token prefix in the first name, last name or
+    email, and the rows are ranked with bm25.
+
+    Attributes:
+        table (str): The name of the FTS5 table.
+        triggers (dict): The CREATE TRIGGER statement of every trigger on the employees table, by name.
+
+    Methods:
+        is_available(connection): Returns whether the FTS5 table exists.
+        missing_triggers(connection): Returns the names of the triggers missing from the database.
+    """
+
+    table = "employees_employee_fts"
+    # rows are found again through a MATCH on the employee_id column, which is
+    # an index lookup, unlike a plain WHERE on an FTS column
+    triggers = {
+        "employees_employee_fts_insert": """
+            CREATE TRIGGER employees_employee_fts_insert AFTER INSERT ON employees_employee
+            BEGIN
+                INSERT INTO employees_employee_fts (employee_id, first_name, last_name, email)
+                VALUES (new.id, new.first_name, new.last_name, new.email);
+            END
+        """,
+        "employees_employee_fts_delete": """
+            CREATE TRIGGER employees_employee_fts_delete AFTER DELETE ON employees_employee
+            BEGIN
+                DELETE FROM employees_employee_fts
+                WHERE employees_employee_fts MATCH 'employee_id:"' || old.id || '"';
+            END
+        """,
+        "employees_employee_fts_update": """
+            CREATE TRIGGER employees_employee_fts_update
+            AFTER UPDATE OF id, first_name, last_name, email ON employees_employee
+            BEGIN
+                DELETE FROM employees_employee_fts
+                WHERE employees_employee_fts MATCH 'employee_id:"' || old.id || '"';
+                INSERT INTO employees_employee_fts (employee_id, first_name, last_name, email)
+                VALUES (new.id, new.first_name, new.last_name, new.email);
+            END
+        """,
+    }
+
+    def is_available(self, connection):
+        return self.table in connection.introspection.table_names()
+
+    def missing_triggers(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s",
+                ["employees_employee"],
+            )
+            existing = {name for (name,) in cursor.fetchall()}
+        return [name for name in self.triggers if name not in existing]
+
+    def search(self, queryset, terms):
+        table = self.table
+        match = "{first_name last_name email} : (%s)" % " AND ".join(
+            f'"{term}"*' for term in terms
+        )
+        ranked = f"SELECT employee_id, rank FROM {table} WHERE {table} MATCH %s"
+        # the ranks of the matches are computed once, LIMIT -1 keeping SQLite
+        # from flattening the subquery into one full-text query per row
+        rank = RawSQL(
+            f"SELECT rank FROM ({ranked} LIMIT -1) AS ranked "
+            f"WHERE ranked.employee_id = {queryset.model._meta.db_table}.id",
+            [match],
+            output_field=FloatField(),
+        )
+        matches = RawSQL(
+            f"SELECT employee_id FROM {table} WHERE {table} MATCH %s", [match]
+        )
+        return (
+            queryset.filter(pk__in=matches)
+            .annotate(search_rank=rank)
+            .order_by("search_rank")
+        )
+
+
+def restore_search_triggers(using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    Recreates the missing triggers keeping the SQLite full-text search table in sync.
+
+    SQLite rebuilds a table to alter most of its columns, which drops its
+    triggers. This receives post_migrate, so a migration rebuilding the
+    employees table needs no step of its own: the missing triggers are
+    created and the FTS5 table refilled, as the rows written without them are
+    not indexed. It does nothing on the other databases or when the FTS5
+    table does not exist. The search filter checks the index again, as the
+    migration may have created or dropped it.
+    """
+    connection = connections[using]
+    EmployeeSearchFilter._available.pop(connection, None)
+    backend = SQLiteSearchBackend()
+    if connection.vendor != "sqlite" or not backend.is_available(connection):
+        return
+    missing = backend.missing_triggers(connection)
+    if not missing:
+        return
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        for name in missing:
+            cursor.execute(backend.triggers[name])
+        cursor.execute(f"DELETE FROM {backend.table}")
+        cursor.execute(
+            f"INSERT INTO {backend.table} (employee_id, first_name, last_name, email) "
+            "SELECT id, first_name, last_name, email FROM employees_employee"
+        )
+
+
+class PostgresSearchBackend:
+    """
+    Full-text search on PostgreSQL through the employee_search_idx GIN index.
+
+    The document expression is the one the index of migration 0012 is built on,
+    so the @@ condition is answered from the index. Every search term is matched
+    as a prefix and the rows are ranked with ts_rank.
+    """
+
+    # the punctuation is replaced by spaces, so an email is split into the
+    # tokens the FTS5 unicode61 tokenizer of SQLite finds in it
+    document = (
+        "to_tsvector('simple'::regconfig, regexp_replace("
+        "coalesce({table}.first_name, '') || ' ' || "
+        "coalesce({table}.last_name, '') || ' ' || "
+        "coalesce({table}.email, ''), '[^[:alnum:]]+', ' ', 'g'))"
+    )
+
+    def is_available(self, connection):
+        return True
+
+    def search(self, queryset, terms):
+        document = self.document.format(table=queryset.model._meta.db_table)
+        query = " & ".join(f"{term}:*" for term in terms)
+        tsquery = "to_tsquery('simple'::regconfig, %s)"
+        return (
+            queryset.filter(
+                RawSQL(f"{document} @@ {tsquery}", [query], output_field=BooleanField())
+            )
+            .annotate(
+                search_rank=RawSQL(
+                    f"ts_rank({document}, {tsquery})",
+                    [query],
+                    output_field=FloatField(),
+                )
+            )
+            .order_by("-search_rank")
+        )
+
+
+class EmployeeSearchFilter(SearchFilter):
+    """
+    A search filter backend using the full-text index of the database.
+
+    It is a drop-in replacement for SearchFilter on EmployeeListView: the same
+    ?search= parameter is matched with prefix semantics and results are ordered
+    by relevance. Backends are picked by database vendor; when the vendor has no
+    backend or its index is missing, the icontains search of SearchFilter over
+    the view's search_fields is used instead.
+
+    Attributes:
+        backends (dict): The search backend class to use for each database vendor.
+    """
+
+    backends = {
+        "sqlite": SQLiteSearchBackend,
+        "postgresql": PostgresSearchBackend,
+    }
+    # whether the index exists, by database connection; checked again when the
+    # connection is reopened or migrated
+    _available = weakref.WeakKeyDictionary()
+
+    def filter_queryset(self, request, queryset, view):
+        terms = SEARCH_TERM.findall(request.query_params.get(self.search_param, ""))
+        if not terms:
+            return super().filter_queryset(request, queryset, view)
+        backend = self.get_backend(queryset.db)
+        if backend is None:
+            return super().filter_queryset(request, queryset, view)
+        return backend.search(queryset, terms)
+
+    def get_backend(self, alias):
+        connection = connections[alias]
+        backend_class = self.backends.get(connection.vendor)
+        if backend_class is None:
+            return None
+        backend = backend_class()
+        if connection not in self._available:
+            self._available[connection] = backend.is_available(connection)
+        return backend if self._available[connection] else None
+
+
+@receiver(connection_created)
+def forget_search_index(sender, connection, **kwargs):
+    EmployeeSearchFilter._available.pop(connection, None)
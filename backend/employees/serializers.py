@@ -1,10 +1,18 @@
+from django.db.models.functions import Lower
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 import datetime
 import re
-from .models import Employee, Skill
+from .caching import EMPLOYEES, response_cache
+from .emails import email_filter, normalize_email, unique_email
+from .metrics import TimedListSerializer, TimedSerializerMixin
+from .models import Employee, Skill, id_allocator
+from .skill_sync import sync_skills
+from .summaries import SUMMARY_FIELDS
 
 
-class SkillSerializer(serializers.ModelSerializer):
+class SkillSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     A serializer class for the Skill model.
 
@@ -18,6 +26,7 @@ class SkillSerializer(serializers.ModelSerializer):
         model (Skill): The Skill model that the serializer is based on.
         fields (list): The fields to include in the serialized representation.
         read_only_fields (list): The fields that are read-only and cannot be modified.
+        list_serializer_class (TimedListSerializer): The serializer used when many=True, timed as this one.
 
     """
 
@@ -41,14 +50,258 @@ class SkillSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["created_at", "updated_at"]
+        list_serializer_class = TimedListSerializer
 
 
-class EmployeeSerializer(serializers.ModelSerializer):
+class NestedSkillSerializer(SkillSerializer):
+    """
+    A serializer class for the skills written inside their employee.
+
+    The representation is the SkillSerializer one. The employee is the one
+    being written and the id is read-only, as the skills are matched on their
+    name, so both are ignored in the input. A skill is always written whole,
+    so its fields stay required when the employee is partially updated.
+
+    Attributes:
+        employee (serializers.PrimaryKeyRelatedField): The related employee for the skill. Read-only field.
+
+    Methods:
+        to_internal_value(data): Rejects the skills missing a required field, then validates them.
+
+    """
+
+    employee = serializers.PrimaryKeyRelatedField(read_only=True)
+
+    def to_internal_value(self, data):
+        # the fields skip their required check when the root is partial
+        if isinstance(data, dict):
+            missing = {
+                field.field_name: [field.error_messages["required"]]
+                for field in self._writable_fields
+                if field.required and field.field_name not in data
+            }
+            if missing:
+                raise serializers.ValidationError(missing, code="required")
+        return super().to_internal_value(data)
+
+
+class EmployeeSkillSerializer(serializers.ModelSerializer):
+    """
+    A serializer class for a skill given inside its employee, without the employee field.
+
+    Attributes:
+        name (serializers.CharField): The name of the skill. Required field.
+        yrs_exp (serializers.IntegerField): The years of experience for the skill. Required field.
+        seniority (serializers.CharField): The seniority level of the skill. Required field.
+
+    Meta:
+        model (Skill): The Skill model that the serializer is based on.
+        fields (list): The fields to include in the serialized representation.
+
+    """
+
+    name = serializers.CharField(required=True)
+    yrs_exp = serializers.IntegerField(required=True)
+    seniority = serializers.CharField(required=True)
+
+    class Meta:
+        model = Skill
+        fields = ["name", "yrs_exp", "seniority"]
+
+
+class EmployeeListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    """
+    A list serializer class for creating and updating employees in bulk.
+
+    Rows carrying an "id" update that employee, the other rows create a new one.
+    The rows are validated with the EmployeeSerializer field rules, except for
+    the email uniqueness check, which is done for the whole batch with a single
+    query and also rejects emails repeated inside the payload. Validation errors
+    are returned per row, in the order of the payload.
+
+    Methods:
+        to_internal_value(data): Validates every row and returns the list of validated rows.
+        validate_rows(data, match_email): Validates every row and returns the rows, matched employees and errors without raising.
+        save(): Creates and updates the employees with bulk queries in a single transaction.
+        write_rows(rows, instances): Writes validated rows with bulk_create/bulk_update.
+
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            message = self.error_messages["not_a_list"].format(
+                input_type=type(data).__name__
+            )
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [message]}, code="not_a_list"
+            )
+        if not data:
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [self.error_messages["empty"]]},
+                code="empty",
+            )
+        if self.max_length is not None and len(data) > self.max_length:
+            message = self.error_messages["max_length"].format(
+                max_length=self.max_length
+            )
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [message]}, code="max_length"
+            )
+
+        rows, instances, errors = self.validate_rows(data)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        self._bulk_instances = instances
+        return rows
+
+    def validate_rows(self, data, match_email=False):
+        """
+        Validates a list of rows without raising, with a constant number of queries.
+
+        Args:
+            data (list): The rows to validate.
+            match_email (bool): Whether rows without an "id" update the employee owning their email instead of being rejected.
+
+        Returns:
+            tuple: The validated rows (None for invalid rows), the existing employee of each row (None for new rows) and the errors of each row.
+        """
+        ids = [item.get("id") if isinstance(item, dict) else None for item in data]
+        # the ids are looked up as dict keys, so a list or an object is a row
+        # error rather than an unhashable key
+        invalid = {
+            index
+            for index, pk in enumerate(ids)
+            if pk is not None and not isinstance(pk, str)
+        }
+        for index in invalid:
+            ids[index] = None
+        instances = Employee.objects.in_bulk([pk for pk in ids if pk])
+
+        rows = []
+        errors = []
+        for index, (item, pk) in enumerate(zip(data, ids)):
+            row_errors = {}
+            validated = None
+            if index in invalid:
+                row_errors["id"] = ["Employee id must be a string"]
+            elif pk and pk not in instances:
+                row_errors["id"] = ["Employee not found"]
+            try:
+                validated = self.child.run_validation(item)
+            except serializers.ValidationError as exc:
+                row_errors.update(exc.detail)
+            rows.append(validated if not row_errors else None)
+            errors.append(row_errors)
+
+        # one query for the emails of the whole batch, compared as the unique
+        # constraint compares them
+        emails = [normalize_email(row["email"]) for row in rows if row is not None]
+        owners = {}
+        queryset = Employee.objects.alias(email_lower=Lower("email"))
+        for email, pk in queryset.filter(email_lower__in=emails).values_list(
+            "email", "id"
+        ):
+            owners.setdefault(normalize_email(email), set()).add(pk)
+        if match_email:
+            matched = {}
+            for index, row in enumerate(rows):
+                if row is not None and not ids[index]:
+                    owner = owners.get(normalize_email(row["email"]), set())
+                    if len(owner) == 1:
+                        ids[index] = matched[index] = next(iter(owner))
+            instances.update(Employee.objects.in_bulk(list(matched.values())))
+
+        # only the last of the rows writing one employee would be saved
+        seen_ids = set()
+        for index, pk in enumerate(ids):
+            if pk and pk in seen_ids:
+                errors[index].setdefault("id", ["Id is duplicated in the payload"])
+                rows[index] = None
+            seen_ids.add(pk)
+
+        seen = set()
+        for index, (row, pk, row_errors) in enumerate(zip(rows, ids, errors)):
+            if row is None:
+                continue
+            email = normalize_email(row["email"])
+            if email in seen:
+                row_errors["email"] = ["Email is duplicated in the payload"]
+            elif owners.get(email, set()) - {pk}:
+                row_errors["email"] = ["Email already exists"]
+            if row_errors:
+                rows[index] = None
+            seen.add(email)
+
+        return rows, [instances.get(pk) for pk in ids], errors
+
+    def save(self, **kwargs):
+        self.instance = self.write_rows(
+            self.validated_data, self._bulk_instances, **kwargs
+        )
+        return self.instance
+
+    def write_rows(self, rows, instances, **kwargs):
+        """
+        Creates and updates employees with bulk queries in a single transaction.
+
+        Args:
+            rows (list): The validated rows.
+            instances (list): The existing employee of each row, None for the rows to create.
+
+        Returns:
+            list: The saved employees, in the order of the rows.
+        """
+        created = []
+        updated = []
+        update_fields = {"updated_at"}
+        employees = []
+        now = timezone.now()
+        skills = []
+        for row, instance in zip(rows, instances):
+            row = {**row, **kwargs}
+            skills.append(row.pop("skills", None))
+            if instance is None:
+                instance = Employee(**row)
+                created.append(instance)
+            else:
+                for attr, value in row.items():
+                    setattr(instance, attr, value)
+                # bulk_update does not run auto_now
+                instance.updated_at = now
+                update_fields.update(row)
+                updated.append(instance)
+            employees.append(instance)
+
+        # the emails were checked by validate_rows; a conflict here is a
+        # concurrent write of the same email
+        with unique_email(field=api_settings.NON_FIELD_ERRORS_KEY):
+            for instance, pk in zip(created, id_allocator.allocate(len(created))):
+                instance.id = pk
+            Employee.objects.bulk_create(created)
+            Employee.objects.bulk_update(updated, sorted(update_fields))
+            # bulk_create and bulk_update do not send post_save
+            response_cache.invalidate(EMPLOYEES)
+            for instance in employees:
+                email_filter.add(instance.email)
+            # the rows without a skills list keep their skills
+            written = [
+                (instance, row_skills)
+                for instance, row_skills in zip(employees, skills)
+                if row_skills is not None
+            ]
+            if written:
+                sync_skills(*zip(*written))
+
+        return employees
+
+
+class EmployeeSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     A serializer class for the Employee model.
 
     Attributes:
-        skills (SkillSerializer): The serializer for the related skills of the employee. Read-only field.
+        skills (NestedSkillSerializer): The skills of the employee. Optional field; when given, it replaces the skills of the employee.
         first_name (serializers.CharField): The first name of the employee. Required field.
         last_name (serializers.CharField): The last name of the employee. Required field.
         email (serializers.EmailField): The email address of the employee. Required field.
@@ -60,7 +313,10 @@ class EmployeeSerializer(serializers.ModelSerializer):
         country (serializers.CharField): The country of residence of the employee. Required field.
 
     Methods:
-        validate_email(value): Validates the email field to ensure it is unique and belongs to the current user (if updating).
+        create(validated_data): Creates the employee and its skills, with a conflict on the unique email constraint returned as an email error.
+        update(instance, validated_data): Updates the employee and its skills, with a conflict on the unique email constraint returned as an email error.
+        write_skills(instance, skills): Replaces the skills of the employee with the given ones.
+        validate_skills(value): Validates the skills field to ensure the skill names are unique.
         validate_postcode(value): Validates the postcode field to ensure it has 4 characters.
         validate_contact_number(value): Validates the contact number field to ensure it has a valid phone number format.
         validate_date_of_birth(value): Validates the date of birth field to ensure it is not in the future.
@@ -69,11 +325,12 @@ class EmployeeSerializer(serializers.ModelSerializer):
         model (Employee): The Employee model that the serializer is based on.
         fields (list): The fields to include in the serialized representation.
         read_only_fields (list): The fields that are read-only and cannot be modified.
+        list_serializer_class (EmployeeListSerializer): The serializer used for bulk writes when many=True.
 
     """
 
     # all fields are required to create and update an employee
-    skills = SkillSerializer(many=True, read_only=True)
+    skills = NestedSkillSerializer(many=True, required=False)
     first_name = serializers.CharField(required=True)
     last_name = serializers.CharField(required=True)
     email = serializers.EmailField(required=True)
@@ -84,20 +341,43 @@ class EmployeeSerializer(serializers.ModelSerializer):
     postcode = serializers.CharField(required=True)
     country = serializers.CharField(required=True)
 
-    def validate_email(self, value):
-        # Check if the email exists
-        existing_user = Employee.objects.filter(email=value).first()
-
-        # If it's a new user creation, just check if the email exists
-        if self.instance is None:
-            if existing_user:
-                raise serializers.ValidationError("Email already exists")
-        else:
-            # If it's an update, check if the email belongs to the current user
-            if existing_user and existing_user.id != self.instance.id:
-                raise serializers.ValidationError(
-                    "Email already exists and belongs to another user"
-                )
+    # email uniqueness is enforced by the employee_email_lower_unique
+    # constraint, so the writes need no query to check it first
+    def create(self, validated_data):
+        skills = validated_data.pop("skills", None)
+        # the employee and its skills are written in one transaction
+        with unique_email():
+            instance = super().create(validated_data)
+            # a new employee has no skills to diff against
+            if skills:
+                self.write_skills(instance, skills)
+        return instance
+
+    def update(self, instance, validated_data):
+        skills = validated_data.pop("skills", None)
+        with unique_email("Email already exists and belongs to another user"):
+            instance = super().update(instance, validated_data)
+            self.write_skills(instance, skills)
+        return instance
+
+    def write_skills(self, instance, skills):
+        """
+        Replaces the skills of the employee with the given ones, if given.
+
+        The skills are diffed against the stored ones by sync_skills, so only
+        the created, changed and removed skills are written. The summary
+        columns and updated_at of the instance are reloaded when its skills
+        changed, so the instance is the saved employee.
+        """
+        if skills is None:
+            return
+        if sync_skills([instance], [skills], touch=True):
+            instance.refresh_from_db(fields=["updated_at", *SUMMARY_FIELDS])
+
+    def validate_skills(self, value):
+        names = [skill["name"] for skill in value]
+        if len(set(names)) != len(names):
+            raise serializers.ValidationError("Skill names must be unique")
         return value
 
     def validate_postcode(self, value):
@@ -126,7 +406,6 @@ class EmployeeSerializer(serializers.ModelSerializer):
             "skills",
             "email",
             "date_of_birth",
-            "skills",
             "contact_number",
             "street_address",
             "city",
@@ -136,3 +415,4 @@ class EmployeeSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["created_at", "updated_at"]
+        list_serializer_class = EmployeeListSerializer
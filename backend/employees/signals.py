@@ -0,0 +1,138 @@
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .caching import EMPLOYEES, SKILLS, response_cache
+from .emails import email_filter
+from .models import Employee, Skill, Tombstone
+from .skill_names import invalidate_skill_names
+from .summaries import refresh_skill_summaries
+
+
+class DeleteBatch:
+    """
+    The tombstones of a delete spanning several rows, written with one query.
+
+    The post_delete signals of the skills deleted by the batch only add their
+    tombstone to it. For an employee delete the tombstones are written by the
+    first post_delete signal of the employees, whose summaries need no
+    refresh; delete_skills writes them itself and leaves the refresh to its
+    caller.
+
+    Attributes:
+        origin (Model or QuerySet): The object delete() was called on, as given to the delete signals.
+        employees (set): The ids of the employees deleted by the batch and not recorded yet.
+        tombstones (list): The unsaved tombstones of the skills deleted so far.
+    """
+
+    def __init__(self, origin):
+        self.origin = origin
+        self.employees = set()
+        self.tombstones = []
+
+
+# the batch of the delete in progress; a batch is only used by the signals of
+# its own origin, so one left behind by a failed delete is ignored
+delete_batch = ContextVar("delete_batch", default=None)
+
+
+def current_batch(origin):
+    batch = delete_batch.get()
+    if batch is not None and origin is not None and batch.origin is origin:
+        return batch
+    return None
+
+
+def delete_skills(queryset):
+    """
+    Deletes skills with one tombstone insert, without their per-row signal work.
+
+    The skill summaries, skill names and cached responses are left to the
+    caller, which refreshes them once for the whole write.
+
+    Args:
+        queryset (QuerySet): The skills to delete.
+    """
+    batch = DeleteBatch(queryset)
+    token = delete_batch.set(batch)
+    try:
+        with transaction.atomic():
+            queryset.delete()
+            Tombstone.objects.bulk_create(batch.tombstones)
+    finally:
+        delete_batch.reset(token)
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def employee_changed(sender, instance, **kwargs):
+    response_cache.invalidate(EMPLOYEES)
+
+
+@receiver(post_save, sender=Employee)
+def employee_saved(sender, instance, **kwargs):
+    # deleted or changed emails stay in the filter as false positives
+    email_filter.add(instance.email)
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def skill_changed(sender, instance, origin=None, **kwargs):
+    if current_batch(origin) is not None:
+        return
+    invalidate_skill_names()
+    # the employee representation embeds the skills, so a skill write is a
+    # write to the employee: this keeps its Last-Modified exact after a delete
+    # and lists the employee in the change feed
+    refresh_skill_summaries([instance.employee_id], touch=True)
+    response_cache.invalidate(EMPLOYEES, SKILLS)
+
+
+@receiver(pre_delete, sender=Employee)
+def employee_deleting(sender, instance, origin=None, **kwargs):
+    # sent for every deleted employee before any row is deleted, so the
+    # cascaded skills are collected in the batch of the employees
+    batch = current_batch(origin)
+    if batch is None or instance.pk in batch.employees:
+        batch = DeleteBatch(origin)
+        delete_batch.set(batch)
+    batch.employees.add(instance.pk)
+
+
+@receiver(post_delete, sender=Employee)
+def employee_deleted(sender, instance, origin=None, **kwargs):
+    batch = current_batch(origin)
+    if batch is None:
+        Tombstone.objects.create(
+            model=Tombstone.EMPLOYEE, object_id=instance.pk, employee=instance.pk
+        )
+        return
+    # the skills are deleted before their employees and the employees with a
+    # single query, so the first employee signal sees the whole batch
+    if not batch.employees:
+        return
+    tombstones = batch.tombstones + [
+        Tombstone(model=Tombstone.EMPLOYEE, object_id=pk, employee=pk)
+        for pk in sorted(batch.employees)
+    ]
+    Tombstone.objects.bulk_create(tombstones)
+    if batch.tombstones:
+        invalidate_skill_names()
+        response_cache.invalidate(EMPLOYEES, SKILLS)
+    batch.employees = set()
+    batch.tombstones = []
+
+
+@receiver(post_delete, sender=Skill)
+def skill_deleted(sender, instance, origin=None, **kwargs):
+    # also sent for the skills deleted by the cascade from their employee
+    tombstone = Tombstone(
+        model=Tombstone.SKILL, object_id=instance.pk, employee=instance.employee_id
+    )
+    batch = current_batch(origin)
+    if batch is None:
+        tombstone.save()
+        return
+    batch.tombstones.append(tombstone)
@@ -0,0 +1,65 @@
+from django.core.cache import cache
+from django.db.models import Count
+
+from .models import Skill
+
+SKILL_NAMES_KEY = "employees:skill-names"
+SKILL_NAMES_TIMEOUT = 60 * 60
+
+
+def get_skill_name_counts():
+    """
+    Returns the number of employees with each skill name, cached until a skill is written.
+
+    The names are read with one query grouped on the name, which is the
+    leading column of the (name, employee) unique index, so the size of the
+    result is the number of distinct names.
+
+    Returns:
+        dict: The number of employees by skill name, ordered by name.
+    """
+    counts = cache.get(SKILL_NAMES_KEY)
+    if counts is None:
+        counts = dict(
+            Skill.objects.order_by("name").values_list("name").annotate(Count("id"))
+        )
+        cache.set(SKILL_NAMES_KEY, counts, SKILL_NAMES_TIMEOUT)
+    return counts
+
+
+def get_skill_names():
+    """
+    Returns the distinct skill names, cached until a skill is written.
+
+    Returns:
+        dict_keys: The names of all skills, as a set-like view.
+    """
+    return get_skill_name_counts().keys()
+
+
+def find_skill_names(values):
+    """
+    Returns the given names that are the name of at least one skill.
+
+    The cached set answers the common case, and names missing from it are
+    looked up in the database before being rejected, in case the cache has not
+    seen a recent write yet.
+    """
+    names = get_skill_names()
+    found = {value for value in values if value in names}
+    missing = set(values) - found
+    if missing:
+        existing = set(
+            Skill.objects.filter(name__in=missing)
+            .order_by()
+            .values_list("name", flat=True)
+            .distinct()
+        )
+        if existing:
+            invalidate_skill_names()
+        found |= existing
+    return found
+
+
+def invalidate_skill_names():
+    cache.delete(SKILL_NAMES_KEY)
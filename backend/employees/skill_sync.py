@@ -0,0 +1,66 @@
+from django.utils import timezone
+
+from .caching import EMPLOYEES, SKILLS, response_cache
+from .models import Skill
+from .signals import delete_skills
+from .skill_names import invalidate_skill_names
+from .summaries import refresh_skill_summaries
+
+
+def sync_skills(employees, skills, prune=True, touch=False):
+    """
+    Writes the skills of employees, diffed against their stored skills.
+
+    The skills are matched on their name, unique per employee: new names are
+    created and the skills whose years of experience or seniority changed are
+    updated, with one bulk query each, and with prune the stored skills
+    missing from the list are deleted, with their tombstones written in one
+    query by delete_skills. Unchanged skills are not written. The skill
+    summaries, the skill names and the cached responses are refreshed here,
+    once for the whole write, as the bulk queries skip the skill signals.
+
+    Args:
+        employees (list): The saved employees.
+        skills (list): The validated {"name", "yrs_exp", "seniority"} dicts of each employee.
+        prune (bool): Whether to delete the skills missing from the lists.
+        touch (bool): Whether to set updated_at on the employees whose skills changed.
+
+    Returns:
+        set: The ids of the employees whose skills changed.
+    """
+    existing = {}
+    for skill in Skill.objects.filter(employee__in=employees).order_by():
+        existing[(skill.employee_id, skill.name)] = skill
+
+    now = timezone.now()
+    created, updated, keep = [], [], set()
+    for employee, employee_skills in zip(employees, skills):
+        for data in employee_skills:
+            key = (employee.id, data["name"])
+            keep.add(key)
+            skill = existing.get(key)
+            if skill is None:
+                created.append(Skill(employee=employee, **data))
+            elif (skill.yrs_exp, skill.seniority) != (
+                data["yrs_exp"],
+                data["seniority"],
+            ):
+                skill.yrs_exp = data["yrs_exp"]
+                skill.seniority = data["seniority"]
+                skill.updated_at = now
+                updated.append(skill)
+    stale = []
+    if prune:
+        stale = [skill for key, skill in existing.items() if key not in keep]
+
+    if stale:
+        delete_skills(Skill.objects.filter(id__in=[skill.id for skill in stale]))
+    Skill.objects.bulk_create(created)
+    Skill.objects.bulk_update(updated, ["yrs_exp", "seniority", "updated_at"])
+    changed = {skill.employee_id for skill in created + updated + stale}
+    if created or stale:
+        invalidate_skill_names()
+    if changed:
+        refresh_skill_summaries(changed, touch=touch)
+        response_cache.invalidate(EMPLOYEES, SKILLS)
+    return changed
@@ -0,0 +1,93 @@
+from collections import defaultdict
+
+from django.utils import timezone
+
+from .models import Employee, Skill
+
+SUMMARY_FIELDS = ("skill_count", "max_yrs_exp", "senior_skills")
+SENIOR = "senior"
+# wraps every name, so "has senior X" is a single contains lookup
+SEPARATOR = "|"
+
+
+def summarize(skills):
+    """
+    Returns the skill summary columns of an employee from its skills.
+
+    Args:
+        skills (list): The (name, yrs_exp, seniority) tuples of the skills.
+
+    Returns:
+        dict: The values of SUMMARY_FIELDS.
+
+    Example:
+        >>> summarize([("Python", 5, "senior"), ("SQL", 2, "junior")])
+        {"skill_count": 2, "max_yrs_exp": 5, "senior_skills": "|Python|"}
+    """
+    senior = sorted(name for name, _, seniority in skills if is_senior(seniority))
+    return {
+        "skill_count": len(skills),
+        "max_yrs_exp": max((yrs_exp for _, yrs_exp, _ in skills), default=0),
+        "senior_skills": senior_skills_value(senior),
+    }
+
+
+def is_senior(seniority):
+    return seniority.lower() == SENIOR
+
+
+def senior_skills_value(names):
+    if not names:
+        return ""
+    return SEPARATOR + SEPARATOR.join(names) + SEPARATOR
+
+
+def senior_skill_lookup(name):
+    """Returns the filter kwargs matching the employees with name as a senior skill."""
+    return {"senior_skills__contains": SEPARATOR + name + SEPARATOR}
+
+
+def compute_summaries(employee_ids):
+    """
+    Returns the skill summaries of the given employees, read from their skills.
+
+    Args:
+        employee_ids (iterable): The ids of the employees.
+
+    Returns:
+        dict: The values of SUMMARY_FIELDS by employee id, for every id given.
+    """
+    skills = defaultdict(list)
+    rows = Skill.objects.filter(employee_id__in=employee_ids).values_list(
+        "employee_id", "name", "yrs_exp", "seniority"
+    )
+    for employee_id, *skill in rows.order_by():
+        skills[employee_id].append(skill)
+    return {employee_id: summarize(skills[employee_id]) for employee_id in employee_ids}
+
+
+def refresh_skill_summaries(employee_ids, touch=False):
+    """
+    Recomputes the skill summary columns of the given employees.
+
+    Called after every write to their skills: the summaries of the touched
+    employees are rebuilt from their skills in one read and one bulk update,
+    so the cost depends on the employees written, not on the table.
+
+    Args:
+        employee_ids (iterable): The ids of the employees whose skills changed.
+        touch (bool): Whether to also set updated_at, as a write to the employee.
+    """
+    employee_ids = list(dict.fromkeys(employee_ids))
+    if not employee_ids:
+        return
+    fields = list(SUMMARY_FIELDS)
+    now = timezone.now()
+    if touch:
+        fields.append("updated_at")
+    employees = []
+    for employee_id, summary in compute_summaries(employee_ids).items():
+        employee = Employee(id=employee_id, **summary)
+        employee.updated_at = now
+        employees.append(employee)
+    Employee.objects.bulk_update(employees, fields, batch_size=500)
@@ -0,0 +1,124 @@
+import datetime
+
+from django.test import TestCase
+from rest_framework.test import APITestCase
+from rest_framework import status
+from employees.analytics import age_bands, skills_matrix
+from employees.models import Employee, Skill
+from employees.tests.utils import ClearCachesMixin, create_employee
+
+
+class AnalyticsTest(TestCase):
+    def setUp(self):
+        create_employee(
+            "John",
+            date_of_birth="1990-06-15",
+            city="London",
+            skills=[("Python", 5, "Senior"), ("SQL", 2, "Junior")],
+        )
+        create_employee(
+            "Jane",
+            date_of_birth="2004-02-29",
+            city="London",
+            skills=[("Python", 2, "Junior")],
+        )
+        create_employee(
+            "Max",
+            date_of_birth="1960-01-01",
+            city="Paris",
+            skills=[("Python", 8, "Senior")],
+        )
+
+    def test_skills_matrix(self):
+        self.assertEqual(
+            skills_matrix(Employee.objects.all()),
+            [
+                {
+                    "name": "Python",
+                    "headcount": 3,
+                    "avg_yrs_exp": 5.0,
+                    "seniority": {"Junior": 1, "Senior": 2},
+                },
+                {
+                    "name": "SQL",
+                    "headcount": 1,
+                    "avg_yrs_exp": 2.0,
+                    "seniority": {"Junior": 1},
+                },
+            ],
+        )
+
+    def test_age_bands(self):
+        bands = age_bands(Employee.objects.all(), today=datetime.date(2029, 2, 28))
+        self.assertEqual(
+            [(band["band"], band["headcount"]) for band in bands],
+            [("0-24", 1), ("25-34", 0), ("35-44", 1), ("45-54", 0), ("55+", 1)],
+        )
+        # born on February 29th, 25 years old on February 28th of 2029
+        bands = age_bands(Employee.objects.all(), today=datetime.date(2029, 3, 1))
+        self.assertEqual(bands[1]["headcount"], 1)
+        self.assertIsNone(bands[-1]["max"])
+
+    def test_queries(self):
+        with self.assertNumQueries(1):
+            skills_matrix(Employee.objects.all())
+        with self.assertNumQueries(1):
+            age_bands(Employee.objects.all())
+
+
+class AnalyticsEndpointTestCase(ClearCachesMixin, APITestCase):
+    url = "/api/analytics/"
+
+    def setUp(self):
+        super().setUp()
+        self.john = create_employee(
+            "John",
+            date_of_birth="1990-06-15",
+            city="London",
+            skills=[("Python", 5, "Senior"), ("SQL", 2, "Junior")],
+        )
+        create_employee(
+            "Max",
+            date_of_birth="1960-01-01",
+            city="Paris",
+            skills=[("Python", 8, "Senior")],
+        )
+
+    def test_summary(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["headcount"], 2)
+        self.assertEqual(
+            [skill["name"] for skill in response.data["skills"]], ["Python", "SQL"]
+        )
+        self.assertEqual(
+            sum(band["headcount"] for band in response.data["age_bands"]), 2
+        )
+
+    def test_filters_apply(self):
+        response = self.client.get(f"{self.url}skills/?first_name__icontains=john")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["headcount"], 1)
+        self.assertEqual(response.data[0]["avg_yrs_exp"], 5.0)
+
+        response = self.client.get(f"{self.url}age-bands/?skills=SQL")
+        self.assertEqual(sum(band["headcount"] for band in response.data), 1)
+
+        response = self.client.get(f"{self.url}?search=max")
+        self.assertEqual(response.data["headcount"], 1)
+
+    def test_invalid_filter(self):
+        response = self.client.get(f"{self.url}?skills=Cobol")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cached_until_skill_write(self):
+        self.client.get(f"{self.url}skills/")
+        response = self.client.get(f"{self.url}skills/")
+        self.assertEqual(response["X-Cache"], "HIT")
+
+        Skill.objects.create(
+            name="Go", yrs_exp=1, seniority="Junior", employee=self.john
+        )
+        response = self.client.get(f"{self.url}skills/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertIn("Go", [skill["name"] for skill in response.json()])
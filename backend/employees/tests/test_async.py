@@ -0,0 +1,89 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from employees.models import Employee, Skill
+from employees.tests.utils import ClearCachesMixin
+
+
+class AsyncEmployeeViewTest(ClearCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        for first_name in ("John", "Jane", "Jim"):
+            employee = Employee.objects.create(
+                first_name=first_name,
+                last_name="Doe",
+                email=f"{first_name.lower()}@example.com",
+                date_of_birth="1990-01-01",
+            )
+            Skill.objects.create(
+                name="Python", yrs_exp=5, seniority="senior", employee=employee
+            )
+        self.employee = Employee.objects.get(first_name="John")
+
+    async def assertSameResponse(self, path):
+        sync_response = await self.async_client.get(f"/api/{path}")
+        async_response = await self.async_client.get(f"/api/async/{path}")
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(async_response["Content-Type"], "application/json")
+        # the pagination links point to the path of the request
+        self.assertEqual(
+            async_response.content.replace(b"/api/async/", b"/api/"),
+            sync_response.content,
+        )
+        return async_response
+
+    async def test_list(self):
+        await self.assertSameResponse("employees/")
+        await self.assertSameResponse("employees/?first_name__icontains=ja")
+        await self.assertSameResponse("employees/?skills=Python&ordering=-skill_count")
+        await self.assertSameResponse("employees/?search=jim")
+
+    async def test_paginated(self):
+        first = await self.assertSameResponse("employees/?page_size=2")
+        next_url = first.json()["next"].replace("/api/async/", "/api/")
+        self.assertIn("cursor=", next_url)
+        await self.assertSameResponse(next_url.split("/api/", 1)[1])
+
+    async def test_detail(self):
+        await self.assertSameResponse(f"employees/{self.employee.id}/")
+        await self.assertSameResponse("employees/ZZ9999/")
+
+    async def test_invalid_parameters(self):
+        response = await self.async_client.get("/api/async/employees/?skills=Cobol")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("skills", response.json())
+        response = await self.async_client.get(
+            "/api/async/employees/?page_size=1&cursor=invalid"
+        )
+        self.assertEqual(response.status_code, 404)
+
+    async def test_check_email(self):
+        response = await self.async_client.post(
+            "/api/async/check-email/john@example.com/"
+        )
+        self.assertEqual(response.json(), {"exists": True})
+        response = await self.async_client.post(
+            "/api/async/check-email/no@example.com/"
+        )
+        self.assertEqual(response.json(), {"exists": False})
+
+
+class LoadtestEmployeesCommandTest(TransactionTestCase):
+    # the command runs the views on threads of its own event loop, which need
+    # to see committed rows
+    def test_reports_both_paths(self):
+        Employee.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john@example.com",
+            date_of_birth="1990-01-01",
+        )
+        stdout = StringIO()
+        call_command(
+            "loadtest_employees", "--requests", "4", "--concurrency", "2", stdout=stdout
+        )
+        output = stdout.getvalue()
+        for scenario in ("list", "detail", "check-email"):
+            self.assertRegex(output, rf"{scenario} +sync .* \{{200: 4\}}")
+            self.assertRegex(output, rf"{scenario} +async .* \{{200: 4\}}")
@@ -0,0 +1,118 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from employees.models import Employee, Skill, id_allocator
+from employees.tests.utils import ClearCachesMixin
+
+
+class EmployeeBulkTestCase(ClearCachesMixin, APITestCase):
+    url = "/api/employees/bulk/"
+
+    def row(self, i, **kwargs):
+        return {
+            "first_name": f"John {i}",
+            "last_name": "Doe",
+            "contact_number": "1234567890",
+            "street_address": "123 Main Street",
+            "city": "New York",
+            "postcode": "1234",
+            "country": "US",
+            "email": f"john.doe{i}@example.com",
+            "date_of_birth": "1990-01-01",
+            **kwargs,
+        }
+
+    def test_bulk_create(self):
+        rows = [self.row(i) for i in range(20)]
+        response = self.client.post(self.url, rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Employee.objects.count(), 20)
+        self.assertEqual(
+            [employee["email"] for employee in response.data],
+            [row["email"] for row in rows],
+        )
+        self.assertEqual(len({employee["id"] for employee in response.data}), 20)
+
+    def test_bulk_create_and_update(self):
+        employee = Employee.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john.doe0@example.com",
+            date_of_birth="1990-01-01",
+        )
+        Skill.objects.create(
+            name="Python", yrs_exp=5, seniority="Senior", employee=employee
+        )
+        rows = [self.row(0, id=employee.id, first_name="Jane"), self.row(1)]
+        response = self.client.post(self.url, rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Employee.objects.count(), 2)
+        employee.refresh_from_db()
+        self.assertEqual(employee.first_name, "Jane")
+        self.assertEqual(response.data[0]["id"], employee.id)
+        self.assertEqual(len(response.data[0]["skills"]), 1)
+
+    def test_bulk_validation_queries(self):
+        rows = [self.row(i) for i in range(50)]
+        # reserve a fresh block of ids so only the bulk queries are counted
+        id_allocator.reset()
+        id_allocator.allocate()
+        # emails, savepoint, insert, release, refetch employees and skills
+        with self.assertNumQueries(6):
+            self.client.post(self.url, rows, format="json")
+
+    def test_bulk_returns_per_row_errors(self):
+        Employee.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="taken@example.com",
+            date_of_birth="1990-01-01",
+        )
+        rows = [
+            self.row(0),
+            self.row(1, email="taken@example.com"),
+            self.row(2, postcode="123"),
+            self.row(3, email="john.doe0@example.com"),
+            self.row(4, id="ZZ0000"),
+        ]
+        response = self.client.post(self.url, rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("email", response.data[1])
+        self.assertIn("postcode", response.data[2])
+        self.assertIn("email", response.data[3])
+        self.assertIn("id", response.data[4])
+        # nothing is written when a row is invalid
+        self.assertEqual(Employee.objects.count(), 1)
+
+    def test_bulk_rejects_invalid_ids(self):
+        rows = [self.row(0, id=["AA0000"]), self.row(1, id={"pk": 1}), self.row(2)]
+        response = self.client.post(self.url, rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {"id": ["Employee id must be a string"]})
+        self.assertEqual(response.data[1], {"id": ["Employee id must be a string"]})
+        self.assertEqual(response.data[2], {})
+        self.assertEqual(Employee.objects.count(), 0)
+
+    def test_bulk_rejects_duplicated_ids(self):
+        employee = Employee.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john.doe0@example.com",
+            date_of_birth="1990-01-01",
+        )
+        rows = [
+            self.row(0, id=employee.id, first_name="Jane"),
+            self.row(1, id=employee.id, first_name="Jim"),
+        ]
+        response = self.client.post(self.url, rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertEqual(response.data[1], {"id": ["Id is duplicated in the payload"]})
+        employee.refresh_from_db()
+        self.assertEqual(employee.first_name, "John")
+
+    def test_bulk_rejects_non_list_payload(self):
+        response = self.client.post(self.url, self.row(0), format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Employee.objects.count(), 0)
@@ -0,0 +1,106 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from employees.caching import response_cache
+from employees.models import Employee, Skill
+from employees.tests.utils import ClearCachesMixin
+
+
+class ResponseCacheTestCase(ClearCachesMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        response_cache.reset_stats()
+        self.employee = Employee.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john.doe@example.com",
+            date_of_birth="1990-01-01",
+        )
+        self.skill = Skill.objects.create(
+            name="Python", yrs_exp=5, seniority="Senior", employee=self.employee
+        )
+
+    def get(self, url, cache_status):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Cache"], cache_status)
+        return response.json()
+
+    def test_list_cached(self):
+        first = self.get("/api/employees/", "MISS")
+        with self.assertNumQueries(0):
+            second = self.get("/api/employees/", "HIT")
+        self.assertEqual(first, second)
+        self.assertEqual(response_cache.stats(), {"hits": 1, "misses": 1})
+
+    def test_parameters_normalized(self):
+        self.get("/api/employees/?first_name__icontains=jo&skills=Python", "MISS")
+        self.get("/api/employees/?skills=Python&first_name__icontains=jo", "HIT")
+        self.get("/api/employees/?skills=Python", "MISS")
+
+    def test_detail_cached(self):
+        url = f"/api/employees/{self.employee.id}/"
+        self.get(url, "MISS")
+        self.get(url, "HIT")
+        self.get(f"/api/skills/{self.skill.id}/", "MISS")
+
+    def test_errors_not_cached(self):
+        self.client.get("/api/employees/?skills=invalid")
+        response = self.client.get("/api/employees/?skills=invalid")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotIn("X-Cache", response)
+
+    def test_employee_write_invalidates(self):
+        url = f"/api/employees/{self.employee.id}/"
+        self.get("/api/employees/", "MISS")
+        self.get(url, "MISS")
+        self.get("/api/skills/", "MISS")
+        self.client.patch(url, {"first_name": "Johnny"}, format="json")
+
+        self.assertEqual(self.get(url, "MISS")["first_name"], "Johnny")
+        self.assertEqual(self.get("/api/employees/", "MISS")[0]["first_name"], "Johnny")
+        self.get("/api/skills/", "HIT")
+
+    def test_skill_write_invalidates(self):
+        self.get("/api/employees/", "MISS")
+        self.get("/api/skills/", "MISS")
+        self.skill.yrs_exp = 6
+        self.skill.save()
+
+        self.assertEqual(
+            self.get("/api/employees/", "MISS")[0]["skills"][0]["yrs_exp"], 6
+        )
+        self.assertEqual(self.get("/api/skills/", "MISS")[0]["yrs_exp"], 6)
+
+    def test_cascade_delete_invalidates(self):
+        self.get("/api/skills/", "MISS")
+        self.client.delete(f"/api/employees/{self.employee.id}/")
+        self.assertEqual(self.get("/api/skills/", "MISS"), [])
+        self.assertEqual(self.get("/api/employees/", "MISS"), [])
+
+    def test_bulk_write_invalidates(self):
+        self.get("/api/employees/", "MISS")
+        response = self.client.post(
+            "/api/employees/bulk/",
+            [
+                {
+                    "id": self.employee.id,
+                    "first_name": "Johnny",
+                    "last_name": "Doe",
+                    "email": "john.doe@example.com",
+                    "date_of_birth": "1990-01-01",
+                    "contact_number": "1234567890",
+                    "street_address": "123 Main Street",
+                    "city": "New York",
+                    "postcode": "1234",
+                    "country": "US",
+                }
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get("/api/employees/", "MISS")[0]["first_name"], "Johnny")
+
+    def test_browsable_api_not_cached(self):
+        response = self.client.get("/api/employees/", HTTP_ACCEPT="text/html")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("X-Cache", response)
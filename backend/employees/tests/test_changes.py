@@ -0,0 +1,146 @@
+import datetime
+from unittest import mock
+
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+from employees.models import Employee, Skill, Tombstone
+from employees.tests.utils import ClearCachesMixin, create_employee
+from employees.views import EmployeeListView
+
+
+@mock.patch.object(EmployeeListView, "changes_lag", datetime.timedelta(0))
+class ChangeFeedTestCase(ClearCachesMixin, APITestCase):
+    url = "/api/employees/changes/"
+
+    def setUp(self):
+        super().setUp()
+        self.john = create_employee("John")
+        self.jane = create_employee("Jane")
+        self.skill = Skill.objects.create(
+            name="Python", yrs_exp=5, seniority="Senior", employee=self.john
+        )
+
+    def read(self, url=None):
+        response = self.client.get(url or self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def events(self, data):
+        return [
+            (change["event"], change["model"], change["id"])
+            for change in data["results"]
+        ]
+
+    def test_initial_read_lists_employees(self):
+        data = self.read()
+        # the skill write touched john after jane was created
+        self.assertEqual(
+            self.events(data),
+            [
+                ("updated", "employee", self.jane.id),
+                ("updated", "employee", self.john.id),
+            ],
+        )
+        self.assertEqual(len(data["results"][1]["data"]["skills"]), 1)
+        self.assertFalse(data["has_more"])
+        self.assertEqual(self.read(data["next"])["results"], [])
+
+    def test_batches(self):
+        first = self.read(f"{self.url}?page_size=1")
+        self.assertTrue(first["has_more"])
+        second = self.read(first["next"])
+        self.assertEqual(
+            self.events(first) + self.events(second),
+            self.events(self.read()),
+        )
+
+    def test_only_changes_after_cursor(self):
+        cursor = self.read()["next"]
+        self.jane.city = "Paris"
+        self.jane.save()
+        data = self.read(cursor)
+        self.assertEqual(self.events(data), [("updated", "employee", self.jane.id)])
+        self.assertEqual(data["results"][0]["data"]["city"], "Paris")
+
+    def test_deletes(self):
+        cursor = self.read()["next"]
+        skill_id, employee_id = self.skill.id, self.john.id
+        self.john.delete()
+        events = self.events(self.read(cursor))
+        self.assertEqual(
+            events,
+            [
+                ("deleted", "skill", str(skill_id)),
+                ("deleted", "employee", employee_id),
+            ],
+        )
+
+    def test_cascade_writes_tombstones_at_once(self):
+        Skill.objects.bulk_create(
+            Skill(name=f"Skill {i}", yrs_exp=1, seniority="Junior", employee=self.john)
+            for i in range(19)
+        )
+        # the employees, their skills, two deletes and one tombstone insert;
+        # the summaries of the deleted employees are not refreshed
+        with self.assertNumQueries(5):
+            Employee.objects.all().delete()
+        self.assertEqual(Tombstone.objects.filter(model=Tombstone.SKILL).count(), 20)
+        self.assertEqual(
+            set(
+                Tombstone.objects.filter(model=Tombstone.EMPLOYEE).values_list(
+                    "object_id", flat=True
+                )
+            ),
+            {self.john.id, self.jane.id},
+        )
+
+    def test_skill_delete_updates_employee(self):
+        cursor = self.read()["next"]
+        skill_id = self.skill.id
+        self.skill.delete()
+        events = self.events(self.read(cursor))
+        self.assertEqual(
+            sorted(events),
+            [
+                ("deleted", "skill", str(skill_id)),
+                ("updated", "employee", self.john.id),
+            ],
+        )
+
+    def test_same_timestamp_across_streams(self):
+        now = timezone.now() - datetime.timedelta(seconds=1)
+        Employee.objects.update(updated_at=now)
+        Tombstone.objects.create(
+            model="employee", object_id="AA0000", employee="AA0000", deleted_at=now
+        )
+        events = []
+        url = f"{self.url}?page_size=1"
+        for _ in range(3):
+            data = self.read(url)
+            events += self.events(data)
+            url = data["next"]
+        self.assertEqual(
+            events,
+            [
+                ("updated", "employee", min(self.john.id, self.jane.id)),
+                ("updated", "employee", max(self.john.id, self.jane.id)),
+                ("deleted", "employee", "AA0000"),
+            ],
+        )
+        self.assertEqual(self.read(url)["results"], [])
+
+    def test_recent_changes_held_back(self):
+        with mock.patch.object(
+            EmployeeListView, "changes_lag", datetime.timedelta(minutes=1)
+        ):
+            self.assertEqual(self.read()["results"], [])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {"since": "invalid"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_read_queries(self):
+        # employees, their skills and tombstones
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
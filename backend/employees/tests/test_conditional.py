@@ -0,0 +1,174 @@
+import datetime
+
+from django.core.cache import caches
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.test import APITestCase
+from rest_framework import status
+from employees.models import Employee, Skill
+from employees.tests.utils import ClearCachesMixin
+
+
+class ConditionalRequestTestCase(ClearCachesMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.john = Employee.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john.doe@example.com",
+            date_of_birth="1990-01-01",
+        )
+        self.jane = Employee.objects.create(
+            first_name="Jane",
+            last_name="Doe",
+            email="jane.doe@example.com",
+            date_of_birth="1990-01-01",
+        )
+        self.skill = Skill.objects.create(
+            name="Python", yrs_exp=5, seniority="Senior", employee=self.john
+        )
+        self.url = f"/api/employees/{self.john.id}/"
+
+    def test_list_not_modified(self):
+        # a plain list skips the validators query
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/employees/")
+        self.assertNotIn("ETag", response)
+
+        # a poller gets the validators from a conditional request
+        response = self.client.get("/api/employees/", HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+
+        caches["employees"].clear()
+        # only the validators are queried
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/employees/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.get("/api/employees/", HTTP_IF_NONE_MATCH='"stale"')
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/employees/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_list_cached_without_validators(self):
+        self.client.get("/api/employees/")
+        # the cached response has no validators, so it is rendered again
+        response = self.client.get("/api/employees/", HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertIn("ETag", response)
+        response = self.client.get("/api/employees/")
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertIn("ETag", response)
+
+    def test_list_etag_follows_filters_and_writes(self):
+        stale = '"stale"'
+        etag = self.client.get("/api/employees/", HTTP_IF_NONE_MATCH=stale)["ETag"]
+        filtered = self.client.get(
+            "/api/employees/?first_name__icontains=jo", HTTP_IF_NONE_MATCH=stale
+        )
+        self.assertNotEqual(filtered["ETag"], etag)
+
+        self.jane.delete()
+        response = self.client.get("/api/employees/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_ignores_if_modified_since(self):
+        last_modified = self.client.get(
+            "/api/employees/", HTTP_IF_NONE_MATCH='"stale"'
+        )["Last-Modified"]
+        self.jane.delete()
+        response = self.client.get(
+            "/api/employees/", HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+
+    def test_detail_not_modified(self):
+        response = self.client.get(self.url)
+        etag, last_modified = response["ETag"], response["Last-Modified"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.skill.delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["skills"], [])
+
+    def test_detail_modified_by_skill_delete(self):
+        past = timezone.now() - datetime.timedelta(days=1)
+        Employee.objects.filter(pk=self.john.pk).update(updated_at=past)
+        Skill.objects.filter(pk=self.skill.pk).update(updated_at=past)
+        last_modified = self.client.get(self.url)["Last-Modified"]
+
+        # deleting a skill moves the updated_at of its employee
+        self.skill.delete()
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_missing_detail(self):
+        response = self.client.get("/api/employees/ZZ0000/", HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_update_if_match(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.patch(
+            self.url, {"first_name": "Johnny"}, format="json", HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(self.client.get(self.url)["ETag"], response["ETag"])
+
+        # a second edit based on the first representation is refused
+        response = self.client.patch(
+            self.url, {"first_name": "Jack"}, format="json", HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.john.refresh_from_db()
+        self.assertEqual(self.john.first_name, "Johnny")
+
+    def test_etag_does_not_depend_on_the_url(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.assertEqual(self.client.get(f"{self.url}?fields=id,email")["ETag"], etag)
+        self.assertEqual(
+            self.client.get(self.url, HTTP_IF_NONE_MATCH='"stale"')["ETag"], etag
+        )
+        response = self.client.patch(
+            f"{self.url}?fields=id", {"first_name": "Johnny"}, HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_unconditional_detail_skips_validators(self):
+        # the employee and its skills
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertIn("ETag", response)
+
+        caches["employees"].clear()
+        # only updated_at is read to answer a matching ETag
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_delete_if_unmodified_since(self):
+        past = timezone.now() - datetime.timedelta(days=1)
+        response = self.client.delete(
+            self.url, HTTP_IF_UNMODIFIED_SINCE=http_date(past.timestamp())
+        )
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_skill_validators(self):
+        url = f"/api/skills/{self.skill.id}/"
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.delete(url, HTTP_IF_MATCH='"stale"')
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertTrue(Skill.objects.filter(pk=self.skill.pk).exists())
@@ -0,0 +1,125 @@
+import os
+import tempfile
+import threading
+from unittest import skipUnless
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, connections, transaction
+from django.test import SimpleTestCase, TransactionTestCase
+from employees.models import Employee
+
+
+def run_writers(target, count):
+    errors = []
+
+    def run(index):
+        try:
+            target(index)
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+@skipUnless(
+    settings.DATABASES["default"]["ENGINE"] == "backend.db.sqlite3",
+    "the SQLite profile is not in use",
+)
+class SQLiteProfileTest(SimpleTestCase):
+    """Parallel writers on a file database opened with the SQLite profile."""
+
+    alias = "sqlite_profile"
+    writers = 8
+    increments = 25
+
+    def setUp(self):
+        handle, path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(handle)
+        self.addCleanup(self.remove, path)
+        config = {**settings.DATABASES["default"], "NAME": path}
+        config = connections.configure_settings({"default": {}, self.alias: config})
+        connections.settings[self.alias] = config[self.alias]
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE counter (id INTEGER PRIMARY KEY, value INTEGER)"
+            )
+            cursor.execute("INSERT INTO counter VALUES (1, 0)")
+
+    def remove(self, path):
+        connections[self.alias].close()
+        del connections[self.alias]
+        del connections.settings[self.alias]
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    def test_pragmas(self):
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            self.assertEqual(cursor.fetchone(), ("wal",))
+            cursor.execute("PRAGMA synchronous")
+            # NORMAL
+            self.assertEqual(cursor.fetchone(), (1,))
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertGreater(cursor.fetchone()[0], 0)
+
+    def test_invalid_transaction_mode(self):
+        options = connections[self.alias].settings_dict["OPTIONS"]
+        self.addCleanup(
+            options.__setitem__, "transaction_mode", options["transaction_mode"]
+        )
+        options["transaction_mode"] = "CONCURRENT"
+        connections[self.alias].close()
+        with self.assertRaises(ImproperlyConfigured):
+            connections[self.alias].ensure_connection()
+
+    def test_parallel_writers(self):
+        def increment(index):
+            for _ in range(self.increments):
+                # a read then a write in one transaction, which fails with
+                # "database is locked" under DEFERRED transactions
+                with transaction.atomic(using=self.alias):
+                    with connections[self.alias].cursor() as cursor:
+                        cursor.execute("SELECT value FROM counter WHERE id = 1")
+                        value = cursor.fetchone()[0]
+                        cursor.execute(
+                            "UPDATE counter SET value = %s WHERE id = 1", [value + 1]
+                        )
+
+        self.assertEqual(run_writers(increment, self.writers), [])
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute("SELECT value FROM counter WHERE id = 1")
+            self.assertEqual(cursor.fetchone(), (self.writers * self.increments,))
+
+
+@skipUnless(connection.vendor == "postgresql", "the PostgreSQL profile is not in use")
+class PostgreSQLProfileTest(TransactionTestCase):
+    """Parallel writers creating employees through the ORM with the PostgreSQL profile."""
+
+    writers = 8
+    creates = 10
+
+    def test_parallel_writers(self):
+        def create(index):
+            for i in range(self.creates):
+                Employee.objects.create(
+                    first_name="John",
+                    last_name="Doe",
+                    email=f"john.doe{index}.{i}@example.com",
+                    date_of_birth="1990-01-01",
+                )
+
+        self.assertEqual(run_writers(create, self.writers), [])
+        self.assertEqual(Employee.objects.count(), self.writers * self.creates)
+
+    def test_persistent_connections(self):
+        self.assertGreater(connection.settings_dict["CONN_MAX_AGE"], 0)
+        self.assertTrue(connection.settings_dict["CONN_HEALTH_CHECKS"])
@@ -0,0 +1,203 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+from rest_framework.test import APITestCase
+from rest_framework import status
+from employees.emails import EmailBloomFilter, email_filter
+from employees.models import Employee, id_allocator
+from employees.tests.utils import ClearCachesMixin, create_employee
+
+
+class EmailBloomFilterTest(TestCase):
+    def test_no_false_negatives(self):
+        emails = [f"john.doe{i}@example.com" for i in range(500)]
+        Employee.objects.bulk_create(
+            Employee(
+                id=f"AA{i:04}",
+                first_name="John",
+                last_name="Doe",
+                email=email,
+                date_of_birth="1990-01-01",
+            )
+            for i, email in enumerate(emails)
+        )
+        bloom = EmailBloomFilter()
+        with self.assertNumQueries(2):
+            self.assertTrue(all(bloom.might_contain(email) for email in emails))
+        self.assertTrue(bloom.might_contain("JOHN.DOE1@example.com "))
+        false_positives = sum(
+            bloom.might_contain(f"jane{i}@example.com") for i in range(1000)
+        )
+        self.assertLess(false_positives, 50)
+
+    def test_add_and_rebuild(self):
+        bloom = EmailBloomFilter()
+        bloom.add("ignored@example.com")
+        self.assertFalse(bloom.might_contain("john@example.com"))
+        bloom.add("john@example.com")
+        self.assertTrue(bloom.might_contain("john@example.com"))
+
+        bloom.max_age = 0
+        self.assertFalse(bloom.is_ready())
+        with self.assertNumQueries(2):
+            bloom.might_contain("john@example.com")
+
+
+class CheckEmailTestCase(ClearCachesMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        create_employee(email="John.Doe@example.com")
+
+    def check(self, email, method="get"):
+        response = getattr(self.client, method)(f"/api/check-email/{email}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["exists"]
+
+    def test_get_and_post(self):
+        self.assertTrue(self.check("John.Doe@example.com"))
+        self.assertTrue(self.check("John.Doe@example.com", method="post"))
+        self.assertFalse(self.check("jane@example.com"))
+
+    def test_case_insensitive(self):
+        self.assertTrue(self.check("john.doe@EXAMPLE.com"))
+
+    def test_not_taken_without_query(self):
+        self.check("jane@example.com")
+        with self.assertNumQueries(0):
+            self.assertFalse(self.check("jim@example.com"))
+        # a taken email is confirmed in the database
+        with self.assertNumQueries(1):
+            self.assertTrue(self.check("john.doe@example.com"))
+
+    def test_follows_writes(self):
+        self.assertFalse(self.check("jane@example.com"))
+        create_employee(email="jane@example.com")
+        self.assertTrue(self.check("jane@example.com"))
+
+        row = {
+            "first_name": "Jim",
+            "last_name": "Doe",
+            "email": "jim@example.com",
+            "date_of_birth": "1990-01-01",
+            "contact_number": "1234567890",
+            "street_address": "123 Main Street",
+            "city": "New York",
+            "postcode": "1234",
+            "country": "US",
+        }
+        self.assertFalse(self.check("jim@example.com"))
+        response = self.client.post("/api/employees/bulk/", [row], format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(self.check("jim@example.com"))
+
+    def test_deleted_email(self):
+        self.check("jane@example.com")
+        Employee.objects.all().delete()
+        self.assertTrue(email_filter.is_ready())
+        self.assertFalse(self.check("john.doe@example.com"))
+
+    async def test_async(self):
+        response = await self.async_client.get(
+            "/api/async/check-email/JOHN.DOE@example.com/"
+        )
+        self.assertEqual(response.json(), {"exists": True})
+
+
+class UniqueEmailTestCase(ClearCachesMixin, APITestCase):
+    url = "/api/employees/"
+
+    def setUp(self):
+        super().setUp()
+        self.john = create_employee(email="John.Doe@example.com")
+        self.row = {
+            "first_name": "Jane",
+            "last_name": "Doe",
+            "contact_number": "1234567890",
+            "street_address": "123 Main Street",
+            "city": "New York",
+            "postcode": "1234",
+            "country": "US",
+            "email": "jane@example.com",
+            "date_of_birth": "1990-01-01",
+        }
+
+    def test_constraint_ignores_case(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            create_employee(email="john.doe@EXAMPLE.com")
+
+    def test_create_conflict(self):
+        self.row["email"] = "JOHN.DOE@example.com"
+        response = self.client.post(self.url, self.row, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"email": ["Email already exists"]})
+        self.assertEqual(Employee.objects.count(), 1)
+
+    def test_create_without_email_query(self):
+        # reserve a fresh block so the create does not allocate one
+        id_allocator.reset()
+        id_allocator.allocate()
+        # savepoint, insert, release and the skills of the response; the id
+        # comes from an allocated block and no email lookup is made
+        with self.assertNumQueries(4):
+            response = self.client.post(self.url, self.row, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_update_conflict(self):
+        jane = create_employee(email="jane@example.com")
+        self.row["email"] = "john.doe@example.com"
+        response = self.client.put(f"{self.url}{jane.id}/", self.row, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data,
+            {"email": ["Email already exists and belongs to another user"]},
+        )
+        # keeping its own email is not a conflict
+        self.row["email"] = "JANE@example.com"
+        response = self.client.put(f"{self.url}{jane.id}/", self.row, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_bulk_conflict_ignores_case(self):
+        self.row["email"] = "john.doe@example.com"
+        response = self.client.post(f"{self.url}bulk/", [self.row], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0]["email"], ["Email already exists"])
+
+
+class DedupeEmployeeEmailsCommandTest(TestCase):
+    def setUp(self):
+        # duplicates predate the constraint; dropping its index is rolled back
+        # with the test transaction
+        with connection.cursor() as cursor:
+            cursor.execute("DROP INDEX employee_email_lower_unique")
+        self.old = create_employee(email="john@example.com")
+        self.new = create_employee(email="John@Example.com")
+        self.other = create_employee(email="jane@example.com")
+
+    def run_command(self, *args):
+        stdout = StringIO()
+        call_command("dedupe_employee_emails", *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_dry_run(self):
+        with self.assertRaisesMessage(CommandError, "1 employees share the email"):
+            self.run_command()
+        self.assertEqual(Employee.objects.count(), 3)
+
+    def test_apply(self):
+        output = self.run_command("--apply")
+        self.assertIn(
+            f"{self.old.id} john@example.com: duplicate of {self.new.id}", output
+        )
+        self.old.refresh_from_db()
+        self.assertEqual(self.old.email, f"john+dup-{self.old.id.lower()}@example.com")
+        self.assertEqual(self.run_command(), "No duplicate emails\n")
+
+    def test_delete(self):
+        self.run_command("--delete")
+        self.assertEqual(
+            set(Employee.objects.values_list("id", flat=True)),
+            {self.new.id, self.other.id},
+        )
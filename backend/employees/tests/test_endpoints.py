@@ -3,10 +3,23 @@ from rest_framework import status
 from datetime import date
 from employees.models import Employee, Skill
 from employees.serializers import EmployeeSerializer, SkillSerializer
+from employees.tests.utils import ClearCachesMixin, QueryBudgetMixin
 
 
-class EmployeeAPITestCase(APITestCase):
+class EmployeeAPITestCase(QueryBudgetMixin, ClearCachesMixin, APITestCase):
+    query_budgets = {
+        # skill names, employees and their skills
+        "GET employees-list": 3,
+        # with the savepoints and the first reservation of an id block, 4 after it
+        "POST employees-list": 14,
+        "GET employees-detail": 2,
+        # skills before and after the write
+        "PUT employees-detail": 6,
+        "DELETE employees-detail": 4,
+    }
+
     def setUp(self):
+        super().setUp()
 
         self.employee_data = {
             "first_name": "John",
@@ -350,8 +363,17 @@ class EmployeeAPITestCase(APITestCase):
         self.assertEqual(len(response.data), 2)
 
 
-class SkillTestCase(APITestCase):
+class SkillTestCase(QueryBudgetMixin, ClearCachesMixin, APITestCase):
+    query_budgets = {
+        "GET skill-list": 1,
+        "POST skill-list": 5,
+        "GET skill-detail": 1,
+        "PUT skill-detail": 6,
+        "GET skill-names": 1,
+    }
+
     def setUp(self):
+        super().setUp()
         self.employee = Employee.objects.create(
             first_name="John",
             last_name="Doe",
@@ -429,3 +451,29 @@ class SkillTestCase(APITestCase):
         self.assertEqual(Skill.objects.count(), 2)
         self.assertEqual(Skill.objects.last().name, "Ruby")
         self.assertEqual(Skill.objects.last().yrs_exp, 3)
+
+    def test_skill_names(self):
+        other = Employee.objects.create(
+            first_name="Jane",
+            last_name="Doe",
+            email="jane.doe@example.com",
+            date_of_birth="1990-01-01",
+        )
+        Skill.objects.create(
+            name="Python", yrs_exp=2, seniority="Junior", employee=other
+        )
+        url = "/api/skills/names/"
+        # one grouped query, then the cached response
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            [{"name": "JavaScript", "count": 1}, {"name": "Python", "count": 2}],
+        )
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+        self.skill2.delete()
+        response = self.client.get(url)
+        self.assertEqual(response.data, [{"name": "Python", "count": 2}])
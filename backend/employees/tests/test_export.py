@@ -0,0 +1,63 @@
+import csv
+import io
+import json
+from unittest import mock
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from employees.models import Employee, Skill
+from employees.views import EmployeeListView
+from employees.tests.utils import ClearCachesMixin
+
+
+class EmployeeExportTestCase(ClearCachesMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(5):
+            employee = Employee.objects.create(
+                first_name=f"John {i}",
+                last_name="Doe" if i % 2 else "Smith",
+                email=f"john.doe{i}@example.com",
+                date_of_birth="1990-01-01",
+            )
+            Skill.objects.create(
+                name="Python", yrs_exp=i, seniority="Senior", employee=employee
+            )
+
+    def export(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_export_csv(self):
+        response, content = self.export("/api/employees/export/")
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["first_name"], "John 4")
+        skills = json.loads(rows[0]["skills"])
+        self.assertEqual(skills[0]["name"], "Python")
+        self.assertEqual(skills[0]["yrs_exp"], 4)
+
+    def test_export_ndjson_honours_filters(self):
+        response, content = self.export(
+            "/api/employees/export/?output=ndjson&search=Smith"
+        )
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual({row["last_name"] for row in rows}, {"Smith"})
+        self.assertEqual(len(rows[0]["skills"]), 1)
+
+    def test_export_prefetches_skills_per_chunk(self):
+        with mock.patch.object(EmployeeListView, "export_chunk_size", 2):
+            response = self.client.get("/api/employees/export/?output=ndjson")
+            # one employee query plus one skills query for each chunk of two
+            with self.assertNumQueries(4):
+                content = b"".join(response.streaming_content)
+        self.assertEqual(len(content.splitlines()), 5)
+
+    def test_export_invalid_output(self):
+        response = self.client.get("/api/employees/export/?output=xml")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,83 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from employees.models import Employee, Skill
+from employees.tests.utils import ClearCachesMixin
+
+
+class SparseFieldsTestCase(ClearCachesMixin, APITestCase):
+    url = "/api/employees/"
+
+    def setUp(self):
+        super().setUp()
+        for first_name in ("John", "Jane", "Jim"):
+            employee = Employee.objects.create(
+                first_name=first_name,
+                last_name="Doe",
+                email=f"{first_name.lower()}@example.com",
+                date_of_birth="1990-01-01",
+            )
+            Skill.objects.create(
+                name="Python", yrs_exp=5, seniority="Senior", employee=employee
+            )
+        self.employee = Employee.objects.get(first_name="John")
+
+    def test_fields(self):
+        response = self.client.get(f"{self.url}?fields=first_name,email")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 3)
+        for row in response.data:
+            self.assertEqual(list(row), ["first_name", "email"])
+
+    def test_skills_not_fetched(self):
+        # employees, no skills query
+        with self.assertNumQueries(1):
+            response = self.client.get(f"{self.url}?fields=id,first_name")
+        self.assertNotIn("skills", response.data[0])
+
+    def test_expand(self):
+        response = self.client.get(f"{self.url}?fields=id&expand=skills")
+        self.assertEqual(list(response.data[0]), ["id", "skills"])
+        self.assertEqual(response.data[0]["skills"][0]["name"], "Python")
+
+    def test_full_representation_by_default(self):
+        full = self.client.get(self.url).data
+        self.assertIn("skills", full[0])
+        self.assertEqual(self.client.get(f"{self.url}?expand=skills").data, full)
+
+    def test_unknown_fields(self):
+        response = self.client.get(f"{self.url}?fields=first_name,salary")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["fields"], ["Unknown fields: salary"])
+        response = self.client.get(f"{self.url}?fields=id&expand=email")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("expand", response.data)
+
+    def test_paginated_without_ordering_fields(self):
+        first = self.client.get(f"{self.url}?fields=first_name&page_size=2").data
+        second = self.client.get(first["next"]).data
+        self.assertEqual(list(first["results"][0]), ["first_name"])
+        names = [row["first_name"] for row in first["results"] + second["results"]]
+        self.assertEqual(sorted(names), ["Jane", "Jim", "John"])
+
+    def test_retrieve(self):
+        response = self.client.get(
+            f"{self.url}{self.employee.id}/?fields=last_name&expand=skills"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data), ["last_name", "skills"])
+
+    def test_etag_per_fieldset(self):
+        full = self.client.get(self.url, HTTP_IF_NONE_MATCH='"stale"')
+        sparse = self.client.get(
+            f"{self.url}?fields=first_name", HTTP_IF_NONE_MATCH='"stale"'
+        )
+        self.assertNotEqual(full["ETag"], sparse["ETag"])
+
+    def test_writes_use_full_serializer(self):
+        response = self.client.patch(
+            f"{self.url}{self.employee.id}/?fields=first_name",
+            {"city": "Paris"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("skills", response.data)
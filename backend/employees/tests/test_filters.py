@@ -0,0 +1,55 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from employees.models import Skill
+from employees.skill_names import get_skill_names
+from employees.tests.utils import ClearCachesMixin, create_employee
+
+
+class SkillsFilterTestCase(ClearCachesMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.both = create_employee(
+            "John", skills=[("Python", 2, "Mid"), ("JavaScript", 2, "Mid")]
+        )
+        self.python = create_employee("Jane", skills=[("Python", 2, "Mid")])
+        self.other = create_employee("Bob", skills=[("Go", 2, "Mid")])
+
+    def filter(self, **params):
+        response = self.client.get("/api/employees/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [employee["id"] for employee in response.data]
+
+    def test_any_of_does_not_repeat_employees(self):
+        ids = self.filter(skills=["Python", "JavaScript"])
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(set(ids), {self.both.id, self.python.id})
+
+    def test_all_of(self):
+        ids = self.filter(skills=["Python", "JavaScript"], skills_match="all")
+        self.assertEqual(ids, [self.both.id])
+        ids = self.filter(skills=["Python", "Python"], skills_match="all")
+        self.assertEqual(set(ids), {self.both.id, self.python.id})
+
+    def test_invalid_skills_match(self):
+        response = self.client.get(
+            "/api/employees/", {"skills": "Python", "skills_match": "some"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_names_validated_from_cache(self):
+        get_skill_names()
+        # the filtered employees and their prefetched skills
+        with self.assertNumQueries(2):
+            self.client.get("/api/employees/", {"skills": "Python"})
+
+    def test_new_skill_names_accepted(self):
+        get_skill_names()
+        Skill.objects.create(
+            name="Rust", yrs_exp=1, seniority="Junior", employee=self.other
+        )
+        self.assertEqual(self.filter(skills="Rust"), [self.other.id])
+        self.assertIn("Rust", get_skill_names())
+
+        Skill.objects.filter(name="Rust").delete()
+        response = self.client.get("/api/employees/", {"skills": "Rust"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,139 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from employees.models import Employee, Skill
+from employees.serializers import EmployeeListSerializer
+
+
+class ImportEmployeesCommandTest(TestCase):
+    def row(self, i, **kwargs):
+        return {
+            "first_name": f"John {i}",
+            "last_name": "Doe",
+            "contact_number": "1234567890",
+            "street_address": "123 Main Street",
+            "city": "New York",
+            "postcode": "1234",
+            "country": "US",
+            "email": f"john.doe{i}@example.com",
+            "date_of_birth": "1990-01-01",
+            "skills": [{"name": "Python", "yrs_exp": i, "seniority": "Senior"}],
+            **kwargs,
+        }
+
+    def run_import(self, content, suffix, *args):
+        handle, path = tempfile.mkstemp(suffix=suffix)
+        self.addCleanup(os.remove, path)
+        with os.fdopen(handle, "w") as source:
+            source.write(content)
+        stdout, stderr = StringIO(), StringIO()
+        call_command("import_employees", path, *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_import_ndjson_and_upsert(self):
+        content = "\n".join(json.dumps(self.row(i)) for i in range(5))
+        stdout, stderr = self.run_import(content, ".ndjson", "--batch-size", "2")
+        self.assertIn("5 created, 0 updated, 0 rejected", stdout)
+        self.assertIn("rows/sec", stdout)
+        self.assertEqual(Employee.objects.count(), 5)
+        self.assertEqual(Skill.objects.count(), 5)
+
+        # the same emails update the existing employees and their skills
+        rows = [
+            self.row(
+                0,
+                first_name="Jane",
+                skills=[
+                    {"name": "Python", "yrs_exp": 9, "seniority": "Lead"},
+                    {"name": "Go", "yrs_exp": 1, "seniority": "Junior"},
+                ],
+            )
+        ]
+        content = "\n".join(json.dumps(row) for row in rows)
+        stdout, stderr = self.run_import(content, ".ndjson")
+        self.assertIn("0 created, 1 updated, 0 rejected", stdout)
+        employee = Employee.objects.get(email="john.doe0@example.com")
+        self.assertEqual(employee.first_name, "Jane")
+        self.assertEqual(
+            list(employee.skills.values_list("name", "yrs_exp", "seniority")),
+            [("Go", 1, "Junior"), ("Python", 9, "Lead")],
+        )
+
+    def test_import_csv_reports_rejected_rows(self):
+        header = "first_name,last_name,email,date_of_birth,contact_number,street_address,city,postcode,country,skills"
+        lines = [
+            header,
+            'Ann,Lee,ann@example.com,1990-01-01,1234567890,1 Road,Paris,1234,FR,"[{""name"": ""Python"", ""yrs_exp"": 3, ""seniority"": ""Mid""}]"',
+            "Bob,Lee,bob@example.com,1990-01-01,1234567890,1 Road,Paris,123,FR,",
+            "Cid,Lee,ann@example.com,1990-01-01,1234567890,1 Road,Paris,1234,FR,",
+        ]
+        stdout, stderr = self.run_import("\n".join(lines) + "\n", ".csv")
+        self.assertIn("1 created, 0 updated, 2 rejected", stdout)
+        self.assertIn("Line 3", stderr)
+        self.assertIn("postcode", stderr)
+        self.assertIn("Line 4", stderr)
+        self.assertEqual(Employee.objects.get().skills.get().name, "Python")
+
+    def test_import_batch_query_count(self):
+        content = "\n".join(json.dumps(self.row(i)) for i in range(50))
+        self.run_import(content, ".ndjson")
+        content = "\n".join(
+            json.dumps(self.row(i, first_name="Jane")) for i in range(50)
+        )
+        # emails, matched employees, one UPDATE for the employees and one SELECT
+        # for their skills, plus two savepoint pairs
+        with self.assertNumQueries(8):
+            self.run_import(content, ".ndjson")
+
+    def test_import_export_round_trip(self):
+        # older employees have no contact number nor address
+        employee = Employee.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john.doe@example.com",
+            date_of_birth="1990-01-01",
+        )
+        Skill.objects.create(
+            name="Python", yrs_exp=3, seniority="Senior", employee=employee
+        )
+        for output, suffix in (("csv", ".csv"), ("ndjson", ".ndjson")):
+            response = self.client.get(f"/api/employees/export/?output={output}")
+            content = b"".join(response.streaming_content).decode()
+            stdout, stderr = self.run_import(content, suffix)
+            self.assertIn("0 created, 1 updated, 0 rejected", stdout)
+        self.assertEqual(Employee.objects.get().skills.get().yrs_exp, 3)
+
+    def test_import_rejects_batch_on_concurrent_email(self):
+        validate_rows = EmployeeListSerializer.validate_rows
+
+        def validate_then_race(serializer, *args, **kwargs):
+            result = validate_rows(serializer, *args, **kwargs)
+            # another writer takes an email of the batch after the check
+            Employee.objects.create(
+                first_name="Jane",
+                last_name="Doe",
+                email="JOHN.DOE1@example.com",
+                date_of_birth="1990-01-01",
+            )
+            return result
+
+        content = "\n".join(json.dumps(self.row(i)) for i in range(3))
+        with mock.patch.object(
+            EmployeeListSerializer, "validate_rows", validate_then_race
+        ):
+            stdout, stderr = self.run_import(content, ".ndjson")
+        self.assertIn("0 created, 0 updated, 3 rejected", stdout)
+        self.assertIn("Email already exists", stderr)
+        self.assertEqual(Employee.objects.get().first_name, "Jane")
+
+    def test_unwritable_rejects_file(self):
+        with self.assertRaises(CommandError):
+            self.run_import(
+                json.dumps(self.row(0)), ".ndjson", "--rejects", "/missing/rejects"
+            )
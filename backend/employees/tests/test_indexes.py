@@ -0,0 +1,164 @@
+import datetime
+import re
+from unittest import skipUnless
+
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+from employees.filters import EmployeeFilter, SkillFilter
+from employees.models import Employee, Skill
+
+
+class EmployeeFilterIndexTest(TestCase):
+    """
+    Checks with EXPLAIN that every EmployeeFilter path is served by an index.
+
+    The table is filled with a few thousand rows and analyzed, so the planner
+    decides on realistic statistics rather than on an empty table.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        employees = [
+            Employee(
+                id=f"AA{i:04d}",
+                first_name=f"First {i}",
+                last_name=f"Last {i}",
+                email=f"employee{i}@example.com",
+                date_of_birth=datetime.date(1960, 1, 1)
+                + datetime.timedelta(days=i * 7),
+            )
+            for i in range(3000)
+        ]
+        Employee.objects.bulk_create(employees, batch_size=500)
+        Skill.objects.bulk_create(
+            [
+                Skill(
+                    name=f"Skill {(i + j) % 40}",
+                    employee=employee,
+                    yrs_exp=j,
+                    seniority="Mid",
+                )
+                for i, employee in enumerate(employees)
+                for j in range(5)
+            ],
+            batch_size=500,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def filtered(self, **params):
+        filterset = EmployeeFilter(params, queryset=Employee.objects.all())
+        self.assertTrue(filterset.is_valid(), filterset.errors)
+        return filterset.qs
+
+    def assertUsesIndex(self, queryset, index):
+        plan = queryset.explain()
+        if connection.vendor == "sqlite":
+            pattern = rf"USING (COVERING )?INDEX {index}\b"
+        else:
+            pattern = rf"Index (Only )?Scan.* on {index}\b"
+        self.assertRegex(plan, re.compile(pattern), plan)
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite query plans")
+    def test_default_ordering_uses_index(self):
+        self.assertUsesIndex(Employee.objects.all(), "employee_updated_id_idx")
+
+    def test_date_of_birth_filters_use_index(self):
+        self.assertUsesIndex(
+            self.filtered(date_of_birth="1990-01-01"), "employee_dob_idx"
+        )
+        self.assertUsesIndex(
+            self.filtered(
+                start_date_of_birth="1980-01-01", end_date_of_birth="1980-06-01"
+            ),
+            "employee_dob_idx",
+        )
+
+    def test_open_date_of_birth_ranges_can_use_index(self):
+        # Without STAT4 histograms SQLite cannot estimate how selective an open
+        # range is and may prefer walking the ordering index to skip the sort,
+        # so the WHERE clause is checked on its own here.
+        self.assertUsesIndex(
+            self.filtered(start_date_of_birth="2017-01-01").order_by(),
+            "employee_dob_idx",
+        )
+        self.assertUsesIndex(
+            self.filtered(end_date_of_birth="1961-01-01").order_by(),
+            "employee_dob_idx",
+        )
+
+    def test_skills_filter_uses_index(self):
+        index = Skill._meta.db_table + "_name_employee_id_"
+        plan = self.filtered(skills=["Skill 3"]).explain()
+        self.assertIn(index, plan)
+
+
+class SkillFilterIndexTest(TestCase):
+    """Checks with EXPLAIN that the SkillFilter paths and the per-employee list are served by an index."""
+
+    @classmethod
+    def setUpTestData(cls):
+        employees = [
+            Employee(
+                id=f"AA{i:04d}",
+                first_name=f"First {i}",
+                last_name=f"Last {i}",
+                email=f"employee{i}@example.com",
+                date_of_birth=datetime.date(1990, 1, 1),
+            )
+            for i in range(1000)
+        ]
+        Employee.objects.bulk_create(employees, batch_size=500)
+        Skill.objects.bulk_create(
+            [
+                Skill(
+                    name=f"Skill {(i + j) % 40}",
+                    employee=employee,
+                    yrs_exp=(i + j) % 30,
+                    seniority=("Junior", "Mid", "Senior")[(i + j) % 3],
+                )
+                for i, employee in enumerate(employees)
+                for j in range(5)
+            ],
+            batch_size=500,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def filtered(self, **params):
+        filterset = SkillFilter(params, queryset=Skill.objects.all())
+        self.assertTrue(filterset.is_valid(), filterset.errors)
+        return filterset.qs
+
+    assertUsesIndex = EmployeeFilterIndexTest.assertUsesIndex
+
+    def test_employee_filter_uses_index(self):
+        self.assertUsesIndex(
+            self.filtered(employee="AA0042").order_by("name", "id"),
+            "skill_employee_name_idx",
+        )
+
+    def test_seniority_filter_uses_index(self):
+        self.assertUsesIndex(
+            self.filtered(seniority="Senior").order_by("name", "id"),
+            "skill_seniority_name_idx",
+        )
+
+    def test_yrs_exp_filter_uses_index(self):
+        self.assertUsesIndex(
+            self.filtered(yrs_exp__gte=28).order_by(), "skill_yrs_exp_idx"
+        )
+
+    def test_keyset_page_uses_index(self):
+        skill = Skill.objects.filter(name="Skill 20").order_by("id")[3]
+        page = Skill.objects.filter(
+            Q(name__gt=skill.name) | Q(name=skill.name, id__gt=skill.id)
+        ).order_by("name", "id")[:20]
+        self.assertUsesIndex(page, "skill_name_id_idx")
+        self.assertNotIn("TEMP B-TREE", page.explain())
+
+    def test_name_filter_uses_index(self):
+        self.assertUsesIndex(
+            self.filtered(name="Skill 3").order_by("name", "id"), "skill_name_id_idx"
+        )
@@ -0,0 +1,150 @@
+import re
+import threading
+
+from asgiref.sync import iscoroutinefunction
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from employees.metrics import (
+    MetricsRegistry,
+    RequestMetrics,
+    RollingQuantiles,
+    registry,
+)
+from employees.middleware import RequestMetricsMiddleware
+from employees.models import Employee
+from employees.tests.utils import ClearCachesMixin
+
+
+class RequestMetricsTestCase(ClearCachesMixin, APITestCase):
+    url = "/api/_metrics"
+
+    def setUp(self):
+        super().setUp()
+        registry.reset()
+        self.employee = Employee.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john.doe@example.com",
+            date_of_birth="1990-01-01",
+        )
+
+    def sample(self, text, name, view, suffix="_count"):
+        match = re.search(rf'^{name}{suffix}{{view="{view}"}} (\S+)$', text, re.M)
+        self.assertIsNotNone(match, text)
+        return float(match.group(1))
+
+    def test_server_timing(self):
+        response = self.client.get("/api/employees/")
+        timing = response["Server-Timing"]
+        # the employees and their prefetched skills
+        self.assertIn('db;desc="2 queries"', timing)
+        self.assertRegex(timing, r"serialize;dur=\d+\.\d+")
+        self.assertRegex(timing, r"render;dur=\d+\.\d+")
+        self.assertRegex(timing, r"total;dur=\d+\.\d+")
+
+    def test_metrics_per_view(self):
+        for _ in range(3):
+            self.client.get("/api/employees/")
+        self.client.get(f"/api/employees/{self.employee.id}/")
+        self.client.get("/api/skills/")
+        self.client.get(f"/api/check-email/{self.employee.email}/")
+        self.client.get("/api/missing/")
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(
+            response["Content-Type"].startswith("text/plain; version=0.0.4")
+        )
+        text = response.content.decode()
+        self.assertIn("# TYPE api_request_duration_seconds summary", text)
+        counts = {
+            view: self.sample(text, "api_request_duration_seconds", view)
+            for view in [
+                "employees-list",
+                "employees-detail",
+                "skill-list",
+                "check_email_exist",
+            ]
+        }
+        self.assertEqual(
+            counts,
+            {
+                "employees-list": 3,
+                "employees-detail": 1,
+                "skill-list": 1,
+                "check_email_exist": 1,
+            },
+        )
+        # the first list is read from the database, the next two from the cache
+        self.assertEqual(
+            self.sample(text, "api_db_queries", "employees-list", "_sum"), 2
+        )
+        self.assertRegex(
+            text,
+            r'api_response_bytes\{view="employees-list",quantile="0.99"\} \d+',
+        )
+        self.assertNotIn("missing", text)
+        for view in ("employees-list", "employees-detail", "skill-list"):
+            self.assertGreater(
+                self.sample(text, "api_serialize_duration_seconds", view, "_sum"), 0
+            )
+
+    async def test_async_view(self):
+        response = await self.async_client.get("/api/async/employees/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # the employees and their skills, counted from the sync_to_async thread
+        self.assertIn('db;desc="2 queries"', response["Server-Timing"])
+        self.assertIn('view="async-employees-list"', registry.render())
+
+    def test_async_capable(self):
+        async def view(request):
+            return HttpResponse()
+
+        self.assertTrue(iscoroutinefunction(RequestMetricsMiddleware(view)))
+        self.assertFalse(
+            iscoroutinefunction(RequestMetricsMiddleware(lambda request: None))
+        )
+
+    @override_settings(REQUEST_METRICS=False)
+    def test_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            RequestMetricsMiddleware(lambda request: None)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class RollingQuantilesTest(SimpleTestCase):
+    def test_quantiles_over_window(self):
+        quantiles = RollingQuantiles(window=100)
+        for value in range(1, 201):
+            quantiles.observe(value)
+        # the window holds the last 100 values, 101 to 200
+        self.assertEqual(
+            quantiles.quantiles((0.5, 0.95, 0.99)), {0.5: 150, 0.95: 195, 0.99: 199}
+        )
+        self.assertEqual(quantiles.count, 200)
+        self.assertEqual(quantiles.total, sum(range(1, 201)))
+
+    def test_concurrent_observations(self):
+        quantiles = RollingQuantiles(window=10)
+
+        def observe():
+            for _ in range(10000):
+                quantiles.observe(1)
+
+        threads = [threading.Thread(target=observe) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(quantiles.count, 80000)
+        self.assertEqual(quantiles.total, 80000)
+
+    def test_label_escaping(self):
+        metrics = MetricsRegistry(window=10)
+        metrics.observe('a"b\\c', RequestMetrics())
+        self.assertIn('view="a\\"b\\\\c"', metrics.render())
@@ -1,5 +1,7 @@
+from django.db import transaction
 from django.test import TestCase
-from employees.models import Employee, Skill
+from employees.ids import ID_SPACE, IdAllocator, Permutation, format_id, parse_id
+from employees.models import Employee, IdSequence, Skill, id_allocator
 
 
 class EmployeeModelTest(TestCase):
@@ -47,7 +49,7 @@ class EmployeeModelTest(TestCase):
             employee = Employee.objects.create(
                 first_name="John",
                 last_name="Doe",
-                email="YQqFP@example.com",
+                email=f"john.doe{i}@example.com",
                 date_of_birth="1990-01-01",
             )
         self.assertEqual(Employee.objects.count(), 1500)
@@ -107,3 +109,83 @@ class SkillModelTest(TestCase):
             name="Java", yrs_exp=2, seniority="senior", employee=employee
         )
         self.assertEqual(Skill.objects.count(), 2)
+
+
+class IdAllocatorTest(TestCase):
+
+    def test_format_and_parse_id(self):
+        self.assertEqual(format_id(0), "AA0000")
+        self.assertEqual(format_id(ID_SPACE - 1), "ZZ9999")
+        self.assertEqual(parse_id("AB1234"), 11234)
+        self.assertEqual(parse_id(format_id(123456)), 123456)
+
+    def test_permutation_is_a_bijection(self):
+        permutation = Permutation(space=5000)
+        values = [permutation(value) for value in range(5000)]
+        self.assertEqual(sorted(values), list(range(5000)))
+        self.assertNotEqual(values[:10], list(range(10)))
+
+    def test_allocated_ids_are_unique_and_formatted(self):
+        allocator = IdAllocator(IdSequence, Employee, name="test", block_size=10)
+        with self.captureOnCommitCallbacks(execute=True):
+            ids = allocator.allocate(5)
+        ids += allocator.allocate(12)
+        self.assertEqual(len(set(ids)), 17)
+        for value in ids:
+            self.assertRegex(value, r"^[A-Z]{2}\d{4}$")
+        self.assertEqual(IdSequence.objects.get(name="test").next_value, 20)
+
+    def test_allocation_skips_existing_ids(self):
+        allocator = IdAllocator(IdSequence, Employee, name="test", block_size=10)
+        first_block = [format_id(allocator.permutation(value)) for value in range(3)]
+        for value in first_block:
+            Employee.objects.create(
+                id=value,
+                first_name="John",
+                last_name="Doe",
+                email=f"{value}@example.com",
+                date_of_birth="1990-01-01",
+            )
+        ids = allocator.allocate(10)
+        self.assertFalse(set(ids) & set(first_block))
+
+    def test_rolled_back_block_is_not_kept(self):
+        allocator = IdAllocator(IdSequence, Employee, name="test", block_size=10)
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            allocator.allocate()
+            raise RuntimeError
+        # the counter was rolled back, so the block is reserved again elsewhere
+        other = IdAllocator(IdSequence, Employee, name="test", block_size=10)
+        ids = other.allocate(10)
+        self.assertFalse(set(allocator.allocate(10)) & set(ids))
+
+    def test_leftover_is_kept_within_the_transaction(self):
+        allocator = IdAllocator(IdSequence, Employee, name="test", block_size=10)
+        with transaction.atomic():
+            ids = allocator.allocate(3)
+            with self.assertNumQueries(0):
+                ids += allocator.allocate(3)
+        self.assertEqual(len(set(ids)), 6)
+        self.assertEqual(IdSequence.objects.get(name="test").next_value, 10)
+
+    def test_leftover_of_rolled_back_savepoint_is_dropped(self):
+        allocator = IdAllocator(IdSequence, Employee, name="test", block_size=10)
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            first = allocator.allocate()
+            raise RuntimeError
+        # the block is reserved again instead of handing out its rest
+        self.assertEqual(allocator.allocate(), first)
+        self.assertEqual(IdSequence.objects.get(name="test").next_value, 10)
+
+    def test_insert_does_not_probe_for_collisions(self):
+        # reserve a fresh block so the inserts below only run their INSERT
+        id_allocator.reset()
+        id_allocator.allocate()
+        with self.assertNumQueries(5):
+            for i in range(5):
+                Employee.objects.create(
+                    first_name="John",
+                    last_name="Doe",
+                    email=f"john.doe{i}@example.com",
+                    date_of_birth="1990-01-01",
+                )
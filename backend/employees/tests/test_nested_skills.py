@@ -0,0 +1,192 @@
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from employees.models import Employee, Skill, Tombstone
+from employees.skill_sync import sync_skills
+from employees.tests.utils import ClearCachesMixin
+
+
+class NestedSkillsTestCase(ClearCachesMixin, APITestCase):
+    url = "/api/employees/"
+
+    def setUp(self):
+        super().setUp()
+        self.employee = Employee.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john.doe@example.com",
+            date_of_birth="1990-01-01",
+            contact_number="1234567890",
+            street_address="123 Main Street",
+            city="New York",
+            postcode="1234",
+            country="US",
+        )
+        self.python = Skill.objects.create(
+            name="Python", yrs_exp=5, seniority="Senior", employee=self.employee
+        )
+        self.sql = Skill.objects.create(
+            name="SQL", yrs_exp=2, seniority="Junior", employee=self.employee
+        )
+
+    def payload(self, skills, **kwargs):
+        return {
+            "first_name": "Jane",
+            "last_name": "Doe",
+            "contact_number": "1234567890",
+            "street_address": "123 Main Street",
+            "city": "New York",
+            "postcode": "1234",
+            "country": "US",
+            "email": "jane.doe@example.com",
+            "date_of_birth": "1990-01-01",
+            "skills": skills,
+            **kwargs,
+        }
+
+    def detail_url(self):
+        return f"{self.url}{self.employee.id}/"
+
+    def test_create_with_skills(self):
+        skills = [
+            {"name": "Go", "yrs_exp": 3, "seniority": "Senior"},
+            {"name": "Rust", "yrs_exp": 1, "seniority": "Junior"},
+        ]
+        response = self.client.post(self.url, self.payload(skills), format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [(skill["name"], skill["employee"]) for skill in response.data["skills"]],
+            [("Go", response.data["id"]), ("Rust", response.data["id"])],
+        )
+        employee = Employee.objects.get(pk=response.data["id"])
+        self.assertEqual(employee.skill_count, 2)
+        self.assertEqual(employee.max_yrs_exp, 3)
+        self.assertEqual(employee.senior_skills, "|Go|")
+
+    def test_update_diffs_skills(self):
+        skills = [
+            {"name": "Python", "yrs_exp": 6, "seniority": "Senior"},
+            {"name": "Go", "yrs_exp": 1, "seniority": "Junior"},
+        ]
+        response = self.client.put(
+            self.detail_url(),
+            self.payload(skills, email=self.employee.email),
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(skill["name"], skill["yrs_exp"]) for skill in response.data["skills"]],
+            [("Go", 1), ("Python", 6)],
+        )
+        # the existing skill is updated in place and the missing one deleted
+        self.assertEqual(response.data["skills"][1]["id"], self.python.id)
+        self.assertFalse(Skill.objects.filter(pk=self.sql.pk).exists())
+        self.assertTrue(
+            Tombstone.objects.filter(
+                model=Tombstone.SKILL, object_id=str(self.sql.pk)
+            ).exists()
+        )
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.skill_count, 2)
+        self.assertEqual(self.employee.max_yrs_exp, 6)
+        self.assertEqual(
+            response.data["updated_at"],
+            self.employee.updated_at.isoformat().replace("+00:00", "Z"),
+        )
+
+    def test_removed_skills_are_deleted_at_once(self):
+        Skill.objects.bulk_create(
+            Skill(
+                name=f"Skill {i}", yrs_exp=1, seniority="Junior", employee=self.employee
+            )
+            for i in range(17)
+        )
+        skills = [{"name": "Python", "yrs_exp": 5, "seniority": "Senior"}]
+        # the skills, a savepoint around the delete of the removed ones and
+        # their tombstones, and the summary refresh
+        with self.assertNumQueries(8):
+            sync_skills([self.employee], [skills])
+        self.assertEqual(self.employee.skills.count(), 1)
+        self.assertEqual(Tombstone.objects.filter(model=Tombstone.SKILL).count(), 18)
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.skill_count, 1)
+
+    def test_update_round_trips_the_representation(self):
+        data = self.client.get(self.detail_url()).data
+        updated_at = self.python.updated_at
+        response = self.client.put(self.detail_url(), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["skills"], data["skills"])
+        self.python.refresh_from_db()
+        # unchanged skills are not written
+        self.assertEqual(self.python.updated_at, updated_at)
+
+    def test_update_without_skills_keeps_them(self):
+        response = self.client.patch(
+            self.detail_url(), {"first_name": "Jane"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["skills"]), 2)
+        self.assertEqual(self.employee.skills.count(), 2)
+
+    def test_empty_skills_delete_them(self):
+        response = self.client.patch(self.detail_url(), {"skills": []}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["skills"], [])
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.skill_count, 0)
+
+    def test_invalid_skills(self):
+        skills = [
+            {"name": "Go", "yrs_exp": 3, "seniority": "Senior"},
+            {"name": "Go", "yrs_exp": 1, "seniority": "Junior"},
+        ]
+        response = self.client.post(self.url, self.payload(skills), format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["skills"], ["Skill names must be unique"])
+
+        response = self.client.post(
+            self.url, self.payload([{"name": "Go"}]), format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("yrs_exp", response.data["skills"][0])
+        self.assertEqual(Employee.objects.count(), 1)
+
+    def test_partial_update_requires_skill_fields(self):
+        for skill, field in (({"name": "Go"}, "yrs_exp"), ({"yrs_exp": 3}, "name")):
+            response = self.client.patch(
+                self.detail_url(), {"skills": [skill]}, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(
+                response.data["skills"][0][field], ["This field is required."]
+            )
+        self.assertEqual(self.employee.skills.count(), 2)
+
+    def test_update_invalidates_cached_list(self):
+        self.client.get(self.url)
+        skills = [{"name": "Go", "yrs_exp": 1, "seniority": "Junior"}]
+        self.client.patch(self.detail_url(), {"skills": skills}, format="json")
+        response = self.client.get(self.url)
+        self.assertEqual(
+            [skill["name"] for skill in response.data[0]["skills"]], ["Go"]
+        )
+
+    def test_bulk_with_skills(self):
+        rows = [
+            self.payload(
+                [{"name": "Go", "yrs_exp": 2, "seniority": "Junior"}],
+                id=self.employee.id,
+                email=self.employee.email,
+            ),
+            self.payload([{"name": "Rust", "yrs_exp": 4, "seniority": "Senior"}]),
+        ]
+        response = self.client.post(f"{self.url}bulk/", rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [[skill["name"] for skill in row["skills"]] for row in response.data],
+            [["Go"], ["Rust"]],
+        )
+        self.assertEqual(
+            Employee.objects.get(pk=response.data[1]["id"]).senior_skills, "|Rust|"
+        )
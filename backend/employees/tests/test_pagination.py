@@ -0,0 +1,76 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from employees.models import Employee
+from employees.tests.utils import ClearCachesMixin, QueryCountMixin
+
+
+class EmployeeKeysetPaginationTestCase(ClearCachesMixin, QueryCountMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(7):
+            Employee.objects.create(
+                first_name=f"John {i}",
+                last_name="Doe",
+                email=f"john.doe{i}@example.com",
+                date_of_birth="1990-01-01",
+            )
+        # give some rows the same updated_at so the id tie-breaker is exercised
+        Employee.objects.filter(first_name__in=["John 1", "John 2", "John 3"]).update(
+            updated_at=Employee.objects.get(first_name="John 1").updated_at
+        )
+        self.expected = list(
+            Employee.objects.order_by("-updated_at", "-id").values_list("id", flat=True)
+        )
+
+    def test_unpaginated_by_default(self):
+        response = self.client.get("/api/employees/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 7)
+
+    def test_walk_forward_and_back(self):
+        seen = []
+        url = "/api/employees/?page_size=3"
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(response.data)
+            seen.extend(employee["id"] for employee in response.data["results"])
+            url = response.data["next"]
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(len(pages), 3)
+        self.assertIsNone(pages[0]["previous"])
+
+        response = self.client.get(pages[-1]["previous"])
+        self.assertEqual(
+            [employee["id"] for employee in response.data["results"]],
+            self.expected[3:6],
+        )
+        response = self.client.get(response.data["previous"])
+        self.assertEqual(
+            [employee["id"] for employee in response.data["results"]],
+            self.expected[:3],
+        )
+        self.assertIsNone(response.data["previous"])
+
+    def test_page_is_stable_under_concurrent_edits(self):
+        response = self.client.get("/api/employees/?page_size=3")
+        next_url = response.data["next"]
+        # an edit moves a row from the second page to the top of the list
+        moved = Employee.objects.get(id=self.expected[4])
+        moved.first_name = "Jane"
+        moved.save()
+        response = self.client.get(next_url)
+        self.assertEqual(
+            [employee["id"] for employee in response.data["results"]],
+            [self.expected[3], self.expected[5], self.expected[6]],
+        )
+
+    def test_page_query_count(self):
+        response = self.client.get("/api/employees/?page_size=3")
+        # page, prefetched skills
+        self.assertGetQueries(2, response.data["next"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get("/api/employees/?page_size=3&cursor=garbage")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
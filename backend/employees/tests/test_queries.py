@@ -0,0 +1,63 @@
+from django.db.models import Prefetch
+from rest_framework.test import APITestCase
+from rest_framework import status
+from employees.models import Employee, Skill
+from employees.querysets import optimize_queryset
+from employees.serializers import EmployeeSerializer, SkillSerializer
+from employees.tests.utils import ClearCachesMixin, QueryCountMixin
+
+
+class QuerysetOptimizerTestCase(ClearCachesMixin, APITestCase):
+    def test_nested_skills_are_prefetched(self):
+        queryset = optimize_queryset(Employee.objects.all(), EmployeeSerializer)
+        lookups = queryset._prefetch_related_lookups
+        self.assertEqual(len(lookups), 1)
+        self.assertIsInstance(lookups[0], Prefetch)
+        self.assertEqual(lookups[0].prefetch_to, "skills")
+        self.assertEqual(lookups[0].queryset.query.order_by, ())
+        self.assertEqual(lookups[0].queryset.model._meta.ordering, ["name"])
+
+    def test_primary_key_relation_is_not_joined(self):
+        queryset = optimize_queryset(Skill.objects.all(), SkillSerializer)
+        self.assertFalse(queryset.query.select_related)
+        self.assertEqual(queryset._prefetch_related_lookups, ())
+
+
+class EmployeeQueryCountTestCase(ClearCachesMixin, QueryCountMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(5):
+            employee = Employee.objects.create(
+                first_name=f"John {i}",
+                last_name="Doe",
+                email=f"john.doe{i}@example.com",
+                date_of_birth="1990-01-01",
+            )
+            Skill.objects.create(
+                name="Python", yrs_exp=5, seniority="Senior", employee=employee
+            )
+            Skill.objects.create(
+                name="JavaScript", yrs_exp=3, seniority="Mid", employee=employee
+            )
+
+    def test_employee_list_queries(self):
+        # employees, prefetched skills
+        response = self.assertGetQueries(2, "/api/employees/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 5)
+        # the prefetch keeps the Skill.Meta.ordering
+        self.assertEqual(
+            [skill["name"] for skill in response.data[0]["skills"]],
+            ["JavaScript", "Python"],
+        )
+
+    def test_employee_retrieve_queries(self):
+        employee = Employee.objects.first()
+        response = self.assertGetQueries(2, f"/api/employees/{employee.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["skills"]), 2)
+
+    def test_skill_list_queries(self):
+        response = self.assertGetQueries(1, "/api/skills/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 10)
@@ -0,0 +1,106 @@
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APITestCase
+
+from employees.middleware import QueryDetectorMiddleware
+from employees.models import Employee
+from employees.query_detector import QueryDetector, normalize_sql
+from employees.tests.utils import (
+    ClearCachesMixin,
+    QueryBudgetMixin,
+    create_employees,
+)
+
+
+def read_skills_one_by_one():
+    # an N+1: one query for the employees, then one per employee
+    return [list(employee.skills.all()) for employee in Employee.objects.all()]
+
+
+class NormalizeSQLTest(SimpleTestCase):
+    def test_values_are_replaced(self):
+        self.assertEqual(
+            normalize_sql(
+                "SELECT * FROM \"t2\" WHERE a = 'x''y' AND b = 42 AND c IN (%s, %s,%s)"
+                " LIMIT 21"
+            ),
+            'SELECT * FROM "t2" WHERE a = ? AND b = ? AND c IN (...) LIMIT ?',
+        )
+
+    def test_same_shape(self):
+        self.assertEqual(
+            normalize_sql("SELECT id FROM t WHERE id IN (%s)"),
+            normalize_sql("SELECT id FROM t\n WHERE id IN (%s, %s, %s)"),
+        )
+
+
+class QueryDetectorTest(TestCase):
+    def setUp(self):
+        create_employees(3, skills=1)
+
+    def test_repeated_queries(self):
+        with QueryDetector() as detector:
+            read_skills_one_by_one()
+        self.assertEqual(len(detector), 4)
+        self.assertEqual(list(detector.duplicates().values()), [3])
+        self.assertIn("repeated 3 times", detector.report())
+
+        with QueryDetector() as detector:
+            list(Employee.objects.prefetch_related("skills"))
+        self.assertEqual(detector.duplicates(), {})
+
+    def test_transaction_statements_are_not_repeats(self):
+        with QueryDetector() as detector:
+            for _ in range(3):
+                with transaction.atomic():
+                    pass
+        self.assertEqual(detector.duplicates(), {})
+
+    def test_slow_queries(self):
+        with QueryDetector(slow_threshold=0) as detector:
+            Employee.objects.count()
+        self.assertEqual(len(detector.slow()), 1)
+        self.assertIn("slow", detector.report())
+
+    @override_settings(QUERY_DETECTOR=True, QUERY_DETECTOR_DUPLICATES=3)
+    def test_middleware_logs_repeated_queries(self):
+        def view(request):
+            read_skills_one_by_one()
+            return HttpResponse()
+
+        middleware = QueryDetectorMiddleware(view)
+        with self.assertLogs("employees.queries", "WARNING") as logs:
+            middleware(RequestFactory().get("/api/employees/"))
+        self.assertIn("GET /api/employees/", logs.output[0])
+        self.assertIn("repeated 3 times", logs.output[0])
+
+    @override_settings(QUERY_DETECTOR=True, QUERY_DETECTOR_DUPLICATES=3)
+    async def test_middleware_async(self):
+        async def view(request):
+            await sync_to_async(read_skills_one_by_one)()
+            return HttpResponse()
+
+        middleware = QueryDetectorMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        with self.assertLogs("employees.queries", "WARNING") as logs:
+            await middleware(RequestFactory().get("/api/employees/"))
+        self.assertIn("repeated 3 times", logs.output[0])
+
+    def test_middleware_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            QueryDetectorMiddleware(lambda request: None)
+
+
+class QueryBudgetMixinTest(QueryBudgetMixin, ClearCachesMixin, APITestCase):
+    query_budgets = {"GET employees-list": 1}
+
+    def test_over_budget_fails(self):
+        create_employees(3, skills=1)
+        with self.assertRaisesMessage(AssertionError, "over its budget of 1 queries"):
+            self.client.get("/api/employees/")
+
+    def test_unbudgeted_endpoint(self):
+        self.client.get("/api/skills/")
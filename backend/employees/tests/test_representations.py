@@ -0,0 +1,100 @@
+from django.test import TestCase
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from rest_framework import status
+from employees.models import Employee
+from employees.querysets import optimize_queryset
+from employees.representations import UnsupportedSerializer, ValuesRepresentation
+from employees.serializers import EmployeeSerializer, SkillSerializer
+from employees.tests.utils import ClearCachesMixin, create_employees
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+class ValuesRepresentationTest(TestCase):
+    def setUp(self):
+        create_employees(20)
+        Employee.objects.create(
+            first_name="Jane",
+            last_name="Doe",
+            email="jane@example.com",
+            date_of_birth="1990-01-01",
+        )
+
+    def test_same_json_as_serializer(self):
+        for serializer_class in (EmployeeSerializer, SkillSerializer):
+            model = serializer_class.Meta.model
+            queryset = optimize_queryset(model.objects.all(), serializer_class)
+            representation = ValuesRepresentation(serializer_class)
+            self.assertEqual(
+                render(
+                    representation.to_representation(representation.values(queryset))
+                ),
+                render(serializer_class(queryset, many=True).data),
+            )
+
+    def test_queries(self):
+        representation = ValuesRepresentation(EmployeeSerializer)
+        # the employees and the skills of all of them
+        with self.assertNumQueries(2):
+            representation.to_representation(
+                representation.values(Employee.objects.all())
+            )
+
+    def test_unsupported_serializer(self):
+        class NameSerializer(serializers.ModelSerializer):
+            name = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Employee
+                fields = ["id", "name"]
+
+        with self.assertRaises(UnsupportedSerializer):
+            ValuesRepresentation(NameSerializer)
+
+
+class ValuesReadEndpointTestCase(ClearCachesMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        create_employees(5)
+
+    def test_list_and_retrieve(self):
+        queryset = optimize_queryset(Employee.objects.all(), EmployeeSerializer)
+        response = self.client.get("/api/employees/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.content, render(EmployeeSerializer(queryset, many=True).data)
+        )
+
+        employee = queryset.first()
+        response = self.client.get(f"/api/employees/{employee.id}/")
+        self.assertEqual(response.content, render(EmployeeSerializer(employee).data))
+        response = self.client.get("/api/employees/ZZ9999/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_paginated(self):
+        first = self.client.get("/api/employees/?page_size=3").data
+        second = self.client.get(first["next"]).data
+        ids = [row["id"] for row in first["results"] + second["results"]]
+        self.assertEqual(ids, list(Employee.objects.values_list("id", flat=True)))
+
+
+class LargeListRepresentationTest(TestCase):
+    """
+    Checks the .values() representation against the serializer on 1k rows.
+
+    The timings are compared by the benchmark_representations command.
+    """
+
+    def test_1k(self):
+        create_employees(1000)
+        queryset = optimize_queryset(Employee.objects.all(), EmployeeSerializer)
+        representation = ValuesRepresentation(EmployeeSerializer)
+        rows = representation.values(Employee.objects.all())
+        self.assertEqual(
+            render(representation.to_representation(rows)),
+            render(EmployeeSerializer(queryset, many=True).data),
+        )
@@ -0,0 +1,110 @@
+from unittest import skipUnless
+
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from rest_framework.test import APITestCase
+from rest_framework import status
+from employees.models import Employee, Skill
+from employees.search import (
+    EmployeeSearchFilter,
+    PostgresSearchBackend,
+    SQLiteSearchBackend,
+    restore_search_triggers,
+)
+from employees.tests.utils import ClearCachesMixin, create_employee
+
+
+class EmployeeSearchTestCase(ClearCachesMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.john = create_employee("John", "Doe", "john.doe@example.com")
+        self.jane = create_employee("Jane", "Johnson", "jane@example.com")
+        self.bob = create_employee("Bob", "Smith", "bob.smith@corp.com")
+
+    def search(self, term):
+        response = self.client.get("/api/employees/", {"search": term})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [employee["id"] for employee in response.data]
+
+    def test_search_by_prefix(self):
+        self.assertEqual(set(self.search("jo")), {self.john.id, self.jane.id})
+        self.assertEqual(self.search("smi"), [self.bob.id])
+
+    def test_search_all_terms_must_match(self):
+        self.assertEqual(self.search("john doe"), [self.john.id])
+        self.assertEqual(self.search("jane doe"), [])
+
+    def test_search_email_tokens(self):
+        self.assertEqual(self.search("corp"), [self.bob.id])
+        self.assertEqual(self.search("john.doe@example.com"), [self.john.id])
+
+    def test_search_ignores_operators(self):
+        self.assertEqual(self.search('(doe" *'), [self.john.id])
+        self.assertEqual(len(self.search("")), 3)
+
+    def test_search_follows_writes(self):
+        self.bob.first_name = "Robert"
+        self.bob.save()
+        self.assertEqual(self.search("rob"), [self.bob.id])
+        self.assertEqual(self.search("bob"), [self.bob.id])  # still in the email
+        self.john.delete()
+        self.assertEqual(self.search("doe"), [])
+
+    def test_search_with_filters(self):
+        Skill.objects.create(
+            name="Python", yrs_exp=5, seniority="Senior", employee=self.jane
+        )
+        response = self.client.get(
+            "/api/employees/", {"search": "jo", "skills": "Python"}
+        )
+        self.assertEqual([employee["id"] for employee in response.data], [self.jane.id])
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite FTS5 backend")
+    def test_search_uses_fts_index(self):
+        backend = EmployeeSearchFilter().get_backend("default")
+        self.assertIsNotNone(backend)
+        plan = backend.search(Employee.objects.all(), ["jo"]).explain()
+        self.assertIn("VIRTUAL TABLE INDEX", plan)
+        self.assertNotIn("SCAN employees_employee ", plan + " ")
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite FTS5 backend")
+    def test_search_triggers_exist(self):
+        # a migration rebuilding the employees table drops them, and
+        # restore_search_triggers recreates them after migrate
+        backend = SQLiteSearchBackend()
+        self.assertTrue(backend.is_available(connection))
+        self.assertEqual(backend.missing_triggers(connection), [])
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite FTS5 backend")
+    def test_restore_search_triggers(self):
+        # as a migration rebuilding the table leaves it
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TRIGGER employees_employee_fts_insert")
+        employee = create_employee("Max", "Mustermann", "max@example.com")
+        self.assertEqual(self.search("must"), [])
+
+        restore_search_triggers()
+        backend = SQLiteSearchBackend()
+        self.assertEqual(backend.missing_triggers(connection), [])
+        self.assertEqual(self.search("muster"), [employee.id])
+        self.assertEqual(self.search("smi"), [self.bob.id])
+
+    def test_index_checked_again_on_reconnect(self):
+        search_filter = EmployeeSearchFilter()
+        wrapper = connections["default"]
+        EmployeeSearchFilter._available[wrapper] = False
+        self.assertIsNone(search_filter.get_backend("default"))
+        connection_created.send(sender=type(wrapper), connection=wrapper)
+        self.assertIsNotNone(search_filter.get_backend("default"))
+
+    @skipUnless(connection.vendor == "postgresql", "PostgreSQL profile")
+    def test_postgres_search(self):
+        backend = EmployeeSearchFilter().get_backend("default")
+        self.assertIsInstance(backend, PostgresSearchBackend)
+        # the emails are split into the same tokens as on SQLite
+        self.assertEqual(self.search("corp"), [self.bob.id])
+        self.assertEqual(self.search("doe example"), [self.john.id])
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = backend.search(Employee.objects.all(), ["jo"]).explain()
+        self.assertIn("employee_search_idx", plan)
@@ -0,0 +1,97 @@
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from employees.models import Employee, Skill
+from employees.tests.utils import ClearCachesMixin
+
+
+class SkillListTestCase(ClearCachesMixin, APITestCase):
+    url = "/api/skills/"
+
+    def setUp(self):
+        super().setUp()
+        self.john = Employee.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john.doe@example.com",
+            date_of_birth="1990-01-01",
+        )
+        self.jane = Employee.objects.create(
+            first_name="Jane",
+            last_name="Doe",
+            email="jane.doe@example.com",
+            date_of_birth="1990-01-01",
+        )
+        for employee, name, yrs_exp, seniority in [
+            (self.john, "Python", 5, "Senior"),
+            (self.john, "SQL", 2, "Junior"),
+            (self.john, "Go", 1, "Junior"),
+            (self.jane, "Python", 3, "Mid"),
+            (self.jane, "Rust", 8, "Senior"),
+        ]:
+            Skill.objects.create(
+                employee=employee, name=name, yrs_exp=yrs_exp, seniority=seniority
+            )
+
+    def names(self, response):
+        return [(skill["employee"], skill["name"]) for skill in response.data]
+
+    def test_filters(self):
+        response = self.client.get(self.url, {"employee": self.jane.id})
+        self.assertEqual(
+            self.names(response), [(self.jane.id, "Python"), (self.jane.id, "Rust")]
+        )
+        response = self.client.get(self.url, {"name": "Python"})
+        self.assertEqual(len(response.data), 2)
+        response = self.client.get(self.url, {"seniority": "Junior"})
+        self.assertEqual(
+            self.names(response), [(self.john.id, "Go"), (self.john.id, "SQL")]
+        )
+        response = self.client.get(self.url, {"yrs_exp__gte": 3, "yrs_exp__lte": 5})
+        self.assertEqual(sorted(skill["yrs_exp"] for skill in response.data), [3, 5])
+
+    def test_pagination(self):
+        response = self.client.get(self.url, {"page_size": 2})
+        self.assertEqual(
+            [skill["name"] for skill in response.data["results"]], ["Go", "Python"]
+        )
+        seen = [skill["id"] for skill in response.data["results"]]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            seen += [skill["id"] for skill in response.data["results"]]
+        self.assertEqual(
+            seen,
+            list(Skill.objects.order_by("name", "id").values_list("id", flat=True)),
+        )
+
+    def test_employee_skills(self):
+        url = f"/api/employees/{self.john.id}/skills/"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [skill["name"] for skill in response.data], ["Go", "Python", "SQL"]
+        )
+        response = self.client.get(url, {"seniority": "Junior", "page_size": 1})
+        self.assertEqual([skill["name"] for skill in response.data["results"]], ["Go"])
+        response = self.client.get(response.data["next"])
+        self.assertEqual([skill["name"] for skill in response.data["results"]], ["SQL"])
+        self.assertIsNone(response.data["next"])
+
+    def test_employee_skills_invalidated(self):
+        url = f"/api/employees/{self.jane.id}/skills/"
+        self.client.get(url)
+        Skill.objects.create(
+            employee=self.jane, name="Go", yrs_exp=1, seniority="Junior"
+        )
+        response = self.client.get(url)
+        self.assertEqual(
+            [skill["name"] for skill in response.data], ["Go", "Python", "Rust"]
+        )
+
+    def test_unknown_employee_skills(self):
+        response = self.client.get("/api/employees/ZZ9999/skills/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.post(
+            f"/api/employees/{self.john.id}/skills/", {}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
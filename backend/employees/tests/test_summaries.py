@@ -0,0 +1,150 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from rest_framework.test import APITestCase
+from rest_framework import status
+from employees.models import Employee, Skill
+from employees.summaries import summarize
+from employees.tests.utils import ClearCachesMixin, create_employee
+
+
+def summary(employee):
+    employee.refresh_from_db()
+    return (employee.skill_count, employee.max_yrs_exp, employee.senior_skills)
+
+
+class SkillSummaryTest(TestCase):
+    def test_summarize(self):
+        self.assertEqual(
+            summarize([("SQL", 2, "Senior"), ("Python", 5, "senior"), ("Go", 7, "")]),
+            {"skill_count": 3, "max_yrs_exp": 7, "senior_skills": "|Python|SQL|"},
+        )
+        self.assertEqual(
+            summarize([]), {"skill_count": 0, "max_yrs_exp": 0, "senior_skills": ""}
+        )
+
+    def test_skill_writes(self):
+        employee = create_employee("John", skills=[("Python", 5, "senior")])
+        self.assertEqual(summary(employee), (1, 5, "|Python|"))
+
+        skill = Skill.objects.create(
+            name="SQL", yrs_exp=8, seniority="junior", employee=employee
+        )
+        self.assertEqual(summary(employee), (2, 8, "|Python|"))
+
+        skill.seniority = "senior"
+        skill.save()
+        self.assertEqual(summary(employee), (2, 8, "|Python|SQL|"))
+
+        skill.delete()
+        self.assertEqual(summary(employee), (1, 5, "|Python|"))
+
+    def test_import(self):
+        row = {
+            "first_name": "John",
+            "last_name": "Doe",
+            "contact_number": "1234567890",
+            "street_address": "123 Main Street",
+            "city": "New York",
+            "postcode": "1234",
+            "country": "US",
+            "email": "john@example.com",
+            "date_of_birth": "1990-01-01",
+            "skills": [
+                {"name": "Python", "yrs_exp": 3, "seniority": "senior"},
+                {"name": "Go", "yrs_exp": 6, "seniority": "junior"},
+            ],
+        }
+        handle, path = tempfile.mkstemp(suffix=".ndjson")
+        self.addCleanup(os.remove, path)
+        with os.fdopen(handle, "w") as source:
+            source.write(json.dumps(row))
+        call_command("import_employees", path, stdout=StringIO())
+        employee = Employee.objects.get(email="john@example.com")
+        self.assertEqual(summary(employee), (2, 6, "|Python|"))
+
+
+class RebuildSkillSummariesCommandTest(TestCase):
+    def setUp(self):
+        self.john = create_employee("John", skills=[("Python", 5, "senior")])
+        self.jane = create_employee("Jane")
+
+    def run_command(self, *args):
+        stdout = StringIO()
+        call_command("rebuild_skill_summaries", *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_verify_and_rebuild(self):
+        self.assertIn(
+            "All 2 skill summaries are up to date", self.run_command("--verify")
+        )
+
+        Employee.objects.filter(pk=self.john.pk).update(skill_count=0)
+        updated_at = Employee.objects.get(pk=self.john.pk).updated_at
+        with self.assertRaisesMessage(CommandError, "1 of 2 employees"):
+            self.run_command("--verify")
+
+        output = self.run_command("--batch-size", "1")
+        self.assertIn("Rebuilt 1 of 2 skill summaries", output)
+        self.assertEqual(summary(self.john), (1, 5, "|Python|"))
+        # a rebuild is not a write to the employee
+        self.assertEqual(self.john.updated_at, updated_at)
+
+
+class SkillSummaryFilterTestCase(ClearCachesMixin, APITestCase):
+    url = "/api/employees/"
+
+    def setUp(self):
+        super().setUp()
+        self.john = create_employee(
+            "John", skills=[("Python", 5, "senior"), ("SQL", 2, "junior")]
+        )
+        self.jane = create_employee("Jane", skills=[("SQL", 9, "senior")])
+        self.jim = create_employee("Jim")
+
+    def ids(self, query):
+        response = self.client.get(f"{self.url}?{query}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data
+        rows = data["results"] if isinstance(data, dict) else data
+        return [row["id"] for row in rows]
+
+    def test_filters(self):
+        self.assertEqual(self.ids("skill_count=2"), [self.john.id])
+        self.assertEqual(
+            set(self.ids("skill_count__gte=1")), {self.john.id, self.jane.id}
+        )
+        self.assertEqual(self.ids("max_yrs_exp__gte=6"), [self.jane.id])
+        self.assertEqual(self.ids("senior_skill=SQL"), [self.jane.id])
+        self.assertEqual(self.ids("senior_skill=Go"), [])
+
+    def test_filter_does_not_join_skills(self):
+        # employees, no skills query as the summary is a column
+        with self.assertNumQueries(1):
+            self.client.get(f"{self.url}?senior_skill=SQL&fields=id")
+
+    def test_ordering(self):
+        self.assertEqual(
+            self.ids("ordering=-max_yrs_exp"), [self.jane.id, self.john.id, self.jim.id]
+        )
+        self.assertEqual(self.ids("ordering=skill_count")[0], self.jim.id)
+
+    def test_paginated_ordering(self):
+        Skill.objects.create(
+            name="Go", yrs_exp=1, seniority="junior", employee=self.jim
+        )
+        # jane and jim tie on skill_count and are ordered by id
+        expected = self.ids("ordering=skill_count")
+        ids = []
+        url = f"{self.url}?ordering=skill_count&page_size=1"
+        while url:
+            data = self.client.get(url).data
+            ids += [row["id"] for row in data["results"]]
+            url = data["next"]
+        self.assertEqual(ids, expected)
+        self.assertEqual(ids[-1], self.john.id)
@@ -0,0 +1,154 @@
+from django.core.cache import caches
+
+from employees.emails import email_filter
+from employees.ids import format_id
+from employees.models import Employee, Skill
+from employees.query_detector import QueryDetector
+
+
+def create_employee(
+    first_name="John", last_name="Doe", email=None, skills=(), **fields
+):
+    """
+    Creates an employee and its skills, one query each.
+
+    Args:
+        first_name (str): The first name of the employee.
+        last_name (str): The last name of the employee.
+        email (str): The email, "<first_name>@example.com" in lowercase by default.
+        skills (list): The (name, yrs_exp, seniority) tuples of the skills.
+        **fields: The other fields of the employee; date_of_birth defaults to 1990-01-01.
+
+    Returns:
+        Employee: The created employee.
+    """
+    fields.setdefault("date_of_birth", "1990-01-01")
+    employee = Employee.objects.create(
+        first_name=first_name,
+        last_name=last_name,
+        email=email or f"{first_name.lower()}@example.com",
+        **fields,
+    )
+    for name, yrs_exp, seniority in skills:
+        Skill.objects.create(
+            name=name, yrs_exp=yrs_exp, seniority=seniority, employee=employee
+        )
+    return employee
+
+
+def create_employees(count, skills=3):
+    """
+    Creates count employees and their skills with one bulk query each.
+
+    The employees get the ids AA0000 onwards and every other one a contact
+    number; the skills are named "Skill 0" onwards, each with as many years
+    of experience as its number.
+
+    Args:
+        count (int): The number of employees.
+        skills (int): The number of skills of each employee.
+    """
+    employees = Employee.objects.bulk_create(
+        Employee(
+            id=format_id(i),
+            first_name=f"John {i}",
+            last_name="Doe",
+            email=f"john.doe{i}@example.com",
+            date_of_birth="1990-01-01",
+            contact_number="1234567890" if i % 2 else None,
+            city="New York",
+        )
+        for i in range(count)
+    )
+    Skill.objects.bulk_create(
+        Skill(
+            name=f"Skill {j}",
+            yrs_exp=j,
+            seniority="Senior",
+            employee=employee,
+        )
+        for employee in employees
+        for j in range(skills)
+    )
+
+
+class QueryCountMixin:
+    """
+    A test mixin for pinning the number of queries issued by an endpoint.
+
+    Methods:
+        assertGetQueries(num, url): Performs a GET request, asserts it issued exactly num queries and returns the response.
+    """
+
+    def assertGetQueries(self, num, url):
+        with self.assertNumQueries(num):
+            response = self.client.get(url)
+        return response
+
+
+class QueryBudgetMixin:
+    """
+    A test mixin failing the requests that exceed the query budget of their endpoint.
+
+    Every request made with self.client is run inside a QueryDetector. When
+    the endpoint has a budget, keyed by "<METHOD> <view name>" or by the view
+    name alone, the request fails the test if it runs more queries than the
+    budget or runs a query shape duplicate_query_threshold times, which is how
+    an N+1 shows up. Twice is allowed, as a write reads the validators and the
+    nested rows before and after it.
+
+    Attributes:
+        query_budgets (dict): The maximum number of queries by endpoint, such as {"GET employees-list": 3}.
+        duplicate_query_threshold (int): The number of runs of one query shape that fails the test.
+    """
+
+    query_budgets = {}
+    duplicate_query_threshold = 3
+
+    def setUp(self):
+        super().setUp()
+        request = self.client.request
+
+        def checked_request(**kwargs):
+            with QueryDetector(
+                duplicate_threshold=self.duplicate_query_threshold
+            ) as detector:
+                response = request(**kwargs)
+            self.assertWithinQueryBudget(response, detector)
+            return response
+
+        self.client.request = checked_request
+
+    def assertWithinQueryBudget(self, response, detector):
+        match = response.resolver_match
+        if match is None:
+            return
+        method = response.request["REQUEST_METHOD"]
+        budget = self.query_budgets.get(
+            f"{method} {match.view_name}", self.query_budgets.get(match.view_name)
+        )
+        if budget is None:
+            return
+        endpoint = f"{method} {response.request['PATH_INFO']}"
+        if len(detector) > budget:
+            self.fail(
+                f"{endpoint} ran over its budget of {budget} queries: {detector.report()}"
+            )
+        if detector.duplicates():
+            self.fail(f"{endpoint} repeated queries: {detector.report()}")
+
+
+class ClearCachesMixin:
+    """
+    A test mixin clearing every cache before each test.
+
+    The caches are not rolled back with the test transaction, so responses and
+    skill names cached by a previous test would otherwise leak into the next.
+    The in-process email filter is dropped for the same reason.
+    """
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        email_filter.reset()
+        super().setUp()
@@ -1,12 +1,38 @@
 from rest_framework.routers import DefaultRouter
 from django.urls import path, include
-from .views import EmployeeListView, SkillViewSet, check_email_exist
+from .views import AnalyticsViewSet, EmployeeListView, SkillViewSet, check_email_exist
+from .metrics import metrics_view
+from . import async_views
 
 router = DefaultRouter()
 router.register("skills", SkillViewSet)
 router.register("employees", EmployeeListView, basename="employees")
+router.register("analytics", AnalyticsViewSet, basename="analytics")
 
+# the URL names are the view names of the request metrics
 urlpatterns = [
     path("api/", include(router.urls)),
-    path("api/check-email/<str:email>/", check_email_exist),
+    path(
+        "api/employees/<str:employee_pk>/skills/",
+        SkillViewSet.as_view({"get": "list"}, basename="skill"),
+        name="employee-skills",
+    ),
+    path("api/check-email/<str:email>/", check_email_exist, name="check_email_exist"),
+    path("api/_metrics", metrics_view, name="metrics"),
+    # native async versions of the read endpoints, for ASGI deployments
+    path(
+        "api/async/employees/",
+        async_views.AsyncEmployeeView.as_view(),
+        name="async-employees-list",
+    ),
+    path(
+        "api/async/employees/<str:pk>/",
+        async_views.AsyncEmployeeView.as_view(),
+        name="async-employees-detail",
+    ),
+    path(
+        "api/async/check-email/<str:email>/",
+        async_views.check_email_exist,
+        name="async_check_email_exist",
+    ),
 ]
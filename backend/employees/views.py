@@ -1,34 +1,311 @@
-from rest_framework import generics, viewsets
+import csv
+import datetime
+import json
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from rest_framework import filters, generics, viewsets
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 from .models import Employee, Skill
 from .serializers import EmployeeSerializer, SkillSerializer
-from .filters import EmployeeFilter
-from rest_framework.filters import SearchFilter
+from .filters import EmployeeFilter, SkillFilter
+from .querysets import optimize_queryset
+from .pagination import KeysetPagination, SkillPagination
+from .search import EmployeeSearchFilter
+from .caching import EMPLOYEES, SKILLS, CachedResponseMixin
+from .conditional import ConditionalResponseMixin
+from .changes import DELETED, ChangeFeed, InvalidCursor
+from .representations import ValuesReadMixin
+from .fieldsets import SparseFieldsMixin
+from .emails import email_exists
+from .skill_names import get_skill_name_counts
+from . import analytics
 import django_filters
 from rest_framework.response import Response
-from rest_framework.decorators import api_view
+from rest_framework.decorators import action, api_view
 from rest_framework import status
 
 
-class EmployeeListView(viewsets.ModelViewSet):
+class EmployeeListView(
+    CachedResponseMixin,
+    ConditionalResponseMixin,
+    ValuesReadMixin,
+    SparseFieldsMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Employee.objects.all()
     serializer_class = EmployeeSerializer
-    filter_backends = [django_filters.rest_framework.DjangoFilterBackend, SearchFilter]
+    filter_backends = [
+        django_filters.rest_framework.DjangoFilterBackend,
+        EmployeeSearchFilter,
+        filters.OrderingFilter,
+    ]
     filterset_class = EmployeeFilter
     search_fields = ["first_name", "last_name", "email"]
+    # the skill summary columns, indexed with the id the pages are keyed on
+    ordering_fields = ["skill_count", "max_yrs_exp", "updated_at"]
+    pagination_class = KeysetPagination
+    cache_scopes = (EMPLOYEES,)
+    bulk_max_rows = 1000
+    export_chunk_size = 2000
+    changes_page_size = 500
+    changes_max_page_size = 1000
+    changes_lag = datetime.timedelta(seconds=5)
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "destroy":
+            # the skills are deleted by the cascade, which reads them itself
+            return queryset
+        # load the nested skills in one query instead of one query per employee
+        return optimize_queryset(queryset, self.get_serializer_class())
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """
+        Creates and updates a list of employees in a single transaction.
+
+        Rows with an "id" update the matching employee, the other rows are created.
+        If any row is invalid nothing is written and the response holds one error
+        object per row, empty for the valid ones.
+        """
+        serializer = self.get_serializer(
+            data=request.data, many=True, max_length=self.bulk_max_rows
+        )
+        serializer.is_valid(raise_exception=True)
+        employees = serializer.save()
+        saved = self.get_queryset().in_bulk([employee.id for employee in employees])
+        output = self.get_serializer(
+            [saved[employee.id] for employee in employees], many=True
+        )
+        return Response(output.data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        """
+        Streams the filtered employees with their skills as CSV or NDJSON.
+
+        The filter and search parameters of the list endpoint apply. Rows are read
+        with a server-side iterator and the skills are prefetched per chunk, so
+        memory use does not grow with the number of employees. The format is
+        chosen with ?output=csv (default) or ?output=ndjson; in CSV the skills
+        column holds the skills as a JSON array.
+        """
+        output = request.query_params.get("output", "csv")
+        if output not in ("csv", "ndjson"):
+            return Response(
+                {"output": ["Output must be one of: csv, ndjson"]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_serializer()
+        rows = (
+            serializer.to_representation(employee)
+            for employee in queryset.iterator(chunk_size=self.export_chunk_size)
+        )
+        if output == "csv":
+            content = self._export_csv(rows, list(serializer.fields))
+            content_type = "text/csv"
+        else:
+            content = self._export_ndjson(rows)
+            content_type = "application/x-ndjson"
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="employees.{output}"'
+        return response
+
+    @action(detail=False, methods=["get"])
+    def changes(self, request):
+        """
+        Returns the changes made after the ?since= cursor, oldest first.
+
+        Each change is an "updated" employee with its skills, or a "deleted"
+        employee or skill. The response holds the cursor to pass as ?since= on
+        the next call in its "next" link, and "has_more" tells whether that
+        call has changes waiting already. Without ?since= the feed starts from
+        the beginning, which lists every employee once.
+        """
+        try:
+            page_size = int(
+                request.query_params.get("page_size", self.changes_page_size)
+            )
+        except ValueError:
+            page_size = self.changes_page_size
+        page_size = max(1, min(page_size, self.changes_max_page_size))
+
+        feed = ChangeFeed(self.get_queryset(), lag=self.changes_lag)
+        try:
+            changes, cursor, has_more = feed.read(
+                request.query_params.get("since"), page_size
+            )
+        except InvalidCursor:
+            return Response(
+                {"since": ["Invalid cursor"]}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = self.get_serializer()
+        results = []
+        for stream, row in changes:
+            if stream == DELETED:
+                results.append(
+                    {
+                        "event": "deleted",
+                        "model": row.model,
+                        "id": row.object_id,
+                        "employee": row.employee,
+                        "at": row.deleted_at,
+                    }
+                )
+            else:
+                results.append(
+                    {
+                        "event": "updated",
+                        "model": "employee",
+                        "id": row.pk,
+                        "employee": row.pk,
+                        "at": row.updated_at,
+                        "data": serializer.to_representation(row),
+                    }
+                )
+        url = request.build_absolute_uri()
+        return Response(
+            {
+                "next": (
+                    replace_query_param(url, "since", cursor)
+                    if cursor
+                    else remove_query_param(url, "since")
+                ),
+                "has_more": has_more,
+                "results": results,
+            }
+        )
+
+    def _export_csv(self, rows, fields):
+        writer = csv.writer(_Echo())
+        yield writer.writerow(fields)
+        for row in rows:
+            row["skills"] = json.dumps(row["skills"], cls=JSONEncoder)
+            yield writer.writerow(row[field] for field in fields)
+
+    def _export_ndjson(self, rows):
+        for row in rows:
+            yield json.dumps(row, cls=JSONEncoder) + "\n"
+
+
+class SkillViewSet(
+    CachedResponseMixin,
+    ConditionalResponseMixin,
+    ValuesReadMixin,
+    viewsets.ModelViewSet,
+):
+    """
+    The skills, listed with filters and keyset pagination.
+
+    The list is filtered with SkillFilter and paginated in name order when
+    ?page_size= is given. It is also served for one employee under
+    /api/employees/<id>/skills/, read-only, which answers 404 for an unknown
+    employee.
+    """
 
-class SkillViewSet(viewsets.ModelViewSet):
     queryset = Skill.objects.all()
     serializer_class = SkillSerializer
+    filter_backends = [django_filters.rest_framework.DjangoFilterBackend]
+    filterset_class = SkillFilter
+    pagination_class = SkillPagination
+    cache_scopes = (SKILLS,)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if "employee_pk" in self.kwargs:
+            queryset = queryset.filter(employee_id=self.kwargs["employee_pk"])
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        if "employee_pk" in kwargs:
+            get_object_or_404(Employee.objects.only("pk"), pk=kwargs["employee_pk"])
+        return super().list(request, *args, **kwargs)
+
+    @action(detail=False, methods=["get"])
+    def names(self, request):
+        """
+        Returns the distinct skill names with the number of employees having each.
+
+        The names are ordered by name and read from the cached skill name
+        counts, so the response grows with the number of distinct names, not
+        with the number of skills.
+        """
+        return self._cached("names", self._names, request)
+
+    def _names(self, request):
+        counts = get_skill_name_counts()
+        return Response(
+            [{"name": name, "count": count} for name, count in counts.items()]
+        )
+
+
+class AnalyticsViewSet(CachedResponseMixin, viewsets.GenericViewSet):
+    """
+    Aggregates over the employees and their skills, computed in the database.
+
+    The filter and search parameters of the employees list apply, so the
+    aggregates cover the same employees as the list would return. Every
+    response is the result of grouped queries whose size depends on the number
+    of skills and age bands, not on the number of employees, and is cached
+    until an employee or a skill is written.
+
+    Methods:
+        list(request): Returns the headcount, the skills matrix and the age bands.
+        skills(request): Returns the headcount by skill and seniority and the average years of experience per skill.
+        age_bands(request): Returns the headcount per age band.
+    """
+
+    queryset = Employee.objects.all()
+    filter_backends = EmployeeListView.filter_backends
+    filterset_class = EmployeeFilter
+    search_fields = EmployeeListView.search_fields
+    cache_scopes = (EMPLOYEES, SKILLS)
+
+    def list(self, request):
+        return self._cached("list", self._summary, request)
+
+    @action(detail=False, methods=["get"])
+    def skills(self, request):
+        return self._cached("skills", self._skills, request)
+
+    @action(detail=False, methods=["get"], url_path="age-bands")
+    def age_bands(self, request):
+        return self._cached("age-bands", self._age_bands, request)
+
+    def _summary(self, request):
+        employees = self.filter_queryset(self.get_queryset())
+        return Response(
+            {
+                "headcount": employees.order_by().count(),
+                "skills": analytics.skills_matrix(employees),
+                "age_bands": analytics.age_bands(employees),
+            }
+        )
+
+    def _skills(self, request):
+        return Response(
+            analytics.skills_matrix(self.filter_queryset(self.get_queryset()))
+        )
+
+    def _age_bands(self, request):
+        return Response(analytics.age_bands(self.filter_queryset(self.get_queryset())))
+
+
+class _Echo:
+    """A file-like object whose write() returns the value, for streaming csv.writer output."""
+
+    def write(self, value):
+        return value
 
 
 # create a view to check if email exist
 
 
-@api_view(["POST"])
+# GET is the lookup; POST is kept for the clients that still use it
+@api_view(["GET", "POST"])
 def check_email_exist(request, email):
-
-    if Employee.objects.filter(email=email).exists():
-        return Response({"exists": True}, status=status.HTTP_200_OK)
-    else:
-        return Response({"exists": False}, status=status.HTTP_200_OK)
+    # case-insensitive, and answered without a query when the email is not taken
+    return Response({"exists": email_exists(email)}, status=status.HTTP_200_OK)
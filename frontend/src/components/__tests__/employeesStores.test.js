@@ -3,7 +3,7 @@
 import assert from 'assert';
 import { describe, expect, it } from 'vitest'
 import { useEmployeesStore } from '../../stores/employeesStore';
-import { createPinia } from 'pinia'
+import { createPinia, setActivePinia } from 'pinia'
 
 const state = () => {
     return useEmployeesStore();
@@ -63,4 +63,20 @@ describe('Initial state', () => {
             skills: []
         });
     });
-});
\ No newline at end of file
+});
+
+describe('completeSkills', () => {
+    it('should only leave out the skills without a name', () => {
+        setActivePinia(createPinia());
+        const store = useEmployeesStore();
+        const skills = [
+            { id: 1, name: 'Python', yrs_exp: 0, seniority: 'Junior' },
+            { name: 'SQL', yrs_exp: '', seniority: '' },
+            { name: '', yrs_exp: '', seniority: '' }
+        ];
+        assert.deepStrictEqual(store.completeSkills(skills), [
+            { name: 'Python', yrs_exp: 0, seniority: 'Junior' },
+            { name: 'SQL', yrs_exp: '', seniority: '' }
+        ]);
+    });
+});
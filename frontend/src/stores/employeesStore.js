@@ -73,7 +73,9 @@ export const useEmployeesStore = defineStore('employees', {
             })
         },
         /**
-         * A function to create an employee and handle related data changes and error handling.
+         * A function to create an employee with its skills and handle error handling.
+         * The skills are sent inside the employee and the created employee is returned by the API,
+         * so it is added to the list without fetching the employees again.
          *
          * @param {employeesStore} employeesStore - the store for employees data
          * @param {modalStore} modalStore - the store for modal related data
@@ -81,16 +83,14 @@ export const useEmployeesStore = defineStore('employees', {
          */
         createEmployee(employeesStore, modalStore) {
             axios
-                .post(`/api/employees/`, employeesStore.newEmployee)
-                .then((response) => {
-                    employeesStore.newEmployee.skills.forEach((skill) => {
-                        this.createSkill(response.data.id, skill)
-                    })
+                .post(`/api/employees/`, {
+                    ...employeesStore.newEmployee,
+                    skills: this.completeSkills(employeesStore.newEmployee.skills)
                 })
-                .then(() => {
+                .then((response) => {
+                    this.employees.unshift(response.data)
                     this.dataChanged = false
                     modalStore.closeModal()
-                    employeesStore.fetchEmployees()
 
                     employeesStore.message = null
                 })
@@ -101,25 +101,23 @@ export const useEmployeesStore = defineStore('employees', {
                 })
         },
         /**
-         * Update employee data and skills.
+         * Update employee data and skills in a single request.
+         * The skills missing from employeeData are deleted by the API, and the updated employee
+         * it returns replaces the old one in the list.
          *
-         * @param {object} employeeData - the data of the employee to be updated
-         * @param {array} skills - the skills to be updated
+         * @param {object} employeeData - the data of the employee to be updated, with its skills
          * @param {object} modalStore - the modal store for handling modals
          */
-        updateEmployee(employeeData, skills, modalStore) {
+        updateEmployee(employeeData, modalStore) {
             axios
-                .put(`/api/employees/${employeeData.id}/`, employeeData)
+                .put(`/api/employees/${employeeData.id}/`, {
+                    ...employeeData,
+                    skills: this.completeSkills(employeeData.skills)
+                })
                 .then((response) => {
-                    employeeData.skills.forEach((skill) => {
-                        if (!skill.id) {
-                            if (skill.yrs_exp && skill.seniority && skill.name) {
-                                this.createSkill(response.data.id, skill)
-                            }
-                        } else {
-                            this.unpdateSkill(skill.id, skill)
-                        }
-                    })
+                    this.employees = this.employees.map((employee) =>
+                        employee.id === response.data.id ? response.data : employee
+                    )
                 })
                 .catch((error) => {
                     console.log(error)
@@ -130,9 +128,25 @@ export const useEmployeesStore = defineStore('employees', {
 
                     this.dataChanged = false
                     this.updatedData = null
-                    this.fetchEmployees()
                 })
         },
+        /**
+         * Returns the skills with a name, leaving out the empty rows added by the form.
+         * The other fields are sent as they are, so 0 years of experience is kept and an
+         * incomplete skill is reported by the API instead of being deleted.
+         *
+         * @param {array} skills - the skills of the form
+         * @return {array} the skills to send
+         */
+        completeSkills(skills) {
+            return skills
+                .filter((skill) => skill.name)
+                .map((skill) => ({
+                    name: skill.name,
+                    yrs_exp: skill.yrs_exp,
+                    seniority: skill.seniority
+                }))
+        },
         /**
          * Deletes an employee by their ID.
          *
@@ -152,42 +166,6 @@ export const useEmployeesStore = defineStore('employees', {
                     console.log(error)
                 })
         },
-        /**
-         * Create a skill for a given employee.
-         *
-         * @param {number} employeeId - The ID of the employee
-         * @param {object} skillData - The skill data including name, years of experience, and seniority
-         * @return {void} 
-         */
-        createSkill(employeeId, skillData) {
-            axios
-                .post(`/api/skills/`, {
-                    name: skillData.name,
-                    yrs_exp: skillData.yrs_exp,
-                    seniority: skillData.seniority,
-                    employee: employeeId
-                })
-                .then((response) => {
-                    console.log(`Skill created successfully with ID: ${response.data.id}`)
-                })
-        },
-        /**
-         * Updates a skill with the given skillId using the provided skillData.
-         *
-         * @param {type} skillId - description of skillId
-         * @param {type} skillData - description of skillData
-         * @return {type} description of return value
-         */
-        unpdateSkill(skillId, skillData) {
-            axios
-                .put(`http://127.0.0.1:8000/api/skills/${skillId}/`, skillData)
-                .then(() => {
-                    console.log('Skill updated successfully')
-                })
-                .catch((error) => {
-                    console.error(error)
-                })
-        },
         /**
          * Deletes a skill by skillId.
          *
@@ -248,11 +226,11 @@ export const useEmployeesStore = defineStore('employees', {
             this.updatedEmployees = []
         },
         /**
-         * Fetches skills from the API and sets the skills property.
+         * Fetches the distinct skill names, with the number of employees having each, and sets the skills property.
          */
         fetchSkills() {
-            axios.get('/api/skills/').then((response) => {
-                this.skills = [...new Map(response.data.map((item) => [item.name, item])).values()]
+            axios.get('/api/skills/names/').then((response) => {
+                this.skills = response.data
             })
         }
     }
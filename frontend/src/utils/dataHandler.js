@@ -52,7 +52,7 @@ export const createComputedProperty = (property, employeesStore, modalStore) =>
  */
 export const checkEmailExists = (email, employeesStore) => {
   if (email.length > 3) {
-    axios.post(`/api/check-email/${email}/`).then((response) => {
+    axios.get(`/api/check-email/${encodeURIComponent(email)}/`).then((response) => {
       console.log(response)
       if (response.data.exists) {
         // append error message